@@ -0,0 +1,135 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from balancing.balancer import Balancer
+from balancing.parallel_balancer import balance_chunk, init_worker
+
+DEFAULT_MAX_IN_FLIGHT = 1024
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH_SIZE = 256
+
+
+class AsyncBalancer:
+    """
+    An asyncio front end of the Balancer. The CPU work runs in an executor, never on the event loop.
+    Identical concurrent requests are coalesced - only one computation runs and all the waiters get its result.
+    Requests arriving within batch_window of each other are balanced together through the batched solve path.
+    """
+
+    def __init__(self, processes=0, max_in_flight=DEFAULT_MAX_IN_FLIGHT, batch_window=DEFAULT_BATCH_WINDOW,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        """
+        :param processes: the number of worker processes, 0 to balance in a single background thread
+        :param max_in_flight: the maximum number of distinct equations being balanced at once
+        :param batch_window: how long (in seconds) the first request of a batch waits for more to come
+        :param max_batch_size: the number of requests that makes a batch go without waiting any longer
+        """
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.requests = 0
+        self.coalesced = 0
+        self.batches = 0
+        if processes > 0:
+            self.__executor = ProcessPoolExecutor(max_workers=processes, initializer=init_worker)
+            self.__balance_batch = balance_chunk
+        else:
+            self.__executor = ThreadPoolExecutor(max_workers=1)
+            self.__balance_batch = Balancer(logging=False).balance_many
+        self.__in_flight = asyncio.Semaphore(max_in_flight)
+        self.__pending = {}
+        self.__submissions = set()
+        self.__batch = []
+        self.__batch_timer = None
+
+    async def balance(self, equation):
+        """
+        Balances the equation.
+
+        :param equation: the equation to be balanced
+        :return: the BalancingResult
+        """
+        self.requests += 1
+        key = "".join(equation.split())
+        pending = self.__pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self.__pending[key] = future
+        # the computation belongs to a task of its own, so cancelling the first caller never leaves
+        # the callers coalesced onto its future waiting forever
+        task = asyncio.ensure_future(self.__submit(key, equation, future))
+        self.__submissions.add(task)
+        task.add_done_callback(self.__submissions.discard)
+        return await asyncio.shield(future)
+
+    def statistics(self):
+        """
+        :return: the dictionary of counters
+        """
+        return {"requests": self.requests, "coalesced": self.coalesced, "batches": self.batches,
+                "pending": len(self.__pending)}
+
+    async def close(self):
+        if self.__batch:
+            self.__flush()
+        await asyncio.get_running_loop().run_in_executor(None, self.__executor.shutdown)
+
+    async def __submit(self, key, equation, future):
+        """
+        Waits for a free in-flight slot, enqueues the equation and holds the slot until its future is done.
+        """
+        try:
+            async with self.__in_flight:
+                self.__enqueue(equation, future)
+                await asyncio.wait([future])
+        except Exception as ex:
+            if not future.done():
+                future.set_exception(ex)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            if self.__pending.get(key) is future:
+                del self.__pending[key]
+
+    def __enqueue(self, equation, future):
+        self.__batch.append((equation, future))
+        if len(self.__batch) >= self.max_batch_size:
+            self.__flush()
+        elif self.__batch_timer is None:
+            self.__batch_timer = asyncio.get_running_loop().call_later(self.batch_window, self.__flush)
+
+    def __flush(self):
+        if self.__batch_timer is not None:
+            self.__batch_timer.cancel()
+            self.__batch_timer = None
+        batch, self.__batch = self.__batch, []
+        if batch:
+            self.batches += 1
+            task = asyncio.ensure_future(self.__run_batch(batch))
+            self.__submissions.add(task)
+            task.add_done_callback(self.__submissions.discard)
+
+    async def __run_batch(self, batch):
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.__executor, self.__balance_batch, [equation for equation, _ in batch])
+        except Exception as ex:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ex)
+            return
+        except BaseException:
+            for _, future in batch:
+                future.cancel()
+            raise
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
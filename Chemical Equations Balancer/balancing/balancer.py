@@ -1,73 +1,413 @@
-import sys
-
+from balancing.balancing_result import BalancingResult, BALANCED, UNBALANCEABLE, INVALID
+from balancing.balancing_session import BalancingSession
+from balancing.equation_cache import EquationCache, DEFAULT_EQUATION_CACHE_SIZE
 from computing.balancing_validator import BalancingValidator
+from computing.equation_screener import EquationScreener
 from computing.matrix_computer import MatrixComputer
 from computing.matrix_creator import MatrixCreator
 from chembal_logging.logger import Logger
+from chembal_logging.metrics import NULL_METRICS
 from parsing.equation_parser import EquationParser
+from parsing.canonical_equation import CanonicalEquation
+from parsing.molecule_cache import MoleculeCache
 
 
 class Balancer:
     """
     A class for performing all of the balancing operations.
+    Single equations are balanced on plain lists of integers; the NumPy based batch and network
+    components are imported and created on first use only, which keeps the startup fast.
     """
 
-    def __init__(self, logging=True):
+    def __init__(self, logging=True, molecule_cache=None, result_cache=None, metrics=None, sparse=False,
+                 equation_cache_size=DEFAULT_EQUATION_CACHE_SIZE, screening=True, result_store=None):
         """
         Sets up all the components.
 
-        :param logging: whether to print logs or not
+        :param logging: whether to log the progress or not
+        :param molecule_cache: the molecule cache shared by all the components,
+        the process-wide one by default
+        :param result_cache: the optional persistent ResultCache checked before any matrix is built
+        :param metrics: the optional MetricsRegistry recording per-stage timings, counts and sizes
+        :param sparse: whether to build and solve sparse equation matrices - off by default, as it only pays off
+        for big reaction networks of molecules made of a few elements each (measure with benchmarks.py --sparse)
+        :param equation_cache_size: the number of results kept by the in-memory equation cache,
+        which is checked before the result cache - 0 turns it off
+        :param screening: whether to reject the equations which obviously cannot be balanced before building
+        their matrices, see EquationScreener
+        :param result_store: the optional ResultStore every balanced result is added to, for queries by species
+        and element
         """
-        self.matrix_creator = MatrixCreator()
+        self.sparse = sparse
+        self.screening = screening
+        self.result_cache = result_cache
+        self.result_store = result_store
+        self.equation_cache = EquationCache(equation_cache_size) if equation_cache_size > 0 else None
+        self.molecule_cache = molecule_cache if molecule_cache is not None else MoleculeCache.shared()
+        self.matrix_creator = MatrixCreator(molecule_parser=self.molecule_cache)
         self.matrix_computer = MatrixComputer()
-        self.equation_parser = EquationParser()
-        self.balancing_validator = BalancingValidator(logging=logging)
+        self.__batch_matrix_computer = None
+        self.__network_balancer = None
+        self.equation_parser = EquationParser(molecule_parser=self.molecule_cache)
+        self.balancing_validator = BalancingValidator(logging=logging, molecule_parser=self.molecule_cache)
+        self.batch_balancing_validator = BalancingValidator(logging=False, molecule_parser=self.molecule_cache)
         self.logger = Logger(active=logging)
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        if self.metrics.enabled:
+            self.metrics.register_source("molecule_cache", self.molecule_cache.statistics)
+            self.metrics.register_source("batch_solver", lambda: self.batch_matrix_computer.statistics())
+            if self.equation_cache is not None:
+                self.metrics.register_source("equation_cache", self.equation_cache.statistics)
+            if self.result_cache is not None:
+                self.metrics.register_source("result_cache", self.result_cache.statistics)
+            if self.result_store is not None:
+                self.metrics.register_source("result_store", self.result_store.statistics)
+
+    @property
+    def batch_matrix_computer(self):
+        if self.__batch_matrix_computer is None:
+            from computing.batch_matrix_computer import BatchMatrixComputer
+            self.__batch_matrix_computer = BatchMatrixComputer()
+        return self.__batch_matrix_computer
+
+    @property
+    def network_balancer(self):
+        if self.__network_balancer is None:
+            from balancing.network_balancer import NetworkBalancer
+            self.__network_balancer = NetworkBalancer(molecule_cache=self.molecule_cache)
+        return self.__network_balancer
 
     def balance_equation(self, equation):
         """
-        Computes the coefficients and prints the balanced equation.
+        Computes the coefficients of the equation. Never prints anything - progress goes to the logger only.
 
         :param equation: the equation to be balanced
-        :return: whether equation was successfully balanced or not
-        :raises ValueError if the equation could not be balanced
+        :return: the BalancingResult, truthy if the equation was successfully balanced
+        """
+        with self.metrics.profile():
+            result, parsed_equation, canonical_equation = self.__parse_or_look_up(equation)
+            if result is not None:
+                return self.__finish(result)
+            self.logger.info("Parsing the equation...")
+            rejection = self.__screen(parsed_equation)
+            if rejection is not None:
+                self.logger.error("Equation screening error: ", rejection)
+                result = self.__create_result(equation, parsed_equation, rejection, False)
+            else:
+                result = self.__balance_parsed_equation(equation, parsed_equation)
+            if canonical_equation is not None:
+                self.__store_results([(canonical_equation, result)])
+            return self.__finish(result)
+
+    def balance_many(self, equations):
+        """
+        Balances many equations at once, without printing anything.
+        Every repeated equation is balanced once, and matrices of equal shape are solved together with batched
+        array operations - see the Balancer.balance_many speedup in testing/benchmarks.py.
+
+        :param equations: the equations to be balanced
+        :return: list of BalancingResult, in the order of the equations
+        """
+        with self.metrics.profile():
+            results = [None] * len(equations)
+            parsed_equations = []
+            matrices = []
+            pending_equations = {}
+            repeated_equations = []
+            screened_equations = []
+            first_indices = {}
+            for i, equation in enumerate(equations):
+                # repeated equation texts are not even split, the same reaction written differently is not parsed
+                if first_indices.setdefault(equation, i) != i:
+                    continue
+                results[i], molecules, canonical_equation = self.__look_up(equation)
+                if results[i] is not None:
+                    continue
+                if canonical_equation is not None:
+                    first_occurrence = pending_equations.setdefault(canonical_equation.key, (i, canonical_equation))
+                    if first_occurrence[0] != i:
+                        repeated_equations.append((i, canonical_equation) + first_occurrence)
+                        continue
+                results[i], parsed_equation = self.__parse(equation, molecules)
+                if results[i] is not None:
+                    continue
+                rejection = self.__screen(parsed_equation)
+                if rejection is not None:
+                    results[i] = self.__create_result(equations[i], parsed_equation, rejection, False)
+                    screened_equations.append((canonical_equation, results[i]))
+                    continue
+                parsed_equations.append((i, parsed_equation, canonical_equation))
+                with self.metrics.stage("matrix"):
+                    matrices.append(self.__create_matrix(parsed_equation))
+                self.__observe_matrix(matrices[-1])
+            self.__balance_parsed_many(equations, parsed_equations, matrices, results)
+            if pending_equations:
+                self.__store_results([(canonical_equation, results[i])
+                                      for i, _, canonical_equation in parsed_equations] + screened_equations)
+            for i, canonical_equation, first_index, first_canonical_equation in repeated_equations:
+                results[i] = self.__from_repeated_result(equations[i], canonical_equation,
+                                                         first_canonical_equation, results[first_index])
+            if len(first_indices) < len(equations):
+                for i, equation in enumerate(equations):
+                    if results[i] is None:
+                        results[i] = self.__copy_result(equation, results[first_indices[equation]])
+            for result in results:
+                self.__finish(result)
+            return results
+
+    def balance_compiled(self, corpus, start=0, stop=None):
+        """
+        Balances the equations of a compiled corpus like balance_many, with no parsing at all - the matrices are
+        built straight from the compiled species. The equation and result caches are not used, as compiled
+        corpora are meant for balancing whole corpora again, e.g. after the solver has changed.
+
+        :param corpus: the CompiledCorpus
+        :param start: the index of the first equation to be balanced
+        :param stop: the index past the last equation to be balanced, the end of the corpus by default
+        :return: list of BalancingResult, in the order of the equations
+        """
+        with self.metrics.profile():
+            indices = range(start, len(corpus) if stop is None else stop)
+            equations = [corpus.equation(i) for i in indices]
+            results = [None] * len(equations)
+            parsed_equations = []
+            matrices = []
+            for k, i in enumerate(indices):
+                parsed_equation = corpus.parsed_equation(i)
+                if parsed_equation is None:
+                    results[k] = self.__create_invalid_result(equations[k])
+                    continue
+                rejection = self.__screen(parsed_equation)
+                if rejection is not None:
+                    results[k] = self.__create_result(equations[k], parsed_equation, rejection, False)
+                    continue
+                parsed_equations.append((k, parsed_equation, None))
+                with self.metrics.stage("matrix"):
+                    matrices.append(self.__create_matrix(parsed_equation) if self.sparse else corpus.equation_rows(i))
+                self.__observe_matrix(matrices[-1])
+            self.__balance_parsed_many(equations, parsed_equations, matrices, results)
+            for result in results:
+                self.__finish(result)
+            return results
+
+    def balance_network(self, reactions):
+        """
+        Balances a whole set of coupled reactions against a shared species and element index.
+        See NetworkBalancer for details.
+
+        :param reactions: the reactions of the network
+        :return: the NetworkBalancingResult
+        """
+        with self.metrics.stage("network"):
+            return self.network_balancer.balance_network(reactions)
+
+    def create_session(self, equation=None):
+        """
+        Starts a session for balancing an equation edited step by step, see BalancingSession.
+        Raises SyntaxError if the equation does not meet format requirements.
+
+        :param equation: the optional equation to start with
+        :return: the BalancingSession
+        """
+        return BalancingSession(equation, species_table=self.matrix_creator.species_table)
+
+    def __parse_or_look_up(self, equation):
+        """
+        Parses the equation, unless its result is already in the result cache.
+
+        :return: the final result if the equation is invalid or cached (None otherwise),
+        the parsed equation and its canonical form (None if there is no cache)
+        """
+        result, molecules, canonical_equation = self.__look_up(equation)
+        if result is not None:
+            return result, None, None
+        result, parsed_equation = self.__parse(equation, molecules)
+        if result is not None:
+            return result, None, None
+        return None, parsed_equation, canonical_equation
+
+    def __look_up(self, equation):
+        """
+        Splits the equation into molecules and looks its result up in the caches.
+
+        :return: the final result if the equation is invalid or cached (None otherwise), the pair of the molecules
+        of both sides and the canonical form of the equation (None if there is no cache)
+        """
+        try:
+            with self.metrics.stage("split"):
+                molecules = self.equation_parser.split_into_molecules(equation)
+        except SyntaxError as ex:
+            self.logger.error("Equation parsing error: ", ex)
+            return BalancingResult(equation, INVALID, error=str(ex)), None, None
+        canonical_equation = None
+        if self.equation_cache is not None or self.result_cache is not None:
+            canonical_equation = CanonicalEquation(*molecules)
+        if self.equation_cache is not None:
+            with self.metrics.stage("equation_cache"):
+                result = self.equation_cache.get(equation, canonical_equation)
+            if result is not None:
+                return result, None, None
+        if self.result_cache is not None:
+            with self.metrics.stage("result_cache"):
+                result = self.result_cache.get(equation, canonical_equation)
+            if result is not None:
+                if self.equation_cache is not None:
+                    self.equation_cache.put(canonical_equation, result)
+                return result, None, None
+        return None, molecules, canonical_equation
+
+    def __parse(self, equation, molecules):
+        """
+        Parses the molecules of the equation into atoms.
+
+        :return: the final result if the equation is invalid (None otherwise) and the parsed equation
+        """
+        try:
+            with self.metrics.stage("parse"):
+                return None, self.equation_parser.parse_molecules(*molecules)
+        except SyntaxError as ex:
+            self.logger.error("Equation parsing error: ", ex)
+            return BalancingResult(equation, INVALID, error=str(ex)), None
+
+    def __balance_parsed_equation(self, equation, parsed_equation):
         """
-        left_side_molecules, right_side_molecules = self.__get_molecules(equation)
-        self.logger.info("Parsing the equation...")
-        equation_matrix = self.matrix_creator.create_equation_matrix(equation)
+        Builds the matrix of the parsed equation, computes the coefficients out of it and validates them.
+
+        :return: the BalancingResult
+        """
+        with self.metrics.stage("matrix"):
+            equation_matrix = self.__create_matrix(parsed_equation)
+        self.__observe_matrix(equation_matrix)
         self.logger.info("Creating the equation matrix...", args=equation_matrix)
         try:
-            equation_coefficients = self.matrix_computer.compute_coefficients(equation_matrix)
+            with self.metrics.stage("solve"):
+                equation_coefficients = self.matrix_computer.compute_coefficients(equation_matrix)
         except ValueError as ex:
             self.logger.error("Coefficients computing error: ", ex)
-            return False
-        self.logger.info("Computed the coefficients:", args=equation_coefficients)
-        self.__print_results(left_side_molecules, right_side_molecules, equation_coefficients)
-        return self.balancing_validator.validate_balancing(
-            left_side_molecules, right_side_molecules, equation_coefficients)
+            equation_coefficients = ex
+        else:
+            self.logger.info("Computed the coefficients:", args=equation_coefficients)
+        with self.metrics.stage("validate"):
+            balanced = not isinstance(equation_coefficients, ValueError) and \
+                self.balancing_validator.validate_matrix_balancing(equation_matrix, equation_coefficients)
+            return self.__create_result(equation, parsed_equation, equation_coefficients, balanced)
+
+    def __balance_parsed_many(self, equations, parsed_equations, matrices, results):
+        """
+        Computes the coefficients of many parsed equations out of their matrices at once, validates them
+        and fills their results in.
+
+        :param equations: all the equations
+        :param parsed_equations: list of (index of the equation, parsed equation, canonical equation)
+        :param matrices: the matrices of the parsed equations
+        :param results: the results of all the equations
+        """
+        with self.metrics.stage("batch_solve"):
+            computed_coefficients = self.batch_matrix_computer.compute_many_coefficients(matrices)
+        with self.metrics.stage("validate"):
+            solved = [k for k, coefficients in enumerate(computed_coefficients)
+                      if not isinstance(coefficients, ValueError)]
+            balanced = [False] * len(computed_coefficients)
+            for k, is_balanced in zip(solved, self.batch_balancing_validator.validate_many_matrix_balancing(
+                    [matrices[k] for k in solved], [computed_coefficients[k] for k in solved])):
+                balanced[k] = is_balanced
+            for (i, parsed_equation, _), coefficients, is_balanced in \
+                    zip(parsed_equations, computed_coefficients, balanced):
+                results[i] = self.__create_result(equations[i], parsed_equation, coefficients, is_balanced)
 
-    def __get_molecules(self, equation):
+    def __create_invalid_result(self, equation):
+        """
+        :return: the result of an equation which could not be parsed when its corpus was compiled
+        """
         try:
-            sides = self.equation_parser.parse_equation_into_two_sides(equation)
-            left_side_molecules = self.equation_parser.parse_side_to_molecules(sides[0])
-            right_side_molecules = self.equation_parser.parse_side_to_molecules(sides[1])
-            return left_side_molecules, right_side_molecules
+            self.equation_parser.parse_equation(equation)
         except SyntaxError as ex:
-            self.logger.error("Equation parsing error: ", ex)
-            sys.exit(1)
+            return BalancingResult(equation, INVALID, error=str(ex))
+        return BalancingResult(equation, INVALID, error="The equation could not be parsed when compiled")
+
+    def __screen(self, parsed_equation):
+        """
+        :return: the ValueError with the reason of rejecting the parsed equation, None if it passes the screening
+        """
+        if not self.screening:
+            return None
+        try:
+            with self.metrics.stage("screen"):
+                EquationScreener.screen(parsed_equation)
+        except ValueError as ex:
+            self.metrics.increment("equations_screened")
+            return ex
+        return None
+
+    def __store_results(self, entries):
+        """
+        :param entries: list of (canonical equation, BalancingResult) pairs of the newly computed results
+        """
+        if self.equation_cache is not None:
+            with self.metrics.stage("equation_cache"):
+                self.equation_cache.put_many(entries)
+        if self.result_cache is not None:
+            with self.metrics.stage("result_cache"):
+                self.result_cache.put_many(entries)
+
+    @staticmethod
+    def __from_repeated_result(equation, canonical_equation, first_canonical_equation, first_result):
+        """
+        :return: the result of an equation repeated within a batch, mapped to its own molecule order
+        """
+        if first_result.status == INVALID:
+            return BalancingResult(equation, INVALID, error=first_result.error)
+        left_side_molecules, right_side_molecules = canonical_equation.molecules
+        coefficients = first_result.coefficients
+        if coefficients is not None:
+            coefficients = canonical_equation.from_canonical_order(
+                first_canonical_equation.to_canonical_order(coefficients))
+        return BalancingResult(equation, first_result.status, left_side_molecules, right_side_molecules,
+                               coefficients, first_result.error)
+
+    @staticmethod
+    def __copy_result(equation, result):
+        """
+        :return: the copy of the result of the very same equation given once again
+        """
+        return BalancingResult(equation, result.status, result.left_side_molecules, result.right_side_molecules,
+                               list(result.coefficients) if result.coefficients is not None else None, result.error)
+
+    def __create_matrix(self, parsed_equation):
+        if self.sparse:
+            return self.matrix_creator.create_sparse_equation_matrix(parsed_equation)
+        return self.matrix_creator.create_indexed_equation_rows(parsed_equation)
+
+    def __finish(self, result):
+        """
+        Counts the result and adds it to the result store, if it is balanced.
+
+        :return: the result
+        """
+        self.metrics.increment("equations_" + result.status)
+        if self.result_store is not None and result.is_balanced:
+            with self.metrics.stage("result_store"):
+                self.result_store.add(result)
+        return result
+
+    def __observe_matrix(self, matrix):
+        if self.metrics.enabled:
+            rows, columns = (len(matrix), len(matrix[0])) if isinstance(matrix, list) else matrix.shape
+            self.metrics.observe("matrix_rows", rows)
+            self.metrics.observe("matrix_columns", columns)
 
     @staticmethod
-    def __print_results(left_side_molecules, right_side_molecules, coefficients):
-        print("")
-        left_side_coefficients = [-int(x) for x in coefficients if x < 0]
-        right_side_coefficients = [int(x) for x in coefficients if x > 0]
-        for i in range(len(left_side_molecules)):
-            print(left_side_coefficients[i], left_side_molecules[i], " ", end="")
-            if i != len(left_side_molecules) - 1:
-                print("+ ", end="")
-        print("-> ", end="")
-        for i in range(len(right_side_molecules)):
-            print(right_side_coefficients[i], right_side_molecules[i], " ", end="")
-            if i != len(right_side_molecules) - 1:
-                print("+ ", end="")
-        print("")
+    def __create_result(equation, parsed_equation, coefficients, balanced):
+        left_side_molecules = parsed_equation.left_side_molecules
+        right_side_molecules = parsed_equation.right_side_molecules
+        if isinstance(coefficients, ValueError):
+            return BalancingResult(equation, UNBALANCEABLE, left_side_molecules, right_side_molecules,
+                                   error=str(coefficients))
+        left_side_count = len(left_side_molecules)
+        if any(x > 0 for x in coefficients[:left_side_count]) or any(x < 0 for x in coefficients[left_side_count:]):
+            return BalancingResult(equation, UNBALANCEABLE, left_side_molecules, right_side_molecules,
+                                   error="Some molecules would have to switch sides to balance the equation")
+        if not balanced:
+            return BalancingResult(equation, UNBALANCEABLE, left_side_molecules, right_side_molecules,
+                                   error="Computed coefficients do not balance the equation")
+        return BalancingResult(equation, BALANCED, left_side_molecules, right_side_molecules, coefficients)
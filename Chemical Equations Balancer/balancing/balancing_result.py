@@ -0,0 +1,58 @@
+BALANCED = "balanced"
+UNBALANCEABLE = "unbalanceable"
+INVALID = "invalid"
+
+
+class BalancingResult:
+    """
+    A class holding the outcome of balancing a single equation.
+    """
+
+    def __init__(self, equation, status, left_side_molecules=None, right_side_molecules=None,
+                 coefficients=None, error=None):
+        """
+        :param equation: the equation as given
+        :param status: one of BALANCED, UNBALANCEABLE (skeletal or underdetermined) or INVALID (syntax error)
+        :param left_side_molecules: the molecules in left side of the equation
+        :param right_side_molecules: the molecules in right side of the equation
+        :param coefficients: the computed coefficients, negative for the left side
+        :param error: the error message, if the equation was not balanced
+        """
+        self.equation = equation
+        self.status = status
+        self.left_side_molecules = left_side_molecules
+        self.right_side_molecules = right_side_molecules
+        self.coefficients = coefficients
+        self.error = error
+
+    @property
+    def is_balanced(self):
+        return self.status == BALANCED
+
+    @property
+    def balanced_equation(self):
+        """
+        :return: the equation with coefficients, e.g. 2 H2 + 1 O2 -> 2 H2O, or None if it was not balanced
+        """
+        if not self.is_balanced:
+            return None
+        left_side_coefficients = [-x for x in self.coefficients if x < 0]
+        right_side_coefficients = [x for x in self.coefficients if x > 0]
+        return " -> ".join(
+            " + ".join(str(c) + " " + m for c, m in zip(coefficients, molecules))
+            for coefficients, molecules in ((left_side_coefficients, self.left_side_molecules),
+                                            (right_side_coefficients, self.right_side_molecules)))
+
+    def __bool__(self):
+        return self.is_balanced
+
+    def to_dict(self):
+        """
+        :return: the result as a JSON-serializable dictionary
+        """
+        return {"equation": self.equation, "status": self.status, "coefficients": self.coefficients,
+                "balanced_equation": self.balanced_equation, "valid": self.is_balanced, "error": self.error}
+
+    def __repr__(self):
+        return "BalancingResult(" + repr(self.equation) + ", " + self.status + ", " + \
+               (repr(self.coefficients) if self.is_balanced else repr(self.error)) + ")"
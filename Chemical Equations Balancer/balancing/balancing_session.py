@@ -0,0 +1,227 @@
+from math import gcd
+
+from balancing.balancing_result import BalancingResult, BALANCED, UNBALANCEABLE, INVALID
+from parsing.equation_parser import EquationParser
+from parsing.species_index import SpeciesTable
+
+
+class BalancingSession:
+    """
+    A stateful session for balancing an equation edited step by step - molecules added to and removed
+    from its sides one at a time.
+    The session keeps the elimination state of the equation matrix: its reduced row-echelon form R together
+    with the row combinations T, such that T x A = R. Every row is kept as a pair of dictionaries of integers -
+    the entries of R keyed by molecule and the entries of T keyed by element. Adding a molecule computes its
+    column of R out of T and takes at most one pivot step, removing one takes at most one pivot step too,
+    so an edit costs O(rows x molecules) rather than a whole new elimination.
+    """
+
+    def __init__(self, equation=None, species_table=None):
+        """
+        :param equation: the optional equation to start with
+        :param species_table: the table of compiled species, the process-wide one by default
+        """
+        self.species_table = species_table if species_table is not None else SpeciesTable.shared()
+        self.__molecules = {}
+        self.__left_side = []
+        self.__right_side = []
+        self.__next_molecule = 0
+        self.__element_rows = {}
+        self.__rows = []
+        self.__row_pivots = []
+        self.__pivot_rows = {}
+        if equation is not None:
+            left_side_molecules, right_side_molecules = \
+                EquationParser(self.species_table.molecule_parser).split_into_molecules(equation)
+            for molecule in left_side_molecules:
+                self.add_reactant(molecule)
+            for molecule in right_side_molecules:
+                self.add_product(molecule)
+
+    @property
+    def left_side_molecules(self):
+        return [self.__molecules[m].formula for m in self.__left_side]
+
+    @property
+    def right_side_molecules(self):
+        return [self.__molecules[m].formula for m in self.__right_side]
+
+    @property
+    def equation(self):
+        """
+        :return: the current equation, e.g. H2 + O2 -> H2O
+        """
+        return " + ".join(self.left_side_molecules) + " -> " + " + ".join(self.right_side_molecules)
+
+    @property
+    def nullity(self):
+        """
+        :return: the number of independent ways the current equation can be balanced in
+        """
+        return len(self.__molecules) - len(self.__pivot_rows)
+
+    def add_reactant(self, molecule):
+        """
+        Adds the molecule to the left side of the equation.
+        Raises SyntaxError if the molecule does not meet format requirements.
+
+        :param molecule: the molecule
+        """
+        self.__left_side.append(self.__add_molecule(molecule))
+
+    def add_product(self, molecule):
+        """
+        Adds the molecule to the right side of the equation.
+        Raises SyntaxError if the molecule does not meet format requirements.
+
+        :param molecule: the molecule
+        """
+        self.__right_side.append(self.__add_molecule(molecule))
+
+    def remove_reactant(self, molecule):
+        """
+        Removes the first occurrence of the molecule from the left side of the equation.
+
+        :param molecule: the molecule
+        :raises: ValueError if the left side has no such molecule
+        """
+        self.__remove_molecule(molecule, self.__left_side)
+
+    def remove_product(self, molecule):
+        """
+        Removes the first occurrence of the molecule from the right side of the equation.
+
+        :param molecule: the molecule
+        :raises: ValueError if the right side has no such molecule
+        """
+        self.__remove_molecule(molecule, self.__right_side)
+
+    def balance(self):
+        """
+        Computes the coefficients of the current equation out of the kept elimination state.
+
+        :return: the BalancingResult, truthy if the equation was successfully balanced
+        """
+        equation = self.equation
+        left_side_molecules = self.left_side_molecules
+        right_side_molecules = self.right_side_molecules
+        if not left_side_molecules or not right_side_molecules:
+            return BalancingResult(equation, INVALID, left_side_molecules, right_side_molecules,
+                                   error="Both sides of the equation need at least one molecule")
+        try:
+            coefficients = self.__compute_coefficients(self.__left_side + self.__right_side)
+        except ValueError as ex:
+            return BalancingResult(equation, UNBALANCEABLE, left_side_molecules, right_side_molecules,
+                                   error=str(ex))
+        left_side_count = len(left_side_molecules)
+        if any(x > 0 for x in coefficients[:left_side_count]) or \
+                any(x < 0 for x in coefficients[left_side_count:]):
+            return BalancingResult(equation, UNBALANCEABLE, left_side_molecules, right_side_molecules,
+                                   error="Some molecules would have to switch sides to balance the equation")
+        return BalancingResult(equation, BALANCED, left_side_molecules, right_side_molecules, coefficients)
+
+    def __add_molecule(self, molecule):
+        species = self.species_table.get(molecule.strip())
+        key = self.__next_molecule
+        self.__next_molecule += 1
+        for element_id in species.element_ids:
+            if element_id not in self.__element_rows:
+                self.__element_rows[element_id] = len(self.__rows)
+                self.__rows.append(({}, {element_id: 1}))
+                self.__row_pivots.append(None)
+        composition = dict(zip(species.element_ids, species.counts))
+        candidate_rows = []
+        for i, (values, combination) in enumerate(self.__rows):
+            value = sum(factor * composition[e] for e, factor in combination.items() if e in composition)
+            if value:
+                values[key] = value
+                if self.__row_pivots[i] is None:
+                    candidate_rows.append(i)
+        self.__molecules[key] = species
+        if candidate_rows:
+            self.__pivot(min(candidate_rows, key=lambda i: len(self.__rows[i][1])), key)
+        return key
+
+    def __remove_molecule(self, molecule, side):
+        molecule = molecule.strip()
+        key = next((m for m in side if self.__molecules[m].formula == molecule), None)
+        if key is None:
+            raise ValueError("There is no " + molecule + " in this side of the equation")
+        side.remove(key)
+        del self.__molecules[key]
+        for values, _ in self.__rows:
+            values.pop(key, None)
+        row = self.__pivot_rows.pop(key, None)
+        if row is not None:
+            self.__row_pivots[row] = None
+            values = self.__rows[row][0]
+            if values:
+                self.__pivot(row, next(iter(values)))
+
+    def __pivot(self, pivot_row, key):
+        """
+        Makes the molecule the pivot column of the row, eliminating it from all the other rows.
+        """
+        pivot_values, pivot_combination = self.__rows[pivot_row]
+        pivot_value = pivot_values[key]
+        for i, (values, combination) in enumerate(self.__rows):
+            factor = values.get(key)
+            if i == pivot_row or not factor:
+                continue
+            self.__rows[i] = self.__normalize(self.__combine(values, pivot_value, pivot_values, factor),
+                                              self.__combine(combination, pivot_value, pivot_combination, factor))
+        self.__row_pivots[pivot_row] = key
+        self.__pivot_rows[key] = pivot_row
+
+    @staticmethod
+    def __combine(row, pivot_value, pivot_row, factor):
+        combined_row = {k: pivot_value * v for k, v in row.items()}
+        for k, v in pivot_row.items():
+            value = combined_row.get(k, 0) - factor * v
+            if value:
+                combined_row[k] = value
+            else:
+                combined_row.pop(k, None)
+        return combined_row
+
+    @staticmethod
+    def __normalize(values, combination):
+        divisor = 0
+        for v in values.values():
+            divisor = gcd(divisor, v)
+        for v in combination.values():
+            divisor = gcd(divisor, v)
+        if divisor > 1:
+            return {k: v // divisor for k, v in values.items()}, {k: v // divisor for k, v in combination.items()}
+        return values, combination
+
+    def __compute_coefficients(self, keys):
+        """
+        :param keys: the molecules, in the order of the equation
+        :return: the coefficients as minimal integers, the last one positive
+        :raises: ValueError upon the equation being skeletal or underdetermined
+        """
+        free_keys = [k for k in keys if k not in self.__pivot_rows]
+        if not free_keys:
+            raise ValueError("Skeletal equation - cannot be balanced!")
+        if len(free_keys) > 1:
+            raise ValueError("Underdetermined equation - it can be balanced in " + str(len(free_keys)) +
+                             " independent ways!")
+        free_key = free_keys[0]
+        multiple = 1
+        for key, row in self.__pivot_rows.items():
+            pivot_value = self.__rows[row][0][key]
+            multiple = multiple * abs(pivot_value) // gcd(multiple, pivot_value)
+        solution = {free_key: multiple}
+        for key, row in self.__pivot_rows.items():
+            values = self.__rows[row][0]
+            solution[key] = -values.get(free_key, 0) * (multiple // values[key])
+        coefficients = [solution[k] for k in keys]
+        divisor = gcd(*coefficients)
+        if coefficients[-1] < 0:
+            divisor = -divisor
+        coefficients = [x // divisor for x in coefficients]
+        if 0 in coefficients:
+            raise ValueError("Skeletal equation - molecule " + str(coefficients.index(0) + 1) +
+                             " does not take part in the reaction!")
+        return coefficients
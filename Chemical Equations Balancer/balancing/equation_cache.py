@@ -0,0 +1,95 @@
+import threading
+
+from collections import OrderedDict
+
+from balancing.balancing_result import BalancingResult, BALANCED, UNBALANCEABLE
+
+DEFAULT_EQUATION_CACHE_SIZE = 4096
+
+
+class EquationCache:
+    """
+    An in-memory, size-bounded (LRU) cache of balancing results.
+    Results are keyed by the canonical form of the equation and kept with coefficients in the canonical
+    molecule order, so the same reaction written with its molecules in a different order is solved once,
+    and every caller gets the coefficients in its own molecule order.
+    Has the same interface as the persistent ResultCache.
+    """
+
+    def __init__(self, max_size=DEFAULT_EQUATION_CACHE_SIZE):
+        """
+        :param max_size: the maximum number of results kept in the cache
+        """
+        if max_size < 1:
+            raise ValueError("Cache size must be a positive number")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, equation, canonical_equation):
+        """
+        Looks the equation up in the cache.
+
+        :param equation: the equation as given by the caller
+        :param canonical_equation: the canonical form of the equation
+        :return: the BalancingResult with coefficients in the caller's molecule order, or None on a miss
+        """
+        with self.__lock:
+            entry = self.__entries.get(canonical_equation.key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(canonical_equation.key)
+            self.hits += 1
+        status, coefficients, error = entry
+        left_side_molecules, right_side_molecules = canonical_equation.molecules
+        if status == BALANCED:
+            coefficients = canonical_equation.from_canonical_order(coefficients)
+        return BalancingResult(equation, status, left_side_molecules, right_side_molecules, coefficients, error)
+
+    def put(self, canonical_equation, result):
+        """
+        Stores the result of balancing an equation. Invalid equations are never stored.
+
+        :param canonical_equation: the canonical form of the equation
+        :param result: the BalancingResult
+        """
+        if result.status not in (BALANCED, UNBALANCEABLE):
+            return
+        coefficients = tuple(canonical_equation.to_canonical_order(result.coefficients)) \
+            if result.status == BALANCED else None
+        with self.__lock:
+            self.__entries[canonical_equation.key] = (result.status, coefficients, result.error)
+            self.__entries.move_to_end(canonical_equation.key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_many(self, entries):
+        """
+        :param entries: iterable of (canonical equation, BalancingResult) pairs
+        """
+        for canonical_equation, result in entries:
+            self.put(canonical_equation, result)
+
+    def statistics(self):
+        """
+        :return: the dictionary of cache counters
+        """
+        with self.__lock:
+            return {"size": len(self.__entries), "max_size": self.max_size,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        """
+        Removes all the cached results and resets the counters.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
@@ -0,0 +1,121 @@
+import numpy as np
+
+from balancing.balancing_result import BalancingResult, BALANCED, UNBALANCEABLE, INVALID
+from computing.balancing_validator import BalancingValidator
+from computing.batch_matrix_computer import BatchMatrixComputer
+from computing.matrix_creator import MatrixCreator
+
+
+class NetworkBalancingResult:
+    """
+    A class holding the outcome of balancing a whole reaction network.
+    """
+
+    def __init__(self, results, species, elements, skeletal, underdetermined, invalid):
+        """
+        :param results: the BalancingResult of every reaction, in the order of the reactions
+        :param species: the global species table - every distinct molecule, in the order of first occurrence
+        :param elements: the global element table
+        :param skeletal: the indices of the reactions that cannot be balanced at all
+        :param underdetermined: the indices of the reactions that can be balanced in more than one independent way
+        :param invalid: the indices of the reactions with syntax errors
+        """
+        self.results = results
+        self.species = species
+        self.elements = elements
+        self.skeletal = skeletal
+        self.underdetermined = underdetermined
+        self.invalid = invalid
+
+    @property
+    def balanced(self):
+        return [i for i, result in enumerate(self.results) if result.is_balanced]
+
+
+class NetworkBalancer:
+    """
+    A class for balancing a whole set of coupled reactions, e.g. a mechanism file, in one call.
+    All the reactions are parsed once into a global species x element composition matrix, every
+    distinct formula being compiled a single time by the species table. Each reaction's matrix is
+    a slice of that matrix, and all of them are solved together - a block-diagonal system, solved
+    group by group of equal-shaped blocks by the BatchMatrixComputer.
+    """
+
+    def __init__(self, molecule_cache=None):
+        """
+        :param molecule_cache: the molecule cache, the process-wide one by default
+        """
+        self.matrix_creator = MatrixCreator(molecule_parser=molecule_cache)
+        self.equation_parser = self.matrix_creator.equation_parser
+        self.batch_matrix_computer = BatchMatrixComputer()
+        self.balancing_validator = BalancingValidator(logging=False, molecule_parser=molecule_cache)
+
+    def balance_network(self, reactions):
+        """
+        Balances all the reactions against a shared species and element index.
+
+        :param reactions: the reactions (equations) of the network
+        :return: the NetworkBalancingResult
+        """
+        results = [None] * len(reactions)
+        species_indices = {}
+        species = []
+        reaction_species = []
+        for i, reaction in enumerate(reactions):
+            try:
+                left_side_molecules, right_side_molecules = self.equation_parser.split_into_molecules(reaction)
+                columns = [self.__index_species(m, species_indices, species)
+                           for m in left_side_molecules + right_side_molecules]
+            except SyntaxError as ex:
+                results[i] = BalancingResult(reaction, INVALID, error=str(ex))
+                continue
+            reaction_species.append((i, left_side_molecules, right_side_molecules, columns))
+        if species:
+            element_ids, composition = self.matrix_creator.create_species_composition(species)
+        else:
+            element_ids, composition = [], np.zeros((0, 0), dtype=np.int64)
+        matrices = []
+        for _, _, _, columns in reaction_species:
+            block = composition[:, columns]
+            matrices.append(block[block.any(axis=1)])
+        computed_coefficients = self.batch_matrix_computer.compute_many_coefficients(matrices)
+        solved = [k for k, coefficients in enumerate(computed_coefficients) if not isinstance(coefficients, ValueError)]
+        balanced = [False] * len(computed_coefficients)
+        for k, is_balanced in zip(solved, self.balancing_validator.validate_many_matrix_balancing(
+                [matrices[k] for k in solved], [computed_coefficients[k] for k in solved])):
+            balanced[k] = is_balanced
+        skeletal = []
+        underdetermined = []
+        for (i, left_side_molecules, right_side_molecules, _), matrix, coefficients, is_balanced in \
+                zip(reaction_species, matrices, computed_coefficients, balanced):
+            results[i] = self.__create_result(reactions[i], left_side_molecules, right_side_molecules, coefficients,
+                                              is_balanced)
+            if not results[i].is_balanced:
+                nullity = self.batch_matrix_computer.nullspace_computer.compute_nullity(matrix)
+                (underdetermined if nullity > 1 else skeletal).append(i)
+        element_table = self.matrix_creator.species_table.element_table
+        elements = [element_table.symbol(element_id) for element_id in element_ids]
+        return NetworkBalancingResult(results, [s.formula for s in species], elements, skeletal, underdetermined,
+                                      [i for i, result in enumerate(results) if result.status == INVALID])
+
+    def __index_species(self, molecule, species_indices, species):
+        column = species_indices.get(molecule)
+        if column is None:
+            compiled_species = self.matrix_creator.species_table.get(molecule)
+            column = species_indices[molecule] = len(species)
+            species.append(compiled_species)
+        return column
+
+    @staticmethod
+    def __create_result(reaction, left_side_molecules, right_side_molecules, coefficients, balanced):
+        if isinstance(coefficients, ValueError):
+            return BalancingResult(reaction, UNBALANCEABLE, left_side_molecules, right_side_molecules,
+                                   error=str(coefficients))
+        left_side_count = len(left_side_molecules)
+        if any(x > 0 for x in coefficients[:left_side_count]) or any(x < 0 for x in coefficients[left_side_count:]):
+            return BalancingResult(reaction, UNBALANCEABLE, left_side_molecules, right_side_molecules,
+                                   error="Some molecules would have to switch sides to balance the equation")
+        if not balanced:
+            return BalancingResult(reaction, UNBALANCEABLE, left_side_molecules, right_side_molecules,
+                                   error="Computed coefficients do not balance the equation")
+        return BalancingResult(reaction, BALANCED, left_side_molecules, right_side_molecules, coefficients)
@@ -0,0 +1,162 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
+from balancing.balancer import Balancer
+from balancing.balancing_result import BalancingResult, INVALID
+from parsing.compiled_corpus import CompiledCorpus
+
+DEFAULT_CHUNK_SIZE = 256
+
+worker_balancer = None
+worker_corpora = {}
+
+
+def init_worker():
+    """
+    Sets up the balancer of a worker process. It stays warm - together with its
+    molecule cache - for all the chunks the worker gets.
+    """
+    global worker_balancer
+    worker_balancer = Balancer(logging=False)
+
+
+def balance_chunk(equations):
+    """
+    Balances a chunk of equations in a worker process.
+    An equation crashing the balancer only fails itself, never the rest of the chunk.
+
+    :param equations: the equations
+    :return: list of BalancingResult, in the order of the equations
+    """
+    if worker_balancer is None:
+        init_worker()
+    try:
+        return worker_balancer.balance_many(equations)
+    except Exception:
+        return [balance_single(equation) for equation in equations]
+
+
+def balance_compiled_chunk(path, start, stop):
+    """
+    Balances a chunk of the equations of a compiled corpus in a worker process. The worker maps the corpus
+    file once, and shares its pages with all the other workers.
+
+    :param path: the path of the compiled corpus file
+    :param start: the index of the first equation of the chunk
+    :param stop: the index past the last equation of the chunk
+    :return: list of BalancingResult, in the order of the equations
+    """
+    if worker_balancer is None:
+        init_worker()
+    corpus = worker_corpora.get(path)
+    if corpus is None:
+        corpus = worker_corpora[path] = CompiledCorpus(path)
+    try:
+        return worker_balancer.balance_compiled(corpus, start, stop)
+    except Exception:
+        return [balance_compiled_single(corpus, i) for i in range(start, stop)]
+
+
+def balance_compiled_single(corpus, i):
+    try:
+        return worker_balancer.balance_compiled(corpus, i, i + 1)[0]
+    except Exception as ex:
+        return BalancingResult(corpus.equation(i), INVALID, error=type(ex).__name__ + ": " + str(ex))
+
+
+def balance_single(equation):
+    try:
+        return worker_balancer.balance_many([equation])[0]
+    except Exception as ex:
+        return BalancingResult(equation, INVALID, error=type(ex).__name__ + ": " + str(ex))
+
+
+class ParallelBalancer:
+    """
+    A class for balancing large numbers of equations on all the CPU cores.
+    Equations are sent to a pool of worker processes in chunks, and the results come back in order.
+    """
+
+    def __init__(self, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        :param workers: the number of worker processes, the number of CPUs by default
+        :param chunk_size: the number of equations sent to a worker at once
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be a positive number")
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.__executor = None
+
+    def balance_many(self, equations):
+        """
+        Balances many equations in the worker processes.
+
+        :param equations: the equations to be balanced
+        :return: list of BalancingResult, in the order of the equations
+        """
+        equations = list(equations)
+        chunks = [equations[i:i + self.chunk_size] for i in range(0, len(equations), self.chunk_size)]
+        results = []
+        for chunk_results in self.__get_executor().map(balance_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+
+    def balance_compiled(self, path):
+        """
+        Balances all the equations of a compiled corpus in the worker processes. Only the ranges of
+        the equations are sent to the workers - each of them maps the corpus file itself.
+
+        :param path: the path of the compiled corpus file
+        :return: list of BalancingResult, in the order of the equations
+        """
+        with CompiledCorpus(path) as corpus:
+            count = len(corpus)
+        starts = range(0, count, self.chunk_size)
+        stops = [min(start + self.chunk_size, count) for start in starts]
+        results = []
+        for chunk_results in self.__get_executor().map(balance_compiled_chunk, repeat(path), starts, stops):
+            results.extend(chunk_results)
+        return results
+
+    def balance_stream(self, equations):
+        """
+        Balances a possibly endless stream of equations in the worker processes.
+        Only a few chunks per worker are in flight at any time, so the memory stays bounded.
+
+        :param equations: iterable of the equations to be balanced
+        :return: generator of BalancingResult, in the order of the equations
+        """
+        equations = iter(equations)
+        executor = self.__get_executor()
+        in_flight = deque()
+        while True:
+            while len(in_flight) < 2 * self.workers:
+                chunk = list(islice(equations, self.chunk_size))
+                if not chunk:
+                    break
+                in_flight.append(executor.submit(balance_chunk, chunk))
+            if not in_flight:
+                return
+            yield from in_flight.popleft().result()
+
+    def close(self):
+        """
+        Shuts the worker processes down.
+        """
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __get_executor(self):
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        return self.__executor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
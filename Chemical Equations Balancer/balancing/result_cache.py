@@ -0,0 +1,159 @@
+import json
+import sqlite3
+import threading
+
+from balancing.balancing_result import BalancingResult, BALANCED, UNBALANCEABLE
+from computing.matrix_computer import SOLVER_VERSION
+
+DEFAULT_MAX_ENTRIES = 1000000
+EVICTED_FRACTION = 0.1
+# recency updates of cache hits are kept in memory and written in batches of this many
+RECENCY_BATCH_SIZE = 256
+# keys looked up at once when checking which results of a batch are stored already - below SQLite's variable limit
+KEYS_PER_QUERY = 500
+
+
+class ResultCache:
+    """
+    A persistent, SQLite backed cache of balancing results, surviving process restarts.
+    Results are keyed by the canonical form of the equation, so the same reaction written with
+    different spacing or molecule order is computed once. The least recently used entries are
+    evicted above max_entries, and entries computed by a different solver version are dropped.
+    The number of entries is tracked as they are stored and evicted, and the recency of cache hits is written
+    in batches, so neither a miss nor a hit costs time proportional to the size of the cache.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, version=SOLVER_VERSION):
+        """
+        :param path: the path of the cache database file
+        :param max_entries: the maximum number of results kept
+        :param version: the version of the solver logic - results of the other versions are invalidated
+        """
+        if max_entries < 1:
+            raise ValueError("Cache size must be a positive number")
+        self.max_entries = max_entries
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, version INTEGER, "
+                                  "status TEXT, coefficients TEXT, error TEXT, last_used INTEGER)")
+        self.__connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.__connection.execute("DELETE FROM results WHERE version != ?", (version,))
+        self.__size, last_used = self.__connection.execute(
+            "SELECT COUNT(*), COALESCE(MAX(last_used), 0) FROM results").fetchone()
+        self.__clock = last_used
+        self.__recency_updates = {}
+
+    def get(self, equation, canonical_equation):
+        """
+        Looks the equation up in the cache.
+
+        :param equation: the equation as given by the caller
+        :param canonical_equation: the canonical form of the equation
+        :return: the BalancingResult with coefficients in the caller's molecule order, or None on a miss
+        """
+        with self.__lock:
+            row = self.__connection.execute("SELECT status, coefficients, error FROM results WHERE key = ?",
+                                            (canonical_equation.key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.__clock += 1
+            self.__recency_updates[canonical_equation.key] = self.__clock
+            if len(self.__recency_updates) >= RECENCY_BATCH_SIZE:
+                self.__write_recency_updates()
+        status, coefficients, error = row
+        left_side_molecules, right_side_molecules = canonical_equation.molecules
+        if status == BALANCED:
+            coefficients = canonical_equation.from_canonical_order(json.loads(coefficients))
+        return BalancingResult(equation, status, left_side_molecules, right_side_molecules,
+                               coefficients if status == BALANCED else None, error)
+
+    def put_many(self, entries):
+        """
+        Stores many results in a single transaction. Invalid equations are never stored.
+
+        :param entries: iterable of (canonical equation, BalancingResult) pairs
+        """
+        rows = {}
+        with self.__lock:
+            for canonical_equation, result in entries:
+                if result.status not in (BALANCED, UNBALANCEABLE):
+                    continue
+                self.__clock += 1
+                coefficients = json.dumps(canonical_equation.to_canonical_order(result.coefficients)) \
+                    if result.status == BALANCED else None
+                rows[canonical_equation.key] = (canonical_equation.key, self.version, result.status, coefficients,
+                                                result.error, self.__clock)
+            if not rows:
+                return
+            self.__connection.execute("BEGIN")
+            self.__size += len(rows) - self.__count_stored(list(rows))
+            self.__connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                                          rows.values())
+            for key in rows:
+                self.__recency_updates.pop(key, None)
+            self.__connection.execute("COMMIT")
+            if self.__size > self.max_entries:
+                self.__evict()
+
+    def put(self, canonical_equation, result):
+        """
+        Stores the result of balancing an equation.
+
+        :param canonical_equation: the canonical form of the equation
+        :param result: the BalancingResult
+        """
+        self.put_many([(canonical_equation, result)])
+
+    def statistics(self):
+        """
+        :return: the dictionary of cache counters
+        """
+        return {"size": self.__size, "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses,
+                "version": self.version}
+
+    def close(self):
+        with self.__lock:
+            self.__write_recency_updates()
+        self.__connection.close()
+
+    def __count_stored(self, keys):
+        """
+        :param keys: the keys of the results
+        :return: how many of them are stored already
+        """
+        stored = 0
+        for start in range(0, len(keys), KEYS_PER_QUERY):
+            chunk = keys[start:start + KEYS_PER_QUERY]
+            stored += self.__connection.execute("SELECT COUNT(*) FROM results WHERE key IN (" +
+                                                ", ".join("?" * len(chunk)) + ")", chunk).fetchone()[0]
+        return stored
+
+    def __write_recency_updates(self):
+        if self.__recency_updates:
+            self.__connection.executemany("UPDATE results SET last_used = ? WHERE key = ?",
+                                          [(clock, key) for key, clock in self.__recency_updates.items()])
+            self.__recency_updates = {}
+
+    def __evict(self):
+        """
+        Removes the least recently used entries, a fraction of the cache at a time, so that
+        eviction does not happen on every insert of a full cache.
+        """
+        self.__write_recency_updates()
+        self.__size = self.__connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if self.__size <= self.max_entries:
+            return
+        keep = self.max_entries - int(self.max_entries * EVICTED_FRACTION)
+        self.__connection.execute("DELETE FROM results WHERE key IN (SELECT key FROM results "
+                                  "ORDER BY last_used LIMIT ?)", (self.__size - keep,))
+        self.__size = keep
+
+    def __len__(self):
+        return self.__size
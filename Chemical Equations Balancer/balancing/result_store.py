@@ -0,0 +1,208 @@
+import threading
+from array import array
+from bisect import bisect_left
+
+from balancing.balancing_result import BalancingResult, BALANCED
+from parsing.species_index import SpeciesTable
+
+# queries whose shortest posting (array of reaction ids) is longer than this are intersected with NumPy
+MAX_BISECTED_POSTING = 64
+# postings longer than this many times the ids intersected with them are binary searched, the shorter ones masked
+MIN_SEARCHED_RATIO = 16
+
+
+class ResultStore:
+    """
+    An in-memory store of balanced reactions, indexed for queries by species and element.
+    Every reaction gets an id, in the order of adding. Its species ids and coefficients are kept in flat
+    arrays shared by all the reactions (CSR-style) - the left side species are the ones with negative
+    coefficients. Inverted indexes map every species (as a reactant, as a product and on either side) and
+    every element to the ascending array of the ids of the reactions having it, so a query intersects
+    the arrays, binary searching the ids of the shortest one in the others - with NumPy, unless it is short.
+    The same reaction - the same species on both sides, in any order - is stored once.
+    """
+
+    def __init__(self, species_table=None):
+        """
+        :param species_table: the table of compiled species, used for the elements of the species -
+        the process-wide one by default
+        """
+        self.species_table = species_table if species_table is not None else SpeciesTable.shared()
+        self.__formulas = []
+        self.__species_ids = {}
+        self.__species_elements = []
+        self.__offsets = array('q', [0])
+        self.__species = array('i')
+        self.__coefficients = array('q')
+        self.__wide_coefficients = {}
+        self.__reaction_keys = {}
+        self.__reactant_index = {}
+        self.__product_index = {}
+        self.__species_index = {}
+        self.__element_index = {}
+        self.__lock = threading.Lock()
+
+    def add(self, result):
+        """
+        Adds a balanced reaction to the store. Raises SyntaxError if one of its molecules does not meet format
+        requirements.
+
+        :param result: the BalancingResult
+        :return: the id of the reaction, None if the result is not balanced
+        """
+        if result.status != BALANCED:
+            return None
+        species = [self.__intern(m) for m in result.left_side_molecules + result.right_side_molecules]
+        left_side_count = len(result.left_side_molecules)
+        key = hash((tuple(sorted(species[:left_side_count])), tuple(sorted(species[left_side_count:]))))
+        with self.__lock:
+            reaction_id = self.__reaction_keys.get(key)
+            if reaction_id is not None and self.__is_reaction(reaction_id, species, left_side_count):
+                return reaction_id
+            reaction_id = len(self)
+            self.__reaction_keys.setdefault(key, reaction_id)
+            self.__species.extend(species)
+            try:
+                self.__coefficients.extend(result.coefficients)
+            except OverflowError:
+                self.__coefficients.extend([0] * len(species))
+                self.__wide_coefficients[reaction_id] = list(result.coefficients)
+            self.__offsets.append(len(self.__species))
+            reactants = set(species[:left_side_count])
+            products = set(species[left_side_count:])
+            for index, indexed_species in ((self.__reactant_index, reactants), (self.__product_index, products),
+                                           (self.__species_index, reactants | products)):
+                for s in indexed_species:
+                    index.setdefault(s, array('i')).append(reaction_id)
+            for element in set().union(*(self.__species_elements[s] for s in reactants | products)):
+                self.__element_index.setdefault(element, array('i')).append(reaction_id)
+            return reaction_id
+
+    def add_many(self, results):
+        """
+        :param results: iterable of BalancingResult
+        :return: list of the ids of the reactions, None for the results which are not balanced
+        """
+        return [self.add(result) for result in results]
+
+    def get(self, reaction_id):
+        """
+        :param reaction_id: the id of the reaction
+        :return: the BalancingResult of the reaction, its equation written out of the molecules
+        """
+        start, end = self.__offsets[reaction_id], self.__offsets[reaction_id + 1]
+        coefficients = self.__wide_coefficients.get(reaction_id) or self.__coefficients[start:end].tolist()
+        molecules = [self.__formulas[s] for s in self.__species[start:end]]
+        left_side_count = sum(1 for x in coefficients if x < 0)
+        left_side_molecules, right_side_molecules = molecules[:left_side_count], molecules[left_side_count:]
+        return BalancingResult(" + ".join(left_side_molecules) + " -> " + " + ".join(right_side_molecules),
+                               BALANCED, left_side_molecules, right_side_molecules, coefficients)
+
+    def find(self, reactants=(), products=(), species=(), elements=()):
+        """
+        Finds the reactions having all the given molecules and elements, e.g. find(products=['H2O'])
+        or find(reactants=['KMnO4', 'HCl'], elements=['Cl']). No condition at all finds every reaction.
+
+        :param reactants: the molecules the reactions have on the left side
+        :param products: the molecules the reactions have on the right side
+        :param species: the molecules the reactions have on either side
+        :param elements: the element symbols the reactions contain
+        :return: the ascending array('i') of the ids of the reactions
+        """
+        postings = []
+        for index, keys in ((self.__reactant_index, [self.__species_ids.get(m.strip()) for m in reactants]),
+                            (self.__product_index, [self.__species_ids.get(m.strip()) for m in products]),
+                            (self.__species_index, [self.__species_ids.get(m.strip()) for m in species]),
+                            (self.__element_index, elements)):
+            for key in keys:
+                posting = index.get(key)
+                if posting is None:
+                    return array('i')
+                postings.append(posting)
+        if not postings:
+            return array('i', range(len(self)))
+        postings.sort(key=len)
+        with self.__lock:
+            if len(postings[0]) <= MAX_BISECTED_POSTING:
+                return self.__intersect(postings)
+            return self.__intersect_arrays(postings)
+
+    def statistics(self):
+        """
+        :return: the dictionary of store counters
+        """
+        return {"reactions": len(self), "species": len(self.__formulas), "elements": len(self.__element_index)}
+
+    def __len__(self):
+        return len(self.__offsets) - 1
+
+    def __intern(self, molecule):
+        species_id = self.__species_ids.get(molecule)
+        if species_id is None:
+            compiled_species = self.species_table.get(molecule)
+            element_table = self.species_table.element_table
+            with self.__lock:
+                species_id = self.__species_ids.setdefault(molecule, len(self.__formulas))
+                if species_id == len(self.__formulas):
+                    self.__formulas.append(molecule)
+                    self.__species_elements.append(
+                        frozenset(element_table.symbol(e) for e in compiled_species.element_ids))
+        return species_id
+
+    def __is_reaction(self, reaction_id, species, left_side_count):
+        """
+        :return: true if the reaction has the species, the first left_side_count of them on the left side
+        """
+        start, end = self.__offsets[reaction_id], self.__offsets[reaction_id + 1]
+        coefficients = self.__wide_coefficients.get(reaction_id) or self.__coefficients[start:end]
+        stored_species = self.__species[start:end]
+        stored_left_side_count = sum(1 for x in coefficients if x < 0)
+        return sorted(stored_species[:stored_left_side_count]) == sorted(species[:left_side_count]) and \
+            sorted(stored_species[stored_left_side_count:]) == sorted(species[left_side_count:])
+
+    @staticmethod
+    def __intersect(postings):
+        """
+        Intersects the postings by binary searching every id of the first one in the others - cheap for a short
+        first posting.
+
+        :param postings: the postings, the shortest one first
+        :return: the ascending array of the reaction ids found in all the postings
+        """
+        reaction_ids = postings[0][:]
+        for posting in postings[1:]:
+            found = array('i')
+            position = 0
+            for reaction_id in reaction_ids:
+                position = bisect_left(posting, reaction_id, position)
+                if position == len(posting):
+                    break
+                if posting[position] == reaction_id:
+                    found.append(reaction_id)
+            reaction_ids = found
+        return reaction_ids
+
+    @staticmethod
+    def __intersect_arrays(postings):
+        """
+        Intersects the postings with NumPy - binary searching the ids in a posting much longer than them,
+        and marking the posting ids in a mask otherwise, which is linear in the length of the posting.
+
+        :param postings: the postings, the shortest one first
+        :return: the ascending array of the reaction ids found in all the postings
+        """
+        import numpy as np
+        reaction_ids = np.frombuffer(postings[0], dtype=np.int32)
+        for posting in postings[1:]:
+            posting = np.frombuffer(posting, dtype=np.int32)
+            if len(posting) > MIN_SEARCHED_RATIO * len(reaction_ids):
+                positions = np.searchsorted(posting, reaction_ids)
+                positions[positions == len(posting)] = 0
+                reaction_ids = reaction_ids[posting[positions] == reaction_ids]
+            else:
+                mask = np.zeros(max(posting[-1], reaction_ids[-1]) + 1, dtype=bool)
+                mask[posting] = True
+                reaction_ids = reaction_ids[mask[reaction_ids]]
+            if not len(reaction_ids):
+                break
+        return array('i', reaction_ids.tobytes())
@@ -0,0 +1,57 @@
+import argparse
+
+from balancing.balancer import Balancer
+from balancing.parallel_balancer import ParallelBalancer, DEFAULT_CHUNK_SIZE
+from parsing.compiled_corpus import CompiledCorpus
+
+
+def read_equations(path):
+    """
+    Reads the equations from a file, one per line. Anything after a ; sign is ignored,
+    so files in the test_data.txt format can be used directly.
+    """
+    with open(path, 'r') as equations_file:
+        return [line.split(';')[0].strip() for line in equations_file if line.split(';')[0].strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balances all the chemical equations from a file, "
+                                                 "using all the CPU cores.")
+    parser.add_argument("file", help="file with one equation per line, or a compiled corpus")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="number of equations sent to a worker at once")
+    parser.add_argument("--network", action="store_true",
+                        help="balance the file as one reaction network (e.g. a mechanism file) in this process, "
+                             "reporting skeletal and underdetermined reactions")
+    parser.add_argument("--compile", metavar="OUTPUT",
+                        help="compile the file into a binary corpus, balanced later with no parsing, "
+                             "instead of balancing it")
+    arguments = parser.parse_args()
+    if arguments.compile:
+        print("Compiled", CompiledCorpus.compile(read_equations(arguments.file), arguments.compile), "equations")
+        return
+    if arguments.network:
+        network_result = Balancer(logging=False).balance_network(read_equations(arguments.file))
+        print_results(network_result.results)
+        print("Species:", len(network_result.species), " Elements:", len(network_result.elements))
+        print("Balanced:", len(network_result.balanced), " Skeletal:", network_result.skeletal,
+              " Underdetermined:", network_result.underdetermined, " Invalid:", network_result.invalid)
+        return
+    with ParallelBalancer(workers=arguments.workers, chunk_size=arguments.chunk_size) as balancer:
+        if CompiledCorpus.is_compiled(arguments.file):
+            print_results(balancer.balance_compiled(arguments.file))
+        else:
+            print_results(balancer.balance_many(read_equations(arguments.file)))
+
+
+def print_results(results):
+    for result in results:
+        if result.is_balanced:
+            print(result.balanced_equation)
+        else:
+            print("[" + result.status.upper() + "]", result.equation, "-", result.error)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,40 @@
+import logging
+import sys
+
+LOGGER_NAME = "chembal"
+
+
 class Logger:
     """
-    A class for logging info and error messages.
-    Prints messages only if active=True.
+    A class for logging info and error messages through the standard logging module.
+    Logs messages only if active=True and the underlying logger is enabled for their level.
+    Messages and their arguments are formatted only then, so disabled logging costs next to nothing.
     """
 
-    def __init__(self, active=True):
+    def __init__(self, active=True, name=LOGGER_NAME):
         self.active = active
+        self.logger = logging.getLogger(name)
 
     def error(self, header, exception):
-        if self.active:
-            print("[ERROR] ", header, str(exception))
+        if self.active and self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error("%s %s", header, exception)
 
     def info(self, message, args=None):
-        if self.active:
-            print("[INFO] ", message)
-            if args is not None:
-                print(args)
+        if self.active and self.logger.isEnabledFor(logging.INFO):
+            if args is None:
+                self.logger.info("%s", message)
+            else:
+                self.logger.info("%s\n%s", message, args)
+
+    @staticmethod
+    def configure_console(level=logging.INFO):
+        """
+        Makes the messages of the given level and above appear on the standard output,
+        the way the command-line clients show them.
+        """
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("[%(levelname)s]  %(message)s"))
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.handlers = [handler]
+        logger.setLevel(level)
+        logger.propagate = False
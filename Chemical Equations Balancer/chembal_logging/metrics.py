@@ -0,0 +1,238 @@
+import threading
+import time
+
+PROMETHEUS_PREFIX = "chembal_"
+
+
+class StageTimer:
+    """
+    A context manager measuring the wall time of a single stage execution.
+    """
+
+    __slots__ = ("registry", "stage", "start")
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.registry.record_stage(self.stage, time.perf_counter() - self.start)
+
+
+class NullContext:
+    """
+    A context manager doing nothing - what all the NullMetrics measurements return.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+NULL_CONTEXT = NullContext()
+
+
+class NullMetrics:
+    """
+    Metrics that are switched off - every method does nothing, so the instrumented code
+    pays a single no-op call per measurement.
+    """
+
+    enabled = False
+
+    def stage(self, stage):
+        return NULL_CONTEXT
+
+    def profile(self):
+        return NULL_CONTEXT
+
+    def increment(self, counter, value=1):
+        pass
+
+    def observe(self, summary, value):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+class MetricsRegistry:
+    """
+    An in-process registry of balancing metrics: per-stage wall times and call counts, counters,
+    summaries of observed values (such as matrix sizes) and statistics pulled from registered
+    sources (such as the caches) whenever a snapshot is taken.
+    Optionally captures cProfile and tracemalloc data for every profile_every-th profiled call.
+    """
+
+    enabled = True
+
+    def __init__(self, profile_every=0, kept_profiles=10):
+        """
+        :param profile_every: profile every n-th call wrapped in profile(), 0 disables profiling
+        :param kept_profiles: the number of most recent profiles kept
+        """
+        self.profile_every = profile_every
+        self.kept_profiles = kept_profiles
+        self.__stages = {}
+        self.__counters = {}
+        self.__summaries = {}
+        self.__sources = {}
+        self.__profiles = []
+        self.__profiled_calls = 0
+        self.__lock = threading.Lock()
+
+    def stage(self, stage):
+        """
+        :param stage: the stage name
+        :return: context manager measuring the wall time of the stage
+        """
+        return StageTimer(self, stage)
+
+    def record_stage(self, stage, seconds):
+        with self.__lock:
+            measurements = self.__stages.get(stage)
+            if measurements is None:
+                self.__stages[stage] = [1, seconds, seconds]
+            else:
+                measurements[0] += 1
+                measurements[1] += seconds
+                if seconds > measurements[2]:
+                    measurements[2] = seconds
+
+    def increment(self, counter, value=1):
+        with self.__lock:
+            self.__counters[counter] = self.__counters.get(counter, 0) + value
+
+    def observe(self, summary, value):
+        """
+        Records a value of a summary, e.g. a matrix size. Keeps its count, sum and maximum.
+        """
+        with self.__lock:
+            measurements = self.__summaries.get(summary)
+            if measurements is None:
+                self.__summaries[summary] = [1, value, value]
+            else:
+                measurements[0] += 1
+                measurements[1] += value
+                if value > measurements[2]:
+                    measurements[2] = value
+
+    def register_source(self, name, statistics):
+        """
+        :param name: the source name, e.g. molecule_cache
+        :param statistics: function returning a dictionary of numeric statistics, called on every snapshot
+        """
+        self.__sources[name] = statistics
+
+    def profile(self):
+        """
+        :return: context manager capturing cProfile and tracemalloc data if this call is sampled
+        """
+        if self.profile_every <= 0:
+            return NULL_CONTEXT
+        with self.__lock:
+            self.__profiled_calls += 1
+            sampled = self.__profiled_calls % self.profile_every == 0
+        return ProfileCapture(self) if sampled else NULL_CONTEXT
+
+    def add_profile(self, profile):
+        with self.__lock:
+            self.__profiles.append(profile)
+            del self.__profiles[:-self.kept_profiles]
+
+    def snapshot(self):
+        """
+        :return: all the metrics as a dictionary
+        """
+        with self.__lock:
+            snapshot = {
+                "stages": {stage: {"calls": m[0], "seconds": m[1], "max_seconds": m[2]}
+                           for stage, m in self.__stages.items()},
+                "counters": dict(self.__counters),
+                "summaries": {summary: {"count": m[0], "sum": m[1], "max": m[2]}
+                              for summary, m in self.__summaries.items()},
+                "profiles": list(self.__profiles),
+            }
+            sources = dict(self.__sources)
+        snapshot["sources"] = {}
+        for name, statistics in sources.items():
+            values = dict(statistics())
+            if "hits" in values and "misses" in values:
+                lookups = values["hits"] + values["misses"]
+                values["hit_rate"] = values["hits"] / lookups if lookups else 0.0
+            snapshot["sources"][name] = values
+        return snapshot
+
+    def to_prometheus(self):
+        """
+        :return: the metrics in the Prometheus text exposition format
+        """
+        snapshot = self.snapshot()
+        lines = []
+        if snapshot["stages"]:
+            lines.append("# TYPE " + PROMETHEUS_PREFIX + "stage_seconds summary")
+            for stage, measurements in sorted(snapshot["stages"].items()):
+                labels = '{stage="' + stage + '"}'
+                lines.append(PROMETHEUS_PREFIX + "stage_seconds_count" + labels + " " + str(measurements["calls"]))
+                lines.append(PROMETHEUS_PREFIX + "stage_seconds_sum" + labels + " " + repr(measurements["seconds"]))
+        for counter, value in sorted(snapshot["counters"].items()):
+            lines.append("# TYPE " + PROMETHEUS_PREFIX + counter + "_total counter")
+            lines.append(PROMETHEUS_PREFIX + counter + "_total " + str(value))
+        for summary, measurements in sorted(snapshot["summaries"].items()):
+            lines.append("# TYPE " + PROMETHEUS_PREFIX + summary + " summary")
+            lines.append(PROMETHEUS_PREFIX + summary + "_count " + str(measurements["count"]))
+            lines.append(PROMETHEUS_PREFIX + summary + "_sum " + str(measurements["sum"]))
+        for source, values in sorted(snapshot["sources"].items()):
+            for statistic, value in sorted(values.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append("# TYPE " + PROMETHEUS_PREFIX + source + "_" + statistic + " gauge")
+                    lines.append(PROMETHEUS_PREFIX + source + "_" + statistic + " " + str(value))
+        return "\n".join(lines) + "\n"
+
+
+class ProfileCapture:
+    """
+    A context manager capturing cProfile statistics and the tracemalloc peak of a single sampled call.
+    The profiling modules are imported by the first capture only.
+    """
+
+    def __init__(self, registry, top_functions=15):
+        self.registry = registry
+        self.top_functions = top_functions
+        import cProfile
+        self.profiler = cProfile.Profile()
+        self.start = 0.0
+        self.started_tracemalloc = False
+
+    def __enter__(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self.start = time.perf_counter()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.disable()
+        seconds = time.perf_counter() - self.start
+        import tracemalloc
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+        import io
+        import pstats
+        output = io.StringIO()
+        pstats.Stats(self.profiler, stream=output).sort_stats("cumulative").print_stats(self.top_functions)
+        self.registry.add_profile({"seconds": seconds, "peak_memory_bytes": peak_memory,
+                                   "statistics": output.getvalue()})
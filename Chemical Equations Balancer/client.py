@@ -1,17 +1,60 @@
 from balancing.balancer import Balancer
+from chembal_logging.logger import Logger
+
+
+EDIT_COMMANDS = ("add reactant ", "add product ", "remove reactant ", "remove product ")
+
+
+def edit_session(session, command):
+    """
+    Applies an edit command, e.g. add product H2O, to the balancing session.
+
+    :param session: the BalancingSession
+    :param command: the edit command
+    :return: the BalancingResult of the edited equation
+    """
+    action, side, molecule = command.split(" ", 2)
+    getattr(session, action + "_" + side)(molecule)
+    return session.balance()
+
+
+def print_result(result):
+    if result:
+        print("\n" + result.balanced_equation + "\n")
+    else:
+        print("\nSorry, this one cannot be balanced: " + result.error + "\n")
 
 
 def main():
+    Logger.configure_console()
     balancer = Balancer(logging=True)
     print("Hello! Enter a chemical equation in below format and I'll try to balance it for you!")
     print("H2 + O2 -> H2O")
+    print("\nThen you can edit it with: add reactant/product <molecule> or remove reactant/product <molecule>")
     print("\nIf you wish to end the program, just type: exit")
+    equation = None
+    session = None
     while True:
-        equation = input("Type the equation here: ")
-        if equation == "exit":
+        line = input("Type the equation here: ")
+        if line == "exit":
             print("Thank you! See you soon!")
             break
-        balancer.balance_equation(equation)
+        if not line.startswith(EDIT_COMMANDS):
+            equation = line
+            session = None
+            print_result(balancer.balance_equation(equation))
+            continue
+        try:
+            if session is None:
+                if equation is None:
+                    raise ValueError("There is no equation to edit yet")
+                session = balancer.create_session(equation)
+            result = edit_session(session, line)
+        except (SyntaxError, ValueError) as ex:
+            print("\nSorry, this edit cannot be made: " + str(ex) + "\n")
+            continue
+        print("\n" + session.equation)
+        print_result(result)
 
 
 main()
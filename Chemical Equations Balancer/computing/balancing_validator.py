@@ -1,5 +1,9 @@
 from chembal_logging.logger import Logger
-from parsing.molecule_parser import MoleculeParser
+from computing.sparse_matrix import SparseMatrix
+from parsing.molecule_cache import MoleculeCache
+
+# products of at most this magnitude are summed up exactly in int64
+MAX_EXACT_PRODUCT = 2 ** 62
 
 
 class BalancingValidator:
@@ -7,9 +11,14 @@ class BalancingValidator:
     A class for validating balancing correctness.
     """
 
-    def __init__(self, logging=True):
+    def __init__(self, logging=True, molecule_parser=None):
+        """
+        :param logging: whether to log the progress or not
+        :param molecule_parser: the parser for extracting atoms out of molecules,
+        the process-wide molecule cache by default
+        """
         self.logger = Logger(active=logging)
-        self.molecule_parser = MoleculeParser()
+        self.molecule_parser = molecule_parser if molecule_parser is not None else MoleculeCache.shared()
 
     def validate_balancing(self, left_side_molecules, right_side_molecules, equation_coefficients):
         """
@@ -20,12 +29,112 @@ class BalancingValidator:
         :param equation_coefficients: the calculated coefficients
         :return: true if numbers of atoms match, false otherwise
         """
+        return self.__validate_atoms(
+            [self.molecule_parser.parse_molecule_into_atoms(m) for m in left_side_molecules],
+            [self.molecule_parser.parse_molecule_into_atoms(m) for m in right_side_molecules],
+            equation_coefficients)
+
+    def validate_parsed_balancing(self, parsed_equation, equation_coefficients):
+        """
+        Calculates number of atoms in both sides of an already parsed equation and compares it.
+
+        :param parsed_equation: the parsed equation
+        :param equation_coefficients: the calculated coefficients
+        :return: true if numbers of atoms match, false otherwise
+        """
+        return self.__validate_atoms(parsed_equation.left_side_atoms, parsed_equation.right_side_atoms,
+                                     equation_coefficients)
+
+    def validate_matrix_balancing(self, equation_matrix, equation_coefficients):
+        """
+        Checks that the equation matrix times the signed coefficients is the zero vector - every element
+        is used up in the left side as many times as it is produced in the right side.
+        The matrix must have a row for every element of the equation, as the indexed and sparse ones do.
+
+        :param equation_matrix: the equation matrix - a list of rows, an array or a SparseMatrix
+        :param equation_coefficients: the calculated coefficients
+        :return: true if numbers of atoms match, false otherwise
+        """
+        self.logger.info("Validating balancing correctness...")
+        if isinstance(equation_matrix, list):
+            balanced = not any(sum(count * int(x) for count, x in zip(row, equation_coefficients))
+                               for row in equation_matrix)
+        elif isinstance(equation_matrix, SparseMatrix):
+            balanced = not equation_matrix.dot(self.__to_exact_array(equation_matrix, equation_coefficients)).any()
+        else:
+            coefficients = self.__to_exact_array(equation_matrix, equation_coefficients)
+            balanced = not (equation_matrix.astype(coefficients.dtype) @ coefficients).any()
+        if not balanced:
+            self.logger.info("Wooops, something went wrong :(")
+            return False
+        self.logger.info("The equation is balanced correctly :)")
+        return True
+
+    def validate_many_matrix_balancing(self, equation_matrices, equations_coefficients):
+        """
+        Validates many equations at once - array matrices of equal shape are stacked, and a single einsum
+        call validates the whole stack. Lists of rows, like the ones of small equations, are validated one by one
+        in plain Python, which is faster for them than building the stacks.
+
+        :param equation_matrices: the equation matrices
+        :param equations_coefficients: the calculated coefficients of every equation
+        :return: list of booleans, true where numbers of atoms match
+        """
+        import numpy as np
+        results = [None] * len(equation_matrices)
+        groups = {}
+        for i, matrix in enumerate(equation_matrices):
+            if isinstance(matrix, (list, SparseMatrix)):
+                results[i] = self.validate_matrix_balancing(matrix, equations_coefficients[i])
+            else:
+                groups.setdefault(np.shape(matrix), []).append(i)
+        for indices in groups.values():
+            stack = np.stack([equation_matrices[i] for i in indices]).astype(np.int64)
+            try:
+                coefficients = np.array([equations_coefficients[i] for i in indices], dtype=np.int64)
+            except OverflowError:
+                coefficients = None
+            if coefficients is None or not self.__is_exact(stack, coefficients):
+                for i in indices:
+                    results[i] = self.validate_matrix_balancing(equation_matrices[i], equations_coefficients[i])
+                continue
+            balanced = ~np.einsum('kmn,kn->km', stack, coefficients).any(axis=1)
+            for i, is_balanced in zip(indices, balanced.tolist()):
+                results[i] = is_balanced
+        return results
+
+    @staticmethod
+    def __is_exact(matrix_data, coefficients):
+        """
+        :return: true if the products of the matrix and the coefficients cannot overflow int64
+        """
+        import numpy as np
+        return int(np.abs(matrix_data).max(initial=0)) * int(np.abs(coefficients).max(initial=0)) * \
+            max(coefficients.shape[-1], 1) < MAX_EXACT_PRODUCT
+
+    @staticmethod
+    def __to_exact_array(equation_matrix, equation_coefficients):
+        """
+        :return: the coefficients as an int64 array, or an array of Python integers
+        if the products could overflow int64
+        """
+        import numpy as np
+        try:
+            coefficients = np.array(equation_coefficients, dtype=np.int64)
+        except OverflowError:
+            coefficients = None
+        data = equation_matrix.data if isinstance(equation_matrix, SparseMatrix) else equation_matrix
+        if coefficients is not None and BalancingValidator.__is_exact(data, coefficients):
+            return coefficients
+        return np.array([int(x) for x in equation_coefficients], dtype=object)
+
+    def __validate_atoms(self, left_side_molecules_atoms, right_side_molecules_atoms, equation_coefficients):
         self.logger.info("Validating balancing correctness...")
-        left_side_atoms = self.calculate_side_molecules(left_side_molecules,
-                                                        [-int(x) for x in equation_coefficients if x < 0])
+        left_side_atoms = self.calculate_side_atoms(left_side_molecules_atoms,
+                                                    [-int(x) for x in equation_coefficients if x < 0])
         self.logger.info("Left side atoms: ", args=left_side_atoms)
-        right_side_atoms = self.calculate_side_molecules(right_side_molecules,
-                                                         [int(x) for x in equation_coefficients if x > 0])
+        right_side_atoms = self.calculate_side_atoms(right_side_molecules_atoms,
+                                                     [int(x) for x in equation_coefficients if x > 0])
         self.logger.info("Right side atoms: ", args=right_side_atoms)
         if left_side_atoms == right_side_atoms:
             self.logger.info("The equation is balanced correctly :)")
@@ -34,9 +143,14 @@ class BalancingValidator:
         return False
 
     def calculate_side_molecules(self, side_molecules, coefficients):
+        return self.calculate_side_atoms(
+            [self.molecule_parser.parse_molecule_into_atoms(m) for m in side_molecules], coefficients)
+
+    @staticmethod
+    def calculate_side_atoms(side_molecules_atoms, coefficients):
         side_atoms = {}
-        for i in range(len(side_molecules)):
-            molecule_atoms = self.molecule_parser.parse_molecule_into_atoms(side_molecules[i])
+        for i in range(len(side_molecules_atoms)):
+            molecule_atoms = side_molecules_atoms[i]
             for atom in molecule_atoms:
                 if atom in side_atoms:
                     side_atoms[atom] += abs(coefficients[i]) * molecule_atoms[atom]
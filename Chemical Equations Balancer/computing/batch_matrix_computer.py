@@ -0,0 +1,151 @@
+import numpy as np
+
+from computing.nullspace_computer import NullspaceComputer
+from computing.small_matrix_computer import SmallMatrixComputer
+from computing.sparse_matrix import SparseMatrix
+
+MAX_DENOMINATOR = 64
+MAX_GROUP_ELEMENTS = 2 ** 22
+# groups of small matrices with fewer members than this are solved by the small matrix kernel - the batched SVD
+# only amortizes its NumPy call overhead over bigger groups
+MIN_STACK_SIZE = 16
+# stacks of n x (n + 1) matrices up to this many columns get their nullspace vectors as maximal minors, out of n + 1
+# batched determinants - cheaper than the SVD for small n, which costs O(n^3) and O(n^4) respectively
+MAX_MINORS_COLUMNS = 12
+# minors up to this big are exactly represented and rounded - the bigger ones are left to the exact solver
+MAX_MINOR = 2 ** 31
+
+
+class BatchMatrixComputer:
+    """
+    A class for computing the coefficients of many equations at once.
+    Equation matrices of the same shape are stacked into a single 3-D array, so rank and nullspace
+    of the whole group come out of one batched SVD - or, for the most common n x (n + 1) matrices, out of
+    n + 1 batched determinants. The floating point nullspace vectors are then
+    turned into integers and verified exactly - whatever cannot be verified goes through the exact
+    NullspaceComputer, so the results are always the same as in the one-by-one case.
+    Small matrices in small groups skip the batched path - the pure integer SmallMatrixComputer kernel
+    solves them faster.
+    """
+
+    def __init__(self):
+        self.nullspace_computer = NullspaceComputer()
+        self.small = 0
+        self.verified = 0
+        self.fallbacks = 0
+
+    def compute_many_coefficients(self, matrices):
+        """
+        Computes the coefficients of many equations.
+
+        :param matrices: the equation matrices, as arrays or lists of rows - SparseMatrix ones go straight
+        to the exact sparse elimination
+        :return: list holding, for each matrix, either its coefficients or the ValueError raised for it
+        """
+        results = [None] * len(matrices)
+        groups = {}
+        for i, matrix in enumerate(matrices):
+            if not isinstance(matrix, SparseMatrix):
+                groups.setdefault((len(matrix), len(matrix[0])), []).append(i)
+        small = 0
+        for shape, indices in groups.items():
+            if len(indices) < MIN_STACK_SIZE and SmallMatrixComputer.is_small(matrices[indices[0]]):
+                small += len(indices)
+                for i in indices:
+                    results[i] = self.__compute_exact_coefficients(matrices[i])
+                continue
+            group_size = max(1, MAX_GROUP_ELEMENTS // (shape[0] * shape[1] * MAX_DENOMINATOR))
+            for start in range(0, len(indices), group_size):
+                chunk = indices[start:start + group_size]
+                stack = np.array([matrices[i] for i in chunk], dtype=np.float64)
+                for i, coefficients in zip(chunk, self.__compute_stack_coefficients(stack)):
+                    results[i] = coefficients
+        fallbacks = 0
+        for i, coefficients in enumerate(results):
+            if coefficients is None:
+                fallbacks += 1
+                results[i] = self.__compute_exact_coefficients(matrices[i])
+        self.small += small
+        self.verified += len(results) - small - fallbacks
+        self.fallbacks += fallbacks
+        return results
+
+    def statistics(self):
+        """
+        :return: the dictionary of counters - equations solved by the small matrix kernel, verified
+        on the batched path and ones that fell back to the exact solver
+        """
+        return {"small": self.small, "verified": self.verified, "fallbacks": self.fallbacks}
+
+    def __compute_exact_coefficients(self, matrix):
+        """
+        :return: the coefficients of the matrix, or the ValueError raised for it
+        """
+        try:
+            if not isinstance(matrix, SparseMatrix) and SmallMatrixComputer.is_small(matrix):
+                return SmallMatrixComputer.compute_coefficients(matrix)
+            return self.nullspace_computer.compute_coefficients(matrix)
+        except ValueError as ex:
+            return ex
+
+    @staticmethod
+    def __compute_stack_coefficients(stack):
+        """
+        Computes the coefficients of a stack of equal-shaped matrices.
+
+        :param stack: the 3-D array of matrices
+        :return: list of integer coefficients, or None where the fast path could not verify the result
+        """
+        count, rows, columns = stack.shape
+        if rows == columns - 1 and columns <= MAX_MINORS_COLUMNS:
+            candidates, found = BatchMatrixComputer.__compute_minors(stack)
+        else:
+            candidates, found = BatchMatrixComputer.__compute_singular_vectors(stack)
+        candidates //= np.maximum(np.gcd.reduce(candidates, axis=1), 1)[:, None]
+        candidates *= np.where(candidates[:, -1] < 0, -1, 1)[:, None]
+        found &= (candidates != 0).all(axis=1)
+        found &= ~np.einsum('kmn,kn->km', np.round(stack).astype(np.int64), candidates).any(axis=1)
+        return [candidates[i].tolist() if found[i] else None for i in range(count)]
+
+    @staticmethod
+    def __compute_minors(stack):
+        """
+        Computes the integer nullspace vectors of a stack of n x (n + 1) matrices as their signed maximal minors -
+        the j-th entry is (-1)^j times the determinant of the matrix without the column j. By the Laplace expansion
+        the matrix times such a vector is zero, and the vector is not zero exactly when the matrix has rank n.
+
+        :param stack: the 3-D array of n x (n + 1) matrices
+        :return: the 2-D array of the candidate vectors and the mask of the matrices they were found for
+        """
+        count, _, columns = stack.shape
+        minors = np.empty((count, columns))
+        for j in range(columns):
+            minors[:, j] = np.linalg.det(np.delete(stack, j, axis=2)) * (-1) ** j
+        rounded = np.round(minors)
+        found = ((np.abs(minors - rounded) < 1e-6 * np.maximum(np.abs(minors), 1)) &
+                 (np.abs(rounded) < MAX_MINOR)).all(axis=1)
+        return np.where(found[:, None], rounded, 0).astype(np.int64), found
+
+    @staticmethod
+    def __compute_singular_vectors(stack):
+        """
+        Computes the integer nullspace vectors of a stack of matrices out of their last right singular vectors,
+        scaled by the smallest multiplier making them integer.
+
+        :param stack: the 3-D array of matrices
+        :return: the 2-D array of the candidate vectors and the mask of the matrices they were found for
+        """
+        count, rows, columns = stack.shape
+        _, singular_values, vh = np.linalg.svd(stack)
+        tolerance = singular_values.max(axis=1, initial=0) * max(rows, columns) * np.finfo(np.float64).eps
+        ranks = (singular_values > tolerance[:, None]).sum(axis=1)
+        null_vectors = vh[:, -1, :]
+        magnitudes = np.abs(null_vectors)
+        smallest = np.where(magnitudes > 1e-9, magnitudes, np.inf).min(axis=1)
+        normalized = null_vectors / smallest[:, None]
+        multipliers = np.arange(1, MAX_DENOMINATOR + 1, dtype=np.float64)
+        scaled = normalized[:, None, :] * multipliers[None, :, None]
+        is_integer = (np.abs(scaled - np.round(scaled)) < 1e-6).all(axis=2)
+        found = is_integer.any(axis=1) & (ranks == columns - 1) & np.isfinite(smallest)
+        first_multiplier = is_integer.argmax(axis=1)
+        return np.round(scaled[np.arange(count), first_multiplier]).astype(np.int64), found
@@ -0,0 +1,49 @@
+from parsing.molecule_parser import CHARGE
+
+
+class EquationScreener:
+    """
+    A class for rejecting equations which cannot be balanced before any matrix is built.
+    Looks at the molecules of the parsed equation and their atoms counts only, checking a few necessary
+    conditions of a unique balancing - every one of them costs a single pass over the molecules:
+    - both sides have molecules,
+    - every element is found on both sides - counts of elements are positive, so an element of one side
+      could never be balanced by the other one (the charge can, as it may be negative),
+    - the rank of the equation matrix, bounded by its number of rows (elements), leaves at most one
+      independent way of balancing,
+    - no molecule is repeated - with more than two molecules, the two copies balance each other, which leaves
+      the equation either skeletal or underdetermined.
+    Passing the screening does not mean the equation can be balanced - only the matrix computations can tell.
+    """
+
+    @staticmethod
+    def screen(parsed_equation):
+        """
+        Checks the necessary conditions of the parsed equation being balanceable.
+
+        :param parsed_equation: the parsed equation
+        :raises: ValueError with the reason upon the equation not meeting one of them
+        """
+        left_side_atoms = parsed_equation.left_side_atoms
+        right_side_atoms = parsed_equation.right_side_atoms
+        if not left_side_atoms or not right_side_atoms:
+            raise ValueError("Both sides of the equation need at least one molecule")
+        left_side_elements = set().union(*left_side_atoms)
+        right_side_elements = set().union(*right_side_atoms)
+        if left_side_elements != right_side_elements:
+            for element in sorted(left_side_elements ^ right_side_elements):
+                if element != CHARGE:
+                    side = "left" if element in left_side_elements else "right"
+                    raise ValueError("Skeletal equation - element " + element + " is found on the " + side +
+                                     " side only!")
+        molecules_count = len(left_side_atoms) + len(right_side_atoms)
+        minimal_nullity = molecules_count - len(left_side_elements | right_side_elements)
+        if minimal_nullity > 1:
+            raise ValueError("Underdetermined equation - it can be balanced in at least " + str(minimal_nullity) +
+                             " independent ways!")
+        if molecules_count > 2:
+            molecules = parsed_equation.molecules
+            if len(set(molecules)) < molecules_count:
+                repeated_molecule = next(m for i, m in enumerate(molecules) if m in molecules[:i])
+                raise ValueError("Molecule " + repeated_molecule + " is repeated - the equation cannot be balanced"
+                                 " uniquely!")
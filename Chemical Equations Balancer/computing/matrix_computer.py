@@ -1,24 +1,58 @@
-import unittest
-import numpy as np
-from numpy.linalg import LinAlgError
+from computing.nullspace_computer import NullspaceComputer
+from computing.small_matrix_computer import SmallMatrixComputer
+from computing.sparse_matrix import SparseMatrix
 
-from computing.matrix_creator import MatrixCreator
+# Bump whenever a change in the solvers or the screening may change any computed coefficients or error messages -
+# persisted results get invalidated.
+SOLVER_VERSION = 2
 
 
 class MatrixComputer:
     """
     A class for performing all the matrix related computations.
     See https://arxiv.org/ftp/arxiv/papers/1110/1110.4321.pdf for more details.
+    NumPy is imported by the floating point mode only.
     """
 
+    def __init__(self, exact=True):
+        """
+        :param exact: whether to compute the coefficients with exact integer arithmetic
+        or with the floating point matrix inversion
+        """
+        self.exact = exact
+        self.nullspace_computer = NullspaceComputer()
+
     def compute_coefficients(self, matrix):
         """
         Computes the coefficients of a balanced chemical equation.
 
-        :param matrix: the equation matrix
+        Small dense matrices go to the SmallMatrixComputer kernel, the other ones to the NullspaceComputer.
+
+        :param matrix: the equation matrix, dense or SparseMatrix
         :return: the coefficients
-        :raises: ValueError upon the equation being skeletal
+        :raises: ValueError upon the equation being skeletal (or underdetermined, in exact mode)
+        """
+        if self.exact:
+            if not isinstance(matrix, SparseMatrix) and SmallMatrixComputer.is_small(matrix):
+                return SmallMatrixComputer.compute_coefficients(matrix)
+            return self.nullspace_computer.compute_coefficients(matrix)
+        import numpy as np
+        if isinstance(matrix, SparseMatrix):
+            matrix = matrix.toarray()
+        return self.__compute_float_coefficients(np.asarray(matrix, dtype=np.float64))
+
+    def compute_nullity(self, matrix):
         """
+        Computes the dimension of the equation matrix nullspace - the number of independent ways
+        the equation can be balanced in. 0 means skeletal equation, more than 1 means underdetermined one.
+
+        :param matrix: the equation matrix, dense or SparseMatrix
+        :return: the nullspace dimension
+        """
+        return self.nullspace_computer.compute_nullity(matrix)
+
+    def __compute_float_coefficients(self, matrix):
+        import numpy as np
         if len(matrix) > len(matrix[0]):
             matrix = np.delete(matrix, len(matrix) - 1, 0)
         if self.is_matrix_square(matrix):
@@ -27,7 +61,7 @@ class MatrixComputer:
             matrix = self.__handle_standard_case(matrix)
         try:
             matrix_inverse = np.linalg.inv(matrix)
-        except LinAlgError:
+        except np.linalg.LinAlgError:
             raise ValueError("Skeletal equation - cannot be balanced!")
         coefficients = matrix_inverse[:, len(matrix) - 1]
         return self.scale_the_coefficients(coefficients)
@@ -40,6 +74,7 @@ class MatrixComputer:
         :param matrix: the equation matrix
         :return: the modified matrix
         """
+        import numpy as np
         row_echelon_matrix = self.gaussian_elimination(matrix)
         total_molecules = len(matrix[0])
         nullity_vector = [0] * total_molecules
@@ -62,6 +97,7 @@ class MatrixComputer:
         :param matrix: the equation matrix
         :return: the modified matrix
         """
+        import numpy as np
         total_molecules = len(matrix[0])
         nullity_vector = [0] * total_molecules
         nullity_vector[total_molecules - 1] = 1
@@ -125,56 +161,3 @@ class MatrixComputer:
                 for m in range(k, n):
                     matrix_copy[j][m] -= q * matrix_copy[k][m]
         return matrix_copy
-
-
-class MatrixComputerTest(unittest.TestCase):
-    """
-    A class for testing chemical equation coefficients computation.
-    """
-
-    matrix_computer = MatrixComputer()
-    matrix_creator = MatrixCreator()
-
-    def test_standard_cases(self):
-        """
-        Tests computations in standard cases - when the equation matrix
-        is not square to begin with.
-        """
-        matrix = self.matrix_creator.create_equation_matrix("H2 + O2 -> H2O")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-2, -1, 2]))
-        matrix = self.matrix_creator.create_equation_matrix("C7H16 + O2 -> CO2 + H2O")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-1, -11, 7, 8]))
-        matrix = self.matrix_creator.create_equation_matrix("KMnO4 + HCl -> MnCl2 + Cl2 + KCl + H2O")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-2, -16, 2, 5, 2, 8]))
-        matrix = self.matrix_creator.create_equation_matrix("KI + KClO3 + HCl -> I2 + H2O + KCl")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-6, -1, -6, 3, 3, 7]))
-        matrix = self.matrix_creator.create_equation_matrix("CO2 + H2O -> C6H12O6 + O2")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-6, -6, 1, 6]))
-
-    def test_square_matrix_cases(self):
-        """
-        Test computations in cases when the equation matrix
-        is square to begin with.
-        """
-        matrix = self.matrix_creator.create_equation_matrix("CaO + N2O5 -> Ca(NO3)2")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-1, -1, 1]))
-        matrix = self.matrix_creator.create_equation_matrix("PCl5 + H2O -> H3PO4 + HCl")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-1, -4, 1, 5]))
-        matrix = self.matrix_creator.create_equation_matrix("AgI + Na2S -> Ag2S + NaI")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-2, -1, 1, 2]))
-        matrix = self.matrix_creator.create_equation_matrix("Ba3N2 + H2O -> Ba(OH)2 + NH3")
-        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-1, -6, 3, 2]))
-
-    def test_skeletal_equation(self):
-        """
-        Tests computations in cases when the equation
-        is skeletal - cannot be balanced.
-        """
-        matrix = self.matrix_creator.create_equation_matrix("FeS2 + HNO3 -> Fe2(SO4)3 + NO + H2SO4")
-        self.assertRaises(ValueError, lambda: self.matrix_computer.compute_coefficients(matrix))
-        matrix = self.matrix_creator.create_equation_matrix("CO + CO2 + H2 -> CH4 + H2O ")
-        self.assertRaises(ValueError, lambda: self.matrix_computer.compute_coefficients(matrix))
-
-
-if __name__ == '__main__':
-    unittest.main()
@@ -1,9 +1,10 @@
-import unittest
-import numpy as np
 from collections import OrderedDict
+from itertools import chain
 
+from computing.sparse_matrix import SparseMatrix
 from parsing.equation_parser import EquationParser
-from parsing.molecule_parser import MoleculeParser
+from parsing.molecule_cache import MoleculeCache
+from parsing.species_index import SpeciesTable
 
 
 class MatrixCreator:
@@ -11,11 +12,21 @@ class MatrixCreator:
     A class for creating equation's matrix.
     The matrix is a N x M matrix, where N is the number of unique atoms in the whole equation
     and M is the number of reactants (molecules).
+    The matrix can be built as plain lists of rows, too - NumPy is imported only when an array is asked for.
     """
 
-    def __init__(self):
-        self.equation_parser = EquationParser()
-        self.molecule_parser = MoleculeParser()
+    def __init__(self, molecule_parser=None, species_table=None):
+        """
+        :param molecule_parser: the parser for extracting atoms out of molecules,
+        the process-wide molecule cache by default
+        :param species_table: the table of compiled species, the process-wide one by default
+        """
+        self.molecule_parser = molecule_parser if molecule_parser is not None else MoleculeCache.shared()
+        self.equation_parser = EquationParser(self.molecule_parser)
+        if species_table is None:
+            species_table = SpeciesTable.shared() if self.molecule_parser is MoleculeCache.shared() \
+                else SpeciesTable(self.molecule_parser)
+        self.species_table = species_table
 
     def create_equation_matrix(self, equation):
         """
@@ -28,12 +39,108 @@ class MatrixCreator:
         :param equation: the equation
         :return: the equation matrix
         """
-        equation_sides = self.equation_parser.parse_equation_into_two_sides(equation)
-        left_side_molecules = self.equation_parser.parse_side_to_molecules(equation_sides[0])
-        right_side_molecules = self.equation_parser.parse_side_to_molecules(equation_sides[1])
-        atoms_dictionary = self.create_atoms_dictionary(left_side_molecules, right_side_molecules)
+        return self.create_parsed_equation_matrix(self.equation_parser.parse_equation(equation))
+
+    def create_parsed_equation_matrix(self, parsed_equation):
+        """
+        Creates the matrix for an already parsed equation - no molecule is parsed again.
+
+        :param parsed_equation: the parsed equation
+        :return: the equation matrix
+        """
+        import numpy as np
+        atoms_dictionary = self.__create_atoms_dictionary(parsed_equation.left_side_atoms,
+                                                          parsed_equation.right_side_atoms)
         return np.array(list(atoms_dictionary.values()))
 
+    def create_indexed_equation_matrix(self, parsed_equation):
+        """
+        Creates the matrix of an already parsed equation out of the compiled species of its molecules,
+        see create_species_matrix.
+
+        :param parsed_equation: the parsed equation
+        :return: the equation matrix
+        """
+        return self.create_species_matrix([self.species_table.get(m) for m in parsed_equation.molecules])
+
+    def create_indexed_equation_rows(self, parsed_equation):
+        """
+        Creates the matrix of an already parsed equation out of the compiled species of its molecules,
+        as a list of rows of integers, see create_species_rows.
+
+        :param parsed_equation: the parsed equation
+        :return: the equation matrix rows
+        """
+        return self.create_species_rows([self.species_table.get(m) for m in parsed_equation.molecules])
+
+    @staticmethod
+    def create_species_rows(species):
+        """
+        Creates the integer matrix of compiled species as a list of rows, without NumPy - cheaper than an array
+        for a single small equation. Rows are ordered like the ones of create_species_matrix.
+
+        :param species: the compiled species, the columns of the matrix
+        :return: the equation matrix rows
+        """
+        element_rows = {}
+        rows = []
+        for column, s in enumerate(species):
+            for element_id, count in zip(s.element_ids, s.counts):
+                row = element_rows.get(element_id)
+                if row is None:
+                    row = element_rows[element_id] = [0] * len(species)
+                    rows.append(row)
+                row[column] = count
+        return rows
+
+    def create_species_matrix(self, species):
+        """
+        Creates the integer matrix of compiled species with a single fancy-indexing assignment - no dictionary
+        of atoms is built. Rows are the elements in the order of their first occurrence, including the ones
+        present in the right side only.
+
+        :param species: the compiled species, the columns of the matrix
+        :return: the equation matrix
+        """
+        return self.create_species_composition(species)[1]
+
+    @staticmethod
+    def create_species_composition(species):
+        """
+        :param species: the compiled species, the columns of the matrix
+        :return: the element ids of the rows of the matrix and the matrix itself
+        """
+        import numpy as np
+        element_rows = {}
+        rows = [element_rows.setdefault(element_id, len(element_rows))
+                for s in species for element_id in s.element_ids]
+        columns = [column for column, s in enumerate(species) for _ in s.element_ids]
+        matrix = np.zeros((len(element_rows), len(species)), dtype=np.int64)
+        matrix[rows, columns] = list(chain.from_iterable(s.counts for s in species))
+        return list(element_rows), matrix
+
+    def create_sparse_equation_matrix(self, parsed_equation):
+        """
+        Creates the equation matrix of an already parsed equation in the sparse (CSR) format, filled straight
+        from the atoms counts - no zero is ever stored, so big reaction networks take memory proportional
+        to the number of (atom, molecule) pairs rather than atoms x molecules.
+        Unlike the dense matrix, it has rows for the atoms present in the right side only, too.
+
+        :param parsed_equation: the parsed equation
+        :return: the sparse equation matrix
+        """
+        atoms_indices = {}
+        rows = []
+        columns = []
+        values = []
+        for column, atoms_in_the_molecule in enumerate(parsed_equation.atoms):
+            for atom, count in atoms_in_the_molecule.items():
+                rows.append(atoms_indices.setdefault(atom, len(atoms_indices)))
+                columns.append(column)
+                values.append(count)
+        return SparseMatrix.from_coordinates(rows, columns, values,
+                                             (len(atoms_indices), len(parsed_equation.atoms)))
+
     def create_atoms_dictionary(self, left_side_molecules, right_side_molecules):
         """
         Creates a dictionary of atoms, where key is an unique atom and the value is a list of
@@ -43,53 +150,28 @@ class MatrixCreator:
         :param right_side_molecules: molecules in right side of the equation
         :return: the dictionary
         """
+        return self.__create_atoms_dictionary(
+            [self.molecule_parser.parse_molecule_into_atoms(m) for m in left_side_molecules],
+            [self.molecule_parser.parse_molecule_into_atoms(m) for m in right_side_molecules])
+
+    def __create_atoms_dictionary(self, left_side_atoms, right_side_atoms):
         atoms_dictionary = OrderedDict()
-        self.__parse_unique_atoms(atoms_dictionary, left_side_molecules)
-        self.__add_side_molecules_atoms_to_dictionary(left_side_molecules, atoms_dictionary)
-        self.__add_side_molecules_atoms_to_dictionary(right_side_molecules, atoms_dictionary)
+        self.__parse_unique_atoms(atoms_dictionary, left_side_atoms)
+        self.__add_side_molecules_atoms_to_dictionary(left_side_atoms, atoms_dictionary)
+        self.__add_side_molecules_atoms_to_dictionary(right_side_atoms, atoms_dictionary)
         return atoms_dictionary
 
-    def __add_side_molecules_atoms_to_dictionary(self, side_molecules, atoms_dictionary):
-        for molecule in side_molecules:
-            atoms_in_the_molecule = self.molecule_parser.parse_molecule_into_atoms(molecule)
+    @staticmethod
+    def __add_side_molecules_atoms_to_dictionary(side_atoms, atoms_dictionary):
+        for atoms_in_the_molecule in side_atoms:
             for unique_atom in atoms_dictionary:
                 if unique_atom in atoms_in_the_molecule:
                     atoms_dictionary[unique_atom].append(atoms_in_the_molecule[unique_atom])
                 else:
                     atoms_dictionary[unique_atom].append(0.0)
 
-    def __parse_unique_atoms(self, atoms_dictionary, one_side_of_equation):
-        for molecule in one_side_of_equation:
-            atoms_in_the_molecule = self.molecule_parser.parse_molecule_into_atoms(molecule)
+    @staticmethod
+    def __parse_unique_atoms(atoms_dictionary, side_atoms):
+        for atoms_in_the_molecule in side_atoms:
             for atom in atoms_in_the_molecule:
                 atoms_dictionary[atom] = []
-
-
-class MatrixCreatorTest(unittest.TestCase):
-    """
-    A class for testing atoms dictionary and matrix creation for equations of
-    different difficulty level.
-    """
-
-    matrix_creator = MatrixCreator()
-
-    def test_atoms_dictionary_creation(self):
-        self.assertEqual(self.matrix_creator.create_atoms_dictionary(['H2', 'O2'], ['H2O']),
-                         {'H': [2, 0, 2], 'O': [0, 2, 1]})
-        self.assertEqual(self.matrix_creator.create_atoms_dictionary(['CaO', 'N2O5'], ['Ca(NO3)2']),
-                         {'O': [1, 5, 6], 'Ca': [1, 0, 1], 'N': [0, 2, 2]})
-
-    def test_simple_matrix_creation(self):
-        simple_equation_matrix = self.matrix_creator.create_equation_matrix("H2 + O2 -> H2O")
-        self.assertTrue((simple_equation_matrix[0] == [2, 0, 2]).all())
-        self.assertTrue((simple_equation_matrix[1] == [0, 2, 1]).all())
-
-    def test_complicated_matrix_creation(self):
-        complicated_equation_matrix = self.matrix_creator.create_equation_matrix("KMnO4 + HCl -> Mn(Cl)2 + Cl2 + KCl + H2O")
-        self.assertTrue(np.array_equal(complicated_equation_matrix[:, 0], [1, 1, 4, 0, 0]))
-        self.assertTrue(np.array_equiv(complicated_equation_matrix[:, len(complicated_equation_matrix[0]) - 1],
-                                       [0, 0, 1, 2, 0]))
-
-
-if __name__ == '__main__':
-    unittest.main()
@@ -0,0 +1,172 @@
+from fractions import Fraction
+from math import gcd
+
+from computing.sparse_matrix import SparseMatrix
+
+
+class NullspaceComputer:
+    """
+    A class for exact integer computations on the equation matrix.
+    Uses fraction-free Gauss-Jordan elimination, so no rounding ever takes place
+    and the coefficients come out as minimal integers directly.
+    Every method accepts both dense matrices and SparseMatrix objects - the latter are eliminated
+    on dictionaries of non-zero entries, so the work scales with the non-zeros (and the fill-in).
+    """
+
+    @staticmethod
+    def row_reduce(matrix):
+        """
+        Reduces the matrix to reduced row-echelon form using integer arithmetic only.
+        Every row is divided by the GCD of its entries to keep the numbers small.
+
+        :param matrix: the matrix, with integer (or integer valued) entries
+        :return: the non-zero rows of the reduced matrix and the list of their pivot columns
+        """
+        rows = [[int(round(x)) for x in row] for row in matrix]
+        columns = len(rows[0]) if rows else 0
+        pivot_columns = []
+        rank = 0
+        for column in range(columns):
+            pivot_row = next((i for i in range(rank, len(rows)) if rows[i][column] != 0), None)
+            if pivot_row is None:
+                continue
+            rows[rank], rows[pivot_row] = rows[pivot_row], rows[rank]
+            pivot = rows[rank]
+            for i in range(len(rows)):
+                factor = rows[i][column]
+                if i != rank and factor != 0:
+                    rows[i] = NullspaceComputer.__normalize(
+                        [pivot[column] * a - factor * b for a, b in zip(rows[i], pivot)])
+            pivot_columns.append(column)
+            rank += 1
+        return rows[:rank], pivot_columns
+
+    @staticmethod
+    def row_reduce_sparse(sparse_matrix):
+        """
+        Reduces the sparse matrix to reduced row-echelon form using integer arithmetic only.
+        The pivot of every column is taken from the shortest candidate row, which limits the fill-in.
+
+        :param sparse_matrix: the SparseMatrix
+        :return: the non-zero rows of the reduced matrix, as dictionaries keyed by column,
+        and the list of their pivot columns
+        """
+        rows = [row for row in sparse_matrix.rows() if row]
+        column_rows = [set() for _ in range(sparse_matrix.shape[1])]
+        for i, row in enumerate(rows):
+            for column in row:
+                column_rows[column].add(i)
+        pivot_rows = []
+        pivot_columns = []
+        used_rows = set()
+        for column in range(sparse_matrix.shape[1]):
+            candidates = [i for i in column_rows[column] if i not in used_rows]
+            if not candidates:
+                continue
+            pivot_row = min(candidates, key=lambda i: len(rows[i]))
+            used_rows.add(pivot_row)
+            pivot = rows[pivot_row]
+            for i in list(column_rows[column]):
+                if i == pivot_row:
+                    continue
+                row = rows[i]
+                factor = row[column]
+                reduced_row = {c: pivot[column] * v for c, v in row.items()}
+                for c, v in pivot.items():
+                    value = reduced_row.get(c, 0) - factor * v
+                    if value:
+                        reduced_row[c] = value
+                    else:
+                        reduced_row.pop(c, None)
+                divisor = 0
+                for v in reduced_row.values():
+                    divisor = gcd(divisor, v)
+                if divisor > 1:
+                    reduced_row = {c: v // divisor for c, v in reduced_row.items()}
+                for c in row:
+                    if c not in reduced_row:
+                        column_rows[c].discard(i)
+                for c in reduced_row:
+                    column_rows[c].add(i)
+                rows[i] = reduced_row
+            pivot_rows.append(pivot_row)
+            pivot_columns.append(column)
+        return [rows[i] for i in pivot_rows], pivot_columns
+
+    def compute_nullspace(self, matrix):
+        """
+        Computes the basis of the matrix nullspace.
+
+        :param matrix: the matrix
+        :return: list of the basis vectors, each one as minimal integers
+        """
+        return self.__compute_nullspace(*self.__row_reduce_any(matrix))
+
+    def __compute_nullspace(self, rows, pivot_columns, columns):
+        basis = []
+        for free_column in (c for c in range(columns) if c not in pivot_columns):
+            vector = [Fraction(0)] * columns
+            vector[free_column] = Fraction(1)
+            for row, pivot_column in zip(rows, pivot_columns):
+                vector[pivot_column] = Fraction(-row.get(free_column, 0) if isinstance(row, dict) else
+                                                -row[free_column], row[pivot_column])
+            basis.append(self.scale_to_integers(vector))
+        return basis
+
+    def compute_nullity(self, matrix):
+        """
+        :param matrix: the matrix
+        :return: the dimension of the matrix nullspace
+        """
+        _, pivot_columns, columns = self.__row_reduce_any(matrix)
+        return columns - len(pivot_columns)
+
+    def compute_coefficients(self, matrix):
+        """
+        Computes the coefficients of a balanced chemical equation.
+
+        :param matrix: the equation matrix
+        :return: the coefficients as integers, the last one positive
+        :raises: ValueError upon the equation being skeletal or underdetermined
+        """
+        rows, pivot_columns, columns = self.__row_reduce_any(matrix)
+        nullity = columns - len(pivot_columns)
+        if nullity == 0:
+            raise ValueError("Skeletal equation - cannot be balanced!")
+        if nullity > 1:
+            raise ValueError("Underdetermined equation - it can be balanced in " + str(nullity) +
+                             " independent ways!")
+        coefficients = self.__compute_nullspace(rows, pivot_columns, columns)[0]
+        if 0 in coefficients:
+            raise ValueError("Skeletal equation - molecule " + str(coefficients.index(0) + 1) +
+                             " does not take part in the reaction!")
+        if coefficients[-1] < 0:
+            coefficients = [-x for x in coefficients]
+        return coefficients
+
+    def __row_reduce_any(self, matrix):
+        if isinstance(matrix, SparseMatrix):
+            return self.row_reduce_sparse(matrix) + (matrix.shape[1],)
+        return self.row_reduce(matrix) + (len(matrix[0]),)
+
+    @staticmethod
+    def scale_to_integers(vector):
+        """
+        Scales the rational vector to the smallest integer vector of the same direction.
+
+        :param vector: the vector of fractions
+        :return: the vector of integers
+        """
+        denominators_lcm = 1
+        for x in vector:
+            denominators_lcm = denominators_lcm * x.denominator // gcd(denominators_lcm, x.denominator)
+        return NullspaceComputer.__normalize([int(x * denominators_lcm) for x in vector])
+
+    @staticmethod
+    def __normalize(row):
+        divisor = 0
+        for x in row:
+            divisor = gcd(divisor, x)
+        if divisor > 1:
+            return [x // divisor for x in row]
+        return row
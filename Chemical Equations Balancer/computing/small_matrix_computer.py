@@ -0,0 +1,87 @@
+from math import gcd
+
+# The largest matrices, by the number of columns (molecules) and rows (elements), solved by the small matrix kernel.
+# Tuned with testing/benchmarks.py and random dense matrices: the kernel is 2-3 times faster than the
+# NullspaceComputer up to about 10 x 11, and loses to it beyond that, as its entries grow without GCD reductions.
+SMALL_MATRIX_COLUMNS = 10
+SMALL_MATRIX_ROWS = 10
+
+
+class SmallMatrixComputer:
+    """
+    A class for computing the coefficients of small equations - a few molecules and elements, like most real ones.
+    Fraction-free Gauss-Jordan elimination on tuples of Python integers, in plain loops: no arrays,
+    no fractions and no GCD reductions of the rows, which only pay off for bigger matrices.
+    Gives exactly the same results and errors as the NullspaceComputer.
+    """
+
+    @staticmethod
+    def is_small(matrix):
+        """
+        :param matrix: the dense equation matrix
+        :return: true if the matrix is small enough for the small matrix kernel
+        """
+        return len(matrix) <= SMALL_MATRIX_ROWS and len(matrix[0]) <= SMALL_MATRIX_COLUMNS
+
+    @staticmethod
+    def compute_coefficients(matrix):
+        """
+        Computes the coefficients of a balanced chemical equation.
+
+        :param matrix: the dense equation matrix, with integer (or integer valued) entries
+        :return: the coefficients as minimal integers, the last one positive
+        :raises: ValueError upon the equation being skeletal or underdetermined
+        """
+        columns = len(matrix[0])
+        rows = [tuple(map(int, row)) for row in matrix]
+        pivot_rows = []
+        pivot_columns = []
+        for column in range(columns):
+            for pivot in rows:
+                if pivot[column]:
+                    break
+            else:
+                continue
+            rows.remove(pivot)
+            pivot_value = pivot[column]
+            reduced_rows = []
+            for row in rows:
+                factor = row[column]
+                if factor:
+                    row = tuple([pivot_value * a - factor * b for a, b in zip(row, pivot)])
+                    if not any(row):
+                        continue
+                reduced_rows.append(row)
+            rows = reduced_rows
+            for i, row in enumerate(pivot_rows):
+                factor = row[column]
+                if factor:
+                    pivot_rows[i] = tuple([pivot_value * a - factor * b for a, b in zip(row, pivot)])
+            pivot_rows.append(pivot)
+            pivot_columns.append(column)
+        nullity = columns - len(pivot_columns)
+        if nullity == 0:
+            raise ValueError("Skeletal equation - cannot be balanced!")
+        if nullity > 1:
+            raise ValueError("Underdetermined equation - it can be balanced in " + str(nullity) +
+                             " independent ways!")
+        free_column = columns - 1
+        for column, pivot_column in enumerate(pivot_columns):
+            if column != pivot_column:
+                free_column = column
+                break
+        multiple = 1
+        for row, column in zip(pivot_rows, pivot_columns):
+            multiple = multiple * abs(row[column]) // gcd(multiple, row[column])
+        coefficients = [0] * columns
+        coefficients[free_column] = multiple
+        for row, column in zip(pivot_rows, pivot_columns):
+            coefficients[column] = -row[free_column] * (multiple // row[column])
+        divisor = gcd(*coefficients)
+        if coefficients[-1] < 0:
+            divisor = -divisor
+        coefficients = [x // divisor for x in coefficients]
+        if 0 in coefficients:
+            raise ValueError("Skeletal equation - molecule " + str(coefficients.index(0) + 1) +
+                             " does not take part in the reaction!")
+        return coefficients
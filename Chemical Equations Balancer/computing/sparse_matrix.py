@@ -0,0 +1,90 @@
+class SparseMatrix:
+    """
+    A sparse matrix in the compressed sparse row (CSR) format - the values of row i are
+    data[indptr[i]:indptr[i + 1]], lying in the columns indices[indptr[i]:indptr[i + 1]].
+    Memory and the work done on it scale with the number of non-zero entries.
+    NumPy is imported on first use, so that importing the class stays cheap.
+    """
+
+    def __init__(self, data, indices, indptr, shape):
+        """
+        :param data: the non-zero values, row by row
+        :param indices: the column of every value
+        :param indptr: the offsets of the rows in data and indices, one more than the number of rows
+        :param shape: the (rows, columns) pair
+        """
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = shape
+
+    @classmethod
+    def from_coordinates(cls, rows, columns, values, shape):
+        """
+        Creates the matrix out of the coordinate (COO) format. Values at repeated coordinates are summed up.
+
+        :param rows: the row of every value
+        :param columns: the column of every value
+        :param values: the values
+        :param shape: the (rows, columns) pair
+        :return: the matrix
+        """
+        import numpy as np
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+        order = np.lexsort((columns, rows))
+        rows, columns, values = rows[order], columns[order], values[order]
+        if len(rows) > 1:
+            is_new = np.empty(len(rows), dtype=bool)
+            is_new[0] = True
+            is_new[1:] = (rows[1:] != rows[:-1]) | (columns[1:] != columns[:-1])
+            starts = np.flatnonzero(is_new)
+            values = np.add.reduceat(values, starts)
+            rows, columns = rows[starts], columns[starts]
+        non_zero = values != 0
+        rows, columns, values = rows[non_zero], columns[non_zero], values[non_zero]
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(values, columns.astype(np.int32), indptr, shape)
+
+    @property
+    def non_zeros(self):
+        return len(self.data)
+
+    def row(self, i):
+        """
+        :param i: the row index
+        :return: the dictionary of the non-zero values of the row, keyed by column
+        """
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return dict(zip(self.indices[start:end].tolist(), self.data[start:end].tolist()))
+
+    def rows(self):
+        """
+        :return: list of dictionaries of the non-zero values of every row, keyed by column
+        """
+        return [self.row(i) for i in range(self.shape[0])]
+
+    def dot(self, vector):
+        """
+        :param vector: the vector, as long as a row
+        :return: the product of the matrix and the vector
+        """
+        import numpy as np
+        products = self.data * np.asarray(vector)[self.indices]
+        result = np.zeros(self.shape[0], dtype=products.dtype)
+        np.add.at(result, np.repeat(np.arange(self.shape[0]), np.diff(self.indptr)), products)
+        return result
+
+    def toarray(self):
+        """
+        :return: the matrix as a dense array
+        """
+        import numpy as np
+        array = np.zeros(self.shape, dtype=np.int64)
+        array[np.repeat(np.arange(self.shape[0]), np.diff(self.indptr)), self.indices] = self.data
+        return array
+
+    def __len__(self):
+        return self.shape[0]
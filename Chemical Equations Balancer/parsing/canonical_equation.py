@@ -0,0 +1,51 @@
+
+from parsing.equation_parser import EquationParser
+
+
+class CanonicalEquation:
+    """
+    A canonical form of an equation - molecules with whitespace stripped and sorted within each side,
+    so that the same reaction written in a different order or spacing gets the same key.
+    Maps coefficients between the caller's molecule order and the canonical one.
+    """
+
+    def __init__(self, left_side_molecules, right_side_molecules):
+        """
+        :param left_side_molecules: the molecules in left side of the equation, in the caller's order
+        :param right_side_molecules: the molecules in right side of the equation, in the caller's order
+        """
+        self.molecules = (left_side_molecules, right_side_molecules)
+        left_side_order = sorted(range(len(left_side_molecules)), key=left_side_molecules.__getitem__)
+        right_side_order = sorted(range(len(right_side_molecules)), key=right_side_molecules.__getitem__)
+        self.key = "+".join(left_side_molecules[i] for i in left_side_order) + "->" + \
+                   "+".join(right_side_molecules[i] for i in right_side_order)
+        self.permutation = left_side_order + [len(left_side_molecules) + i for i in right_side_order]
+
+    @classmethod
+    def from_equation(cls, equation, equation_parser=None):
+        """
+        Creates the canonical form straight from the equation, without parsing any molecule.
+
+        :param equation: the equation
+        :param equation_parser: the parser used for splitting the equation into molecules
+        :return: the canonical equation
+        """
+        equation_parser = equation_parser if equation_parser is not None else EquationParser()
+        return cls(*equation_parser.split_into_molecules(equation))
+
+    def to_canonical_order(self, coefficients):
+        """
+        :param coefficients: the coefficients in the caller's molecule order
+        :return: the coefficients in the canonical molecule order
+        """
+        return [coefficients[i] for i in self.permutation]
+
+    def from_canonical_order(self, canonical_coefficients):
+        """
+        :param canonical_coefficients: the coefficients in the canonical molecule order
+        :return: the coefficients in the caller's molecule order
+        """
+        coefficients = [None] * len(canonical_coefficients)
+        for canonical_index, index in enumerate(self.permutation):
+            coefficients[index] = canonical_coefficients[canonical_index]
+        return coefficients
@@ -0,0 +1,245 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from computing.matrix_creator import MatrixCreator
+from parsing.equation_parser import EquationParser
+from parsing.parsed_equation import ParsedEquation
+from parsing.species_index import ElementTable, Species, SpeciesTable
+
+MAGIC = b"CHEMBAL\x01"
+# the sections of the file, in the order they are written in, with the array type of each:
+# q - 64-bit offsets into the next section, i - 32-bit ids and counts, B - UTF-8 text
+SECTIONS = (
+    ("element_offsets", "q"), ("element_symbols", "B"),
+    ("species_offsets", "q"), ("species_formulas", "B"),
+    ("composition_offsets", "q"), ("composition_elements", "i"), ("composition_counts", "i"),
+    ("equation_offsets", "q"), ("equation_texts", "B"),
+    ("equation_species_offsets", "q"), ("equation_species", "i"), ("left_side_counts", "i"),
+)
+HEADER = struct.Struct("=8s8s" + "QQ" * len(SECTIONS))
+ALIGNMENT = 8
+
+
+class CompiledCorpus:
+    """
+    A corpus of equations compiled once into a binary file, for balancing it again and again with no parsing.
+    The file holds an element table, the compositions of all the distinct species in CSR format and, for every
+    equation, the CSR-style array of the ids of its species together with the number of the left side ones.
+    Opening it maps the file into memory - every section is a zero-copy typed memoryview over the mapping,
+    so it loads in no time, and worker processes opening the same file share its pages.
+    Equations which could not be parsed are kept as text only, with -1 left side species.
+    """
+
+    def __init__(self, path):
+        """
+        Raises ValueError if the file is not a compiled corpus of a platform of this byte order.
+
+        :param path: the path of the compiled corpus file
+        """
+        if not CompiledCorpus.is_compiled(path):
+            raise ValueError(path + " is not a compiled corpus")
+        self.__species = {}
+        self.__species_atoms = {}
+        self.__sections = {}
+        with open(path, 'rb') as corpus_file:
+            self.__mapping = mmap.mmap(corpus_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__buffer = memoryview(self.__mapping)
+        _, byte_order, *sections = HEADER.unpack_from(self.__buffer)
+        if byte_order.rstrip(b"\0").decode() != sys.byteorder:
+            self.close()
+            raise ValueError(path + " is a compiled corpus of a " + byte_order.rstrip(b"\0").decode() +
+                             "-endian platform")
+        for (name, typecode), offset, size in zip(SECTIONS, sections[::2], sections[1::2]):
+            self.__sections[name] = self.__buffer[offset:offset + size].cast(typecode)
+        self.element_table = ElementTable()
+        for symbol in self.__strings("element_offsets", "element_symbols", range(self.elements_count)):
+            self.element_table.intern(symbol)
+
+    @staticmethod
+    def compile(equations, path, molecule_parser=None):
+        """
+        Parses the equations and writes them into a compiled corpus file. Every distinct formula is parsed once.
+
+        :param equations: the equations
+        :param path: the path of the compiled corpus file
+        :param molecule_parser: the parser for extracting atoms out of molecules,
+        the process-wide molecule cache by default
+        :return: the number of compiled equations
+        """
+        species_table = SpeciesTable(molecule_parser, ElementTable())
+        equation_parser = EquationParser(species_table.molecule_parser)
+        species_ids = {}
+        sections = {name: array(typecode) for name, typecode in SECTIONS}
+        equation_texts = []
+        for equation in equations:
+            equation_texts.append(equation.encode())
+            try:
+                left_side_molecules, right_side_molecules = equation_parser.split_into_molecules(equation)
+                molecules_species = [species_table.get(m) for m in left_side_molecules + right_side_molecules]
+            except SyntaxError:
+                sections["left_side_counts"].append(-1)
+                sections["equation_species_offsets"].append(len(sections["equation_species"]))
+                continue
+            for species in molecules_species:
+                species_id = species_ids.setdefault(species.formula, len(species_ids))
+                if species_id == len(sections["composition_offsets"]):
+                    sections["composition_offsets"].append(len(sections["composition_elements"]))
+                    sections["composition_elements"].extend(species.element_ids)
+                    sections["composition_counts"].extend(species.counts)
+                sections["equation_species"].append(species_id)
+            sections["left_side_counts"].append(len(left_side_molecules))
+            sections["equation_species_offsets"].append(len(sections["equation_species"]) - len(molecules_species))
+        sections["composition_offsets"].append(len(sections["composition_elements"]))
+        sections["equation_species_offsets"].append(len(sections["equation_species"]))
+        element_table = species_table.element_table
+        CompiledCorpus.__add_strings(sections, "element_offsets", "element_symbols",
+                                     [element_table.symbol(e).encode() for e in range(len(element_table))])
+        CompiledCorpus.__add_strings(sections, "species_offsets", "species_formulas",
+                                     [formula.encode() for formula in species_ids])
+        CompiledCorpus.__add_strings(sections, "equation_offsets", "equation_texts", equation_texts)
+        CompiledCorpus.__write(sections, path)
+        return len(equation_texts)
+
+    @staticmethod
+    def is_compiled(path):
+        """
+        :param path: the path of a file
+        :return: true if the file is a compiled corpus
+        """
+        with open(path, 'rb') as corpus_file:
+            header = corpus_file.read(HEADER.size)
+        return len(header) == HEADER.size and header.startswith(MAGIC)
+
+    @property
+    def elements_count(self):
+        return len(self.__sections["element_offsets"]) - 1
+
+    @property
+    def species_count(self):
+        return len(self.__sections["species_offsets"]) - 1
+
+    def section(self, name):
+        """
+        :param name: the name of the section, see SECTIONS
+        :return: the section as a zero-copy typed memoryview, e.g. for numpy.frombuffer
+        """
+        return self.__sections[name]
+
+    def equation(self, i):
+        """
+        :param i: the index of the equation
+        :return: the text of the equation
+        """
+        return next(self.__strings("equation_offsets", "equation_texts", (i,)))
+
+    def species(self, species_id):
+        """
+        :param species_id: the id of the species within the corpus
+        :return: the compiled Species, with zero-copy views of its composition
+        """
+        species = self.__species.get(species_id)
+        if species is None:
+            offsets = self.__sections["composition_offsets"]
+            start, end = offsets[species_id], offsets[species_id + 1]
+            formula = next(self.__strings("species_offsets", "species_formulas", (species_id,)))
+            species = self.__species[species_id] = Species(formula,
+                                                           self.__sections["composition_elements"][start:end],
+                                                           self.__sections["composition_counts"][start:end])
+        return species
+
+    def equation_species(self, i):
+        """
+        :param i: the index of the equation
+        :return: the species of the equation, left side ones first, and the number of the left side ones -
+        -1 if the equation could not be parsed
+        """
+        offsets = self.__sections["equation_species_offsets"]
+        return [self.species(k) for k in self.__sections["equation_species"][offsets[i]:offsets[i + 1]]], \
+            self.__sections["left_side_counts"][i]
+
+    def parsed_equation(self, i):
+        """
+        Builds the parsed equation out of the compiled species - the atoms of every species are created once.
+
+        :param i: the index of the equation
+        :return: the ParsedEquation, None if the equation could not be parsed
+        """
+        species, left_side_count = self.equation_species(i)
+        if left_side_count < 0:
+            return None
+        molecules = [s.formula for s in species]
+        atoms = [self.__atoms(s) for s in species]
+        return ParsedEquation(molecules[:left_side_count], molecules[left_side_count:],
+                              atoms[:left_side_count], atoms[left_side_count:])
+
+    def equation_rows(self, i):
+        """
+        :param i: the index of the equation
+        :return: the equation matrix rows, see MatrixCreator.create_species_rows
+        """
+        return MatrixCreator.create_species_rows(self.equation_species(i)[0])
+
+    def close(self):
+        """
+        Releases the memory mapping - no section, species or equation of the corpus may be used afterwards.
+        """
+        for species in self.__species.values():
+            species.element_ids.release()
+            species.counts.release()
+        for section in self.__sections.values():
+            section.release()
+        self.__species = {}
+        self.__sections = {}
+        self.__buffer.release()
+        try:
+            self.__mapping.close()
+        except BufferError:
+            # views of the sections are still held elsewhere, e.g. by NumPy arrays - the mapping goes with them
+            pass
+
+    def __len__(self):
+        return len(self.__sections["left_side_counts"])
+
+    def __atoms(self, species):
+        atoms = self.__species_atoms.get(species.formula)
+        if atoms is None:
+            atoms = self.__species_atoms[species.formula] = species.atoms(self.element_table)
+        return atoms
+
+    def __strings(self, offsets_section, texts_section, indices):
+        offsets = self.__sections[offsets_section]
+        texts = self.__sections[texts_section]
+        for i in indices:
+            yield bytes(texts[offsets[i]:offsets[i + 1]]).decode()
+
+    @staticmethod
+    def __add_strings(sections, offsets_section, texts_section, strings):
+        offsets = sections[offsets_section]
+        texts = sections[texts_section]
+        for string in strings:
+            offsets.append(len(texts))
+            texts.frombytes(string)
+        offsets.append(len(texts))
+
+    @staticmethod
+    def __write(sections, path):
+        header = []
+        offset = HEADER.size
+        for name, _ in SECTIONS:
+            offset += -offset % ALIGNMENT
+            size = len(sections[name]) * sections[name].itemsize
+            header.extend((offset, size))
+            offset += size
+        with open(path, 'wb') as corpus_file:
+            corpus_file.write(HEADER.pack(MAGIC, sys.byteorder.encode(), *header))
+            for (name, _), section_offset in zip(SECTIONS, header[::2]):
+                corpus_file.write(b"\0" * (section_offset - corpus_file.tell()))
+                sections[name].tofile(corpus_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
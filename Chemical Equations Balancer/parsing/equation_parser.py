@@ -1,10 +1,52 @@
-import unittest
 import re
 
+from parsing.molecule_parser import MoleculeParser
+from parsing.parsed_equation import ParsedEquation
+
+MOLECULES_SEPARATOR = re.compile(r"(?<!\^)(?<!\^\d)(?<!\^\d\d)\+")
+MOLECULE_CHARACTERS = re.compile("^[A-Za-z0-9()\\[\\]\u00b7*.^+-]*$")
+
 
 class EquationParser:
     """ A class for parsing molecules out of complete equation """
 
+    def __init__(self, molecule_parser=None):
+        """
+        :param molecule_parser: the parser used for extracting atoms out of molecules
+        """
+        self.molecule_parser = molecule_parser if molecule_parser is not None else MoleculeParser()
+
+    def parse_equation(self, equation):
+        """
+        Parses the whole equation at once - splits it into sides, sides into molecules
+        and molecules into atoms. Raises SyntaxError if the equation does not meet format requirements.
+        :param equation: the equation
+        :type equation: string
+        :return: the parsed equation
+        """
+        return self.parse_molecules(*self.split_into_molecules(equation))
+
+    def split_into_molecules(self, equation):
+        """
+        Splits the equation into the molecules of both sides, without parsing the molecules themselves.
+        :param equation: the equation
+        :type equation: string
+        :return: the left side molecules and the right side molecules
+        """
+        sides = self.parse_equation_into_two_sides(equation)
+        return self.parse_side_to_molecules(sides[0]), self.parse_side_to_molecules(sides[1])
+
+    def parse_molecules(self, left_side_molecules, right_side_molecules):
+        """
+        Parses the molecules of both sides into atoms.
+        :param left_side_molecules: the molecules in left side of the equation
+        :param right_side_molecules: the molecules in right side of the equation
+        :return: the parsed equation
+        """
+        return ParsedEquation(left_side_molecules, right_side_molecules,
+                              [self.molecule_parser.parse_molecule_into_atoms(m) for m in left_side_molecules],
+                              [self.molecule_parser.parse_molecule_into_atoms(m) for m in right_side_molecules])
+
     @staticmethod
     def parse_equation_into_two_sides(equation):
         """
@@ -22,33 +64,13 @@ class EquationParser:
     def parse_side_to_molecules(equation_side):
         """
         Splits a side of equation to molecules list. Additionally, checks if such split molecule contains
-        any not allowed characters.
+        any not allowed characters. A + sign being a part of a charge (Fe^3+) does not split molecules.
         :param equation_side: a side of the equation
         :return: list of molecules
         """
 
-        molecules = equation_side.replace(" ", "").split("+")
+        molecules = MOLECULES_SEPARATOR.split(equation_side.replace(" ", ""))
         for molecule in molecules:
-            if not re.match("^[A-Za-z0-9()]*$", molecule):
+            if not MOLECULE_CHARACTERS.match(molecule):
                 raise SyntaxError("Molecule " + molecule + " contains an invalid character")
         return molecules
-
-
-class EquationParserTest(unittest.TestCase):
-    """ A class for testing equation parser correctness """
-
-    equation_parser = EquationParser()
-
-    def test_splitting_into_sides(self):
-        self.assertRaises(SyntaxError, lambda: self.equation_parser.parse_equation_into_two_sides("H2 + O2 H2O"))
-        self.assertEqual(self.equation_parser.parse_equation_into_two_sides("H2 + O2 -> H2O"), ["H2 + O2 ", " H2O"])
-
-    def test_parsing_sides(self):
-        self.assertEqual(self.equation_parser.parse_side_to_molecules("H2O + O2 "), ['H2O', 'O2'])
-        self.assertRaises(SyntaxError, lambda: self.equation_parser.parse_side_to_molecules("(H2_O + O2"))
-        self.assertEqual(self.equation_parser.parse_side_to_molecules(
-            self.equation_parser.parse_equation_into_two_sides("CaO + N2O5 -> Ca(NO3)2")[1]), ['Ca(NO3)2'])
-
-
-if __name__ == '__main__':
-    unittest.main()
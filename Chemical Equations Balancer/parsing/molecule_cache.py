@@ -0,0 +1,85 @@
+import threading
+
+from collections import OrderedDict
+
+from parsing.molecule_parser import MoleculeParser
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class MoleculeCache:
+    """
+    A memoizing, size-bounded (LRU) layer over MoleculeParser.
+    Can be used anywhere a MoleculeParser is expected. Every call returns a fresh copy
+    of the cached atoms, so callers cannot corrupt the cache - a plain dictionary, which is several times
+    cheaper to create than a counter and keeps the order of the atoms all the same.
+    """
+
+    __shared_instance = None
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, molecule_parser=None):
+        """
+        :param max_size: the maximum number of molecules kept in the cache
+        :param molecule_parser: the parser used on cache misses
+        """
+        if max_size < 1:
+            raise ValueError("Cache size must be a positive number")
+        self.max_size = max_size
+        self.molecule_parser = molecule_parser if molecule_parser is not None else MoleculeParser()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """
+        :return: the cache instance shared by all the balancing components of the process
+        """
+        if cls.__shared_instance is None:
+            cls.__shared_instance = cls()
+        return cls.__shared_instance
+
+    def parse_molecule_into_atoms(self, molecule):
+        """
+        Creates a dictionary, where atom symbol is a key and its count is the value.
+        Parses the molecule only if it is not cached already.
+        :param molecule: the molecule
+        :type molecule: string
+        :return: the dictionary
+        """
+        with self.__lock:
+            atoms = self.__entries.get(molecule)
+            if atoms is not None:
+                self.__entries.move_to_end(molecule)
+                self.hits += 1
+                return dict(atoms)
+            self.misses += 1
+        atoms = self.molecule_parser.parse_molecule_into_atoms(molecule)
+        with self.__lock:
+            self.__entries[molecule] = atoms
+            self.__entries.move_to_end(molecule)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+        return dict(atoms)
+
+    def statistics(self):
+        """
+        :return: the dictionary of cache counters
+        """
+        with self.__lock:
+            return {"size": len(self.__entries), "max_size": self.max_size,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        """
+        Removes all the cached molecules and resets the counters.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self.__entries)
@@ -1,5 +1,3 @@
-import re
-import unittest
 
 from collections import Counter, OrderedDict
 
@@ -11,82 +9,171 @@ class OrderedCounter(Counter, OrderedDict):
     pass
 
 
+CHARGE = 'charge'
+HYDRATE_SEPARATORS = '\u00b7*.'
+OPENING_BRACKETS = {'(': ')', '[': ']'}
+CLOSING_BRACKETS = {')': '(', ']': '['}
+
+ELEMENT, NUMBER, OPENING, CLOSING, SEPARATOR, CHARGE_SUFFIX = range(6)
+
+
 class MoleculeParser:
-    """ A class for extracting atoms and their counts from molecules. """
+    """
+    A class for extracting atoms and their counts from molecules.
+    Supports nested round and square brackets, multi-digit counts, hydrates (CuSO4\u00b75H2O)
+    and a trailing charge (SO4^2-, Fe^3+), which is counted as a pseudo-atom named 'charge'.
+    """
 
     def parse_molecule_into_atoms(self, molecule):
         """
         Creates a dictionary, where atom symbol is a key and its count is the value.
+        Keys are ordered by the bracket depth of the atom's shallowest occurrence, then by position,
+        which keeps the atoms (and so the equation matrix rows) in the order the parser always used.
+        The work is linear in the molecule length - atoms are never replicated, only their counts are multiplied.
         :param molecule: the molecule
         :type molecule: string
         :return: the dictionary
         """
 
-        self.validate_molecule_format(molecule)
-        parts = filter(bool, re.split('([A-Z][a-z]*|\(|\))', molecule))
-        stack = [[]]
-        for part in parts:
-            if part == '(':
-                stack.append([])
-            elif part == ')':
-                stack[-2].append(stack.pop())
-            elif part.isdigit():
-                stack[-1].append(int(part) * stack[-1].pop())
-            else:
-                stack[-1].append([part])
+        tokens = self.tokenize_molecule(molecule)
+        counts = {}
+        first_occurrences = {}
+        part_end = len(tokens)
+        for part_start in range(len(tokens) - 1, -2, -1):
+            if part_start == -1 or tokens[part_start][0] == SEPARATOR:
+                self.__count_part_atoms(tokens, part_start + 1, part_end, counts, first_occurrences)
+                part_end = part_start
         count = OrderedCounter()
-        while stack:
-            if isinstance(stack[0], list):
-                stack.extend(stack.pop(0))
-            else:
-                count[stack.pop(0)] += 1
+        for atom in sorted(counts, key=first_occurrences.get):
+            if counts[atom] != 0:
+                count[atom] = counts[atom]
         return count
 
     @staticmethod
-    def validate_molecule_format(molecule):
+    def __count_part_atoms(tokens, start, end, counts, first_occurrences):
         """
-        Checks whether given molecule meets format requirements
+        Scans one hydrate part of the molecule from right to left, so that every bracket's
+        multiplier is known before its content, keeping only a stack of multipliers.
+        """
+        part_multiplier = 1
+        if tokens[start][0] == NUMBER:
+            part_multiplier = tokens[start][1]
+            start += 1
+        multipliers = [part_multiplier]
+        pending = 1
+        for i in range(end - 1, start - 1, -1):
+            kind, value, position = tokens[i]
+            if kind == NUMBER:
+                pending = value
+            elif kind == CLOSING:
+                multipliers.append(multipliers[-1] * pending)
+                pending = 1
+            elif kind == OPENING:
+                multipliers.pop()
+            elif kind == ELEMENT:
+                counts[value] = counts.get(value, 0) + multipliers[-1] * pending
+                occurrence = (len(multipliers) - 1, position)
+                if value not in first_occurrences or occurrence < first_occurrences[value]:
+                    first_occurrences[value] = occurrence
+                pending = 1
+            else:
+                counts[CHARGE] = value
+                first_occurrences[CHARGE] = (0, position)
+
+    @staticmethod
+    def tokenize_molecule(molecule):
+        """
+        Splits the molecule into tokens in a single pass. Raises SyntaxError
+        pointing at the exact position if the molecule does not meet format requirements.
         :param molecule: the molecule
         :type molecule: string
+        :return: list of (kind, value, position) tuples
         """
 
         if len(molecule) == 0:
             raise SyntaxError("Not a molecule nor atom")
-        opening_brackets = [m.start() for m in re.finditer('\(', molecule)]
-        closing_brackets = [m.start() for m in re.finditer('\)', molecule)]
-        if len(opening_brackets) != len(closing_brackets):
-            raise SyntaxError("Brackets do not match")
-
-
-class MoleculeParserTest(unittest.TestCase):
-    """ A class for testing parser correctness on molecules of different difficulty level """
-
-    molecule_parser = MoleculeParser()
-
-    def test_simple_molecules_parsing(self):
-        water_parsing = self.molecule_parser.parse_molecule_into_atoms('H2O')
-        self.assertEqual(water_parsing['H'], 2)
-        self.assertEqual(water_parsing['O'], 1)
-        self.assertRaises(SyntaxError, lambda: self.molecule_parser.parse_molecule_into_atoms('(H2O'))
-        self.assertRaises(SyntaxError, lambda: self.molecule_parser.parse_molecule_into_atoms('H2O)'))
-
-    def test_more_complicated_molecules_parsing(self):
-        lactic_acid_parsing = self.molecule_parser.parse_molecule_into_atoms('CH3CH(OH)COOH')
-        self.assertEqual(lactic_acid_parsing['C'], 3)
-        self.assertEqual(lactic_acid_parsing['H'], 6)
-        picric_acid_parsing = self.molecule_parser.parse_molecule_into_atoms('C6H2(NO2)3OH')
-        self.assertEqual(picric_acid_parsing['C'], 6)
-        self.assertEqual(picric_acid_parsing['H'], 3)
-        self.assertEqual(picric_acid_parsing['N'], 3)
-        self.assertEqual(picric_acid_parsing['O'], 7)
-
-    def test_hardcore_molecules_parsing(self):
-        hardcore_molecule_parsing = self.molecule_parser.parse_molecule_into_atoms('K4(ON(SO3)2)2')
-        self.assertEqual(hardcore_molecule_parsing['K'], 4)
-        self.assertEqual(hardcore_molecule_parsing['O'], 14)
-        self.assertEqual(hardcore_molecule_parsing['N'], 2)
-        self.assertEqual(hardcore_molecule_parsing['S'], 4)
-
-
-if __name__ == '__main__':
-    unittest.main()
+        tokens = []
+        brackets = []
+        length = len(molecule)
+        i = 0
+        while i < length:
+            character = molecule[i]
+            previous_kind = tokens[-1][0] if tokens else None
+            if 'A' <= character <= 'Z':
+                j = i + 1
+                while j < length and 'a' <= molecule[j] <= 'z':
+                    j += 1
+                tokens.append((ELEMENT, molecule[i:j], i))
+                i = j
+                continue
+            if '0' <= character <= '9':
+                j = i + 1
+                while j < length and '0' <= molecule[j] <= '9':
+                    j += 1
+                if previous_kind not in (ELEMENT, CLOSING, SEPARATOR):
+                    raise SyntaxError("Number at position " + str(i) + " of " + molecule +
+                                      " does not follow an atom nor a bracket")
+                if int(molecule[i:j]) == 0:
+                    raise SyntaxError("Zero count at position " + str(i) + " of " + molecule)
+                tokens.append((NUMBER, int(molecule[i:j]), i))
+                i = j
+                continue
+            if character in OPENING_BRACKETS:
+                brackets.append(i)
+                tokens.append((OPENING, character, i))
+            elif character in CLOSING_BRACKETS:
+                if not brackets:
+                    raise SyntaxError("Bracket " + character + " at position " + str(i) + " of " + molecule +
+                                      " does not close anything")
+                opening = brackets.pop()
+                if molecule[opening] != CLOSING_BRACKETS[character]:
+                    raise SyntaxError("Bracket " + molecule[opening] + " at position " + str(opening) + " of " +
+                                      molecule + " is closed with " + character + " at position " + str(i))
+                tokens.append((CLOSING, character, i))
+            elif character in HYDRATE_SEPARATORS:
+                if brackets or previous_kind in (None, SEPARATOR):
+                    raise SyntaxError("Misplaced hydrate separator at position " + str(i) + " of " + molecule)
+                tokens.append((SEPARATOR, character, i))
+            elif character == '^':
+                if brackets or previous_kind in (None, SEPARATOR):
+                    raise SyntaxError("Misplaced charge at position " + str(i) + " of " + molecule)
+                tokens.append((CHARGE_SUFFIX, MoleculeParser.parse_charge(molecule[i + 1:], molecule, i), i))
+                i = length
+                continue
+            else:
+                raise SyntaxError("Unexpected character " + character + " at position " + str(i) + " of " + molecule)
+            i += 1
+        if brackets:
+            raise SyntaxError("Bracket " + molecule[brackets[-1]] + " at position " + str(brackets[-1]) + " of " +
+                              molecule + " is not closed")
+        if tokens[-1][0] == SEPARATOR:
+            raise SyntaxError("Misplaced hydrate separator at position " + str(tokens[-1][2]) + " of " + molecule)
+        return tokens
+
+    @staticmethod
+    def parse_charge(charge, molecule, position):
+        """
+        Parses a charge written after the ^ sign, either as 2- or as -2.
+        :param charge: the charge, without the ^ sign
+        :param molecule: the whole molecule, for error reporting
+        :param position: the position of the ^ sign, for error reporting
+        :return: the charge as integer
+        """
+
+        if len(charge) > 0 and charge[-1] in '+-' and (charge[:-1] == '' or charge[:-1].isdigit()):
+            sign, magnitude = charge[-1], charge[:-1]
+        elif len(charge) > 0 and charge[0] in '+-' and (charge[1:] == '' or charge[1:].isdigit()):
+            sign, magnitude = charge[0], charge[1:]
+        else:
+            raise SyntaxError("Invalid charge at position " + str(position) + " of " + molecule)
+        return (int(magnitude) if magnitude else 1) * (1 if sign == '+' else -1)
+
+    @staticmethod
+    def validate_molecule_format(molecule):
+        """
+        Checks whether given molecule meets format requirements
+        :param molecule: the molecule
+        :type molecule: string
+        """
+
+        MoleculeParser.tokenize_molecule(molecule)
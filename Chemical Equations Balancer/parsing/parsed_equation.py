@@ -0,0 +1,32 @@
+class ParsedEquation:
+    """
+    A chemical equation parsed once and shared by all the balancing components.
+    Holds the molecules of both sides together with their atoms counts,
+    so that neither matrix creation nor validation has to parse anything again.
+    """
+
+    def __init__(self, left_side_molecules, right_side_molecules, left_side_atoms, right_side_atoms):
+        """
+        :param left_side_molecules: the molecules in left side of the equation
+        :param right_side_molecules: the molecules in right side of the equation
+        :param left_side_atoms: the atoms counts of every left side molecule
+        :param right_side_atoms: the atoms counts of every right side molecule
+        """
+        self.left_side_molecules = left_side_molecules
+        self.right_side_molecules = right_side_molecules
+        self.left_side_atoms = left_side_atoms
+        self.right_side_atoms = right_side_atoms
+
+    @property
+    def molecules(self):
+        """
+        :return: all the molecules, left side ones first
+        """
+        return self.left_side_molecules + self.right_side_molecules
+
+    @property
+    def atoms(self):
+        """
+        :return: the atoms counts of all the molecules, left side ones first
+        """
+        return self.left_side_atoms + self.right_side_atoms
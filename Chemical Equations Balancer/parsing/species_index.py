@@ -0,0 +1,139 @@
+import threading
+from array import array
+from collections import OrderedDict
+
+from parsing.molecule_cache import MoleculeCache
+
+DEFAULT_SPECIES_TABLE_SIZE = 4096
+# real formulas have a few hundred distinct element symbols at most - the cap only keeps junk input from
+# growing the table without bound
+MAX_ELEMENTS = 4096
+
+
+class ElementTable:
+    """
+    A table interning element symbols as small integer ids, assigned in the order of first occurrence.
+    Ids are never reused, so the number of distinct symbols is capped at MAX_ELEMENTS.
+    """
+
+    __shared_instance = None
+
+    def __init__(self):
+        self.__ids = {}
+        self.__symbols = []
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """
+        :return: the element table shared by the whole process
+        """
+        if cls.__shared_instance is None:
+            cls.__shared_instance = cls()
+        return cls.__shared_instance
+
+    def intern(self, symbol):
+        """
+        :param symbol: the element symbol
+        :return: the id of the element, assigned now if it is seen for the first time
+        """
+        element_id = self.__ids.get(symbol)
+        if element_id is None:
+            with self.__lock:
+                if symbol not in self.__ids and len(self.__symbols) >= MAX_ELEMENTS:
+                    raise SyntaxError("Too many distinct elements - " + symbol + " is not a known one")
+                element_id = self.__ids.setdefault(symbol, len(self.__symbols))
+                if element_id == len(self.__symbols):
+                    self.__symbols.append(symbol)
+        return element_id
+
+    def symbol(self, element_id):
+        return self.__symbols[element_id]
+
+    def __len__(self):
+        return len(self.__symbols)
+
+
+class Species:
+    """
+    A compiled molecule - its formula and composition as parallel arrays of element ids and counts.
+    """
+
+    __slots__ = ("formula", "element_ids", "counts")
+
+    def __init__(self, formula, element_ids, counts):
+        """
+        :param formula: the molecule formula
+        :param element_ids: array('i') of the ids of its elements
+        :param counts: array('i') of the counts of its elements
+        """
+        self.formula = formula
+        self.element_ids = element_ids
+        self.counts = counts
+
+    def atoms(self, element_table):
+        """
+        :return: the dictionary of atoms counts, keyed by element symbol
+        """
+        return {element_table.symbol(e): c for e, c in zip(self.element_ids, self.counts)}
+
+    def __repr__(self):
+        return "Species(" + repr(self.formula) + ")"
+
+
+class SpeciesTable:
+    """
+    A size-bounded (LRU) table of compiled species, keyed by formula. All the species share one ElementTable.
+    Evicted species are simply compiled again when needed - a Species never changes, so the ones still held
+    by their users stay valid.
+    """
+
+    __shared_instance = None
+
+    def __init__(self, molecule_parser=None, element_table=None, max_size=DEFAULT_SPECIES_TABLE_SIZE):
+        """
+        :param molecule_parser: the parser used for formulas not in the table yet, the process-wide molecule cache
+        by default
+        :param element_table: the element table, the process-wide one by default
+        :param max_size: the maximum number of species kept in the table
+        """
+        if max_size < 1:
+            raise ValueError("Table size must be a positive number")
+        self.molecule_parser = molecule_parser if molecule_parser is not None else MoleculeCache.shared()
+        self.element_table = element_table if element_table is not None else ElementTable.shared()
+        self.max_size = max_size
+        self.__species = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """
+        :return: the species table shared by the whole process
+        """
+        if cls.__shared_instance is None:
+            cls.__shared_instance = cls()
+        return cls.__shared_instance
+
+    def get(self, formula):
+        """
+        Raises SyntaxError if the formula does not meet format requirements.
+
+        :param formula: the molecule formula
+        :return: the compiled Species
+        """
+        with self.__lock:
+            species = self.__species.get(formula)
+            if species is not None:
+                self.__species.move_to_end(formula)
+                return species
+        atoms = self.molecule_parser.parse_molecule_into_atoms(formula)
+        species = Species(formula, array('i', [self.element_table.intern(atom) for atom in atoms]),
+                          array('i', atoms.values()))
+        with self.__lock:
+            species = self.__species.setdefault(formula, species)
+            while len(self.__species) > self.max_size:
+                self.__species.popitem(last=False)
+        return species
+
+    def __len__(self):
+        return len(self.__species)
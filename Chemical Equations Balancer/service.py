@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import json
+
+from balancing.async_balancer import AsyncBalancer, DEFAULT_BATCH_WINDOW, DEFAULT_MAX_IN_FLIGHT
+
+
+class BalancingService:
+    """
+    A local JSON balancing service, listening on a TCP port or a Unix socket.
+    Every request is a line holding a JSON object, e.g. {"id": 1, "equation": "H2 + O2 -> H2O"},
+    and gets a line with the BalancingResult as JSON, carrying the same id. Requests of a single connection
+    are handled concurrently, so responses may come back out of order.
+    """
+
+    def __init__(self, async_balancer):
+        self.async_balancer = async_balancer
+
+    async def handle_connection(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(self.__respond(line, writer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def __respond(self, line, writer):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            response = (await self.async_balancer.balance(request["equation"])).to_dict()
+        except (ValueError, KeyError, TypeError, AttributeError) as ex:
+            response = {"error": "Invalid request: " + str(ex)}
+        response["id"] = request_id
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+
+async def serve(arguments):
+    async with AsyncBalancer(processes=arguments.processes, max_in_flight=arguments.max_in_flight,
+                             batch_window=arguments.batch_window / 1000) as async_balancer:
+        service = BalancingService(async_balancer)
+        if arguments.unix_socket:
+            server = await asyncio.start_unix_server(service.handle_connection, path=arguments.unix_socket)
+        else:
+            server = await asyncio.start_server(service.handle_connection, arguments.host, arguments.port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves chemical equations balancing as newline-delimited JSON "
+                                                 "over TCP or a Unix socket.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="path of the Unix socket to listen on instead of TCP")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="number of worker processes (default: one background thread)")
+    parser.add_argument("--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help="maximum number of distinct equations being balanced at once")
+    parser.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="micro-batching window in milliseconds")
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(serve(arguments))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+
+from balancing.balancer import Balancer
+from balancing.parallel_balancer import ParallelBalancer, DEFAULT_CHUNK_SIZE
+
+DEFAULT_FLUSH_INTERVAL = 1000
+
+
+def read_equations(lines):
+    """
+    Lazily extracts the equations out of the lines, one per line. Anything after a ; sign
+    is ignored, so files in the test_data.txt format can be used directly.
+    """
+    for line in lines:
+        equation = line.split(';')[0].strip()
+        if equation:
+            yield equation
+
+
+def balance_sequentially(equations, chunk_size):
+    """
+    Balances the equations chunk by chunk in this process.
+
+    :return: generator of (BalancingResult, seconds spent on it) pairs
+    """
+    balancer = Balancer(logging=False)
+    while True:
+        chunk = list(islice(equations, chunk_size))
+        if not chunk:
+            return
+        start = time.perf_counter()
+        results = balancer.balance_many(chunk)
+        elapsed = (time.perf_counter() - start) / len(chunk)
+        for result in results:
+            yield result, elapsed
+
+
+def balance_in_parallel(equations, workers, chunk_size):
+    """
+    Balances the equations in worker processes. The time reported is the wall time between
+    consecutive results, as the actual work happens elsewhere.
+
+    :return: generator of (BalancingResult, seconds spent on it) pairs
+    """
+    with ParallelBalancer(workers=workers, chunk_size=chunk_size) as balancer:
+        start = time.perf_counter()
+        for result in balancer.balance_stream(equations):
+            now = time.perf_counter()
+            yield result, now - start
+            start = now
+
+
+def write_results(results, output, flush_interval):
+    """
+    Writes the results as newline-delimited JSON, flushing the output every flush_interval lines.
+    """
+    written = 0
+    for result, elapsed in results:
+        line = result.to_dict()
+        line["time_ms"] = round(elapsed * 1000, 3)
+        output.write(json.dumps(line) + "\n")
+        written += 1
+        if written % flush_interval == 0:
+            output.flush()
+    output.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balances a stream of chemical equations, one per line, "
+                                                 "writing one JSON object per line.")
+    parser.add_argument("file", nargs="?", default="-", help="file with one equation per line (default: stdin)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="number of worker processes (default: balance in this process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="number of equations balanced at once")
+    parser.add_argument("--flush-every", type=int, default=DEFAULT_FLUSH_INTERVAL,
+                        help="number of lines written between output flushes")
+    arguments = parser.parse_args()
+    input_file = sys.stdin if arguments.file == "-" else open(arguments.file, 'r')
+    try:
+        equations = read_equations(input_file)
+        if arguments.workers > 0:
+            results = balance_in_parallel(equations, arguments.workers, arguments.chunk_size)
+        else:
+            results = balance_sequentially(equations, arguments.chunk_size)
+        write_results(results, sys.stdout, arguments.flush_every)
+    except BrokenPipeError:
+        sys.stderr.close()
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+
+if __name__ == '__main__':
+    main()
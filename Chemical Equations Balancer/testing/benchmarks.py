@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from balancing.balancer import Balancer
+from computing.balancing_validator import BalancingValidator
+from computing.matrix_computer import MatrixComputer, SOLVER_VERSION
+from computing.matrix_creator import MatrixCreator
+from corpus_generator import CorpusGenerator
+from parsing.equation_parser import EquationParser
+from parsing.molecule_parser import MoleculeParser
+
+PERCENTILES = (50, 90, 99)
+WARM_UP_EQUATION = "H2 + O2 -> H2O"
+# the (molecules, elements) sizes and the elements per molecule of the equations comparing the dense and sparse paths
+SPARSE_SIZES = ((20, 12), (60, 40), (120, 80), (240, 160))
+SPARSE_ELEMENTS_PER_MOLECULE = (2, 4, 8, 16)
+
+
+class StageBenchmark:
+    """
+    A class for measuring a single pipeline stage - the latency of every call, the throughput
+    and, in a separate pass so it does not distort the timings, the peak memory.
+    """
+
+    def __init__(self, name, function, inputs):
+        """
+        :param name: the stage name
+        :param function: the function called once per input
+        :param inputs: the inputs of the stage
+        """
+        self.name = name
+        self.function = function
+        self.inputs = inputs
+
+    def run(self, repeats=1):
+        """
+        :param repeats: how many times every input is processed
+        :return: the dictionary of the stage measurements
+        """
+        latencies = []
+        function = self.function
+        started = time.perf_counter()
+        for _ in range(repeats):
+            for item in self.inputs:
+                start = time.perf_counter()
+                function(item)
+                latencies.append(time.perf_counter() - start)
+        total = time.perf_counter() - started
+        latencies.sort()
+        tracemalloc.start()
+        for item in self.inputs:
+            function(item)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {
+            "calls": len(latencies),
+            "total_s": round(total, 6),
+            "throughput_per_s": round(len(latencies) / total, 1) if total > 0 else None,
+            "latency_us": dict([("p" + str(p), round(self.percentile(latencies, p) * 1e6, 2)) for p in PERCENTILES] +
+                               [("max", round(latencies[-1] * 1e6, 2) if latencies else None)]),
+            "peak_memory_kb": round(peak_memory / 1024, 1),
+        }
+
+    @staticmethod
+    def percentile(sorted_values, percent):
+        if not sorted_values:
+            return 0.0
+        return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))]
+
+
+def ignoring_value_errors(function):
+    def wrapper(item):
+        try:
+            return function(item)
+        except ValueError:
+            return None
+    return wrapper
+
+
+def run_benchmarks(equations, repeats=1):
+    """
+    Benchmarks every stage of the pipeline on the equations, along the paths Balancer takes. Every stage gets
+    the output of the previous ones computed in advance, so only the stage itself is measured.
+
+    :param equations: the equations
+    :param repeats: how many times every input is processed
+    :return: the dictionary of measurements of every stage
+    """
+    equation_parser = EquationParser(MoleculeParser())
+    molecule_parser = MoleculeParser()
+    matrix_creator = MatrixCreator(molecule_parser=MoleculeParser())
+    matrix_computer = MatrixComputer()
+    balancing_validator = BalancingValidator(logging=False, molecule_parser=MoleculeParser())
+    parsed_equations = [equation_parser.parse_equation(equation) for equation in equations]
+    molecules = [molecule for parsed_equation in parsed_equations for molecule in parsed_equation.molecules]
+    matrices = [matrix_creator.create_indexed_equation_rows(parsed_equation) for parsed_equation in parsed_equations]
+    solved = []
+    for matrix in matrices:
+        try:
+            solved.append((matrix, matrix_computer.compute_coefficients(matrix)))
+        except ValueError:
+            pass
+    balancer = Balancer(logging=False)
+    batch_balancer = Balancer(logging=False)
+    # the batch path imports NumPy on its first use - warm both balancers up, so that is not measured
+    balancer.balance_equation(WARM_UP_EQUATION)
+    batch_balancer.balance_many([WARM_UP_EQUATION])
+    stages = [
+        StageBenchmark("EquationParser", equation_parser.parse_equation, equations),
+        StageBenchmark("MoleculeParser", molecule_parser.parse_molecule_into_atoms, molecules),
+        StageBenchmark("MatrixCreator", matrix_creator.create_indexed_equation_rows, parsed_equations),
+        StageBenchmark("MatrixComputer", ignoring_value_errors(matrix_computer.compute_coefficients), matrices),
+        StageBenchmark("BalancingValidator", lambda item: balancing_validator.validate_matrix_balancing(*item), solved),
+        StageBenchmark("Balancer.balance_equation", balancer.balance_equation, equations),
+        StageBenchmark("Balancer.balance_many", batch_balancer.balance_many, [equations]),
+    ]
+    results = {stage.name: stage.run(repeats) for stage in stages}
+    results["Balancer.balance_many"]["throughput_per_s"] = round(
+        len(equations) * results["Balancer.balance_many"]["calls"] / results["Balancer.balance_many"]["total_s"], 1)
+    # how many times faster balancing the equations at once is than balancing them one by one
+    results["Balancer.balance_many"]["speedup"] = round(results["Balancer.balance_many"]["throughput_per_s"] /
+                                                        results["Balancer.balance_equation"]["throughput_per_s"], 2)
+    return results
+
+
+def generate_network_equation(corpus_generator, molecules, elements, elements_per_molecule, max_subscript=4):
+    """
+    Generates a big equation of a reaction network - every molecule has a few random elements only, so every column
+    of the equation matrix has about elements_per_molecule non-zeros. Most such equations cannot be balanced,
+    which does not matter for timing the solvers.
+
+    :return: the equation
+    """
+    symbols = corpus_generator.element_symbols(elements)
+    random = corpus_generator.random
+    formulas = []
+    for i in range(molecules):
+        molecule_symbols = set(random.sample(symbols, min(elements_per_molecule, elements)))
+        molecule_symbols.add(symbols[i % elements])
+        formulas.append("".join(symbol + str(random.randint(1, max_subscript)) for symbol in sorted(molecule_symbols)))
+    formulas = list(dict.fromkeys(formulas))
+    return " + ".join(formulas[:len(formulas) // 2]) + " -> " + " + ".join(formulas[len(formulas) // 2:])
+
+
+def run_sparse_benchmarks(equations_per_size=3, seed=0):
+    """
+    Compares the dense and the sparse (Balancer(sparse=True)) paths - building the equation matrix and computing
+    the coefficients - on big equations of growing size and density, telling where the sparse one starts paying off.
+
+    :param equations_per_size: the number of equations of every size and density
+    :param seed: the seed of the equations generator
+    :return: the dictionary of the median latencies of both paths and the speedup of the sparse one, keyed by
+    "<molecules>x<elements>/<elements per molecule>"
+    """
+    corpus_generator = CorpusGenerator(seed=seed)
+    equation_parser = EquationParser(MoleculeParser())
+    matrix_creator = MatrixCreator(molecule_parser=MoleculeParser())
+    matrix_computer = MatrixComputer()
+    paths = (("dense_ms", matrix_creator.create_indexed_equation_rows),
+             ("sparse_ms", matrix_creator.create_sparse_equation_matrix))
+    results = {}
+    for molecules, elements in SPARSE_SIZES:
+        for elements_per_molecule in SPARSE_ELEMENTS_PER_MOLECULE:
+            parsed_equations = [equation_parser.parse_equation(generate_network_equation(
+                corpus_generator, molecules, elements, elements_per_molecule)) for _ in range(equations_per_size)]
+            measurements = {}
+            for name, create_matrix in paths:
+                compute = ignoring_value_errors(matrix_computer.compute_coefficients)
+                latencies = []
+                for parsed_equation in parsed_equations:
+                    start = time.perf_counter()
+                    compute(create_matrix(parsed_equation))
+                    latencies.append(time.perf_counter() - start)
+                latencies.sort()
+                measurements[name] = round(StageBenchmark.percentile(latencies, 50) * 1e3, 3)
+            measurements["speedup"] = round(measurements["dense_ms"] / measurements["sparse_ms"], 2)
+            results[str(molecules) + "x" + str(elements) + "/" + str(elements_per_molecule)] = measurements
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    :return: descriptions of the stages whose p50 latency got worse than the baseline by more than the threshold
+    """
+    regressions = []
+    for stage, measurements in results["stages"].items():
+        if stage not in baseline.get("stages", {}):
+            continue
+        before = baseline["stages"][stage]["latency_us"]["p50"]
+        after = measurements["latency_us"]["p50"]
+        if before and after > before * (1 + threshold):
+            regressions.append(stage + ": p50 " + str(before) + " us -> " + str(after) + " us")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks every stage of the balancing pipeline and "
+                                                 "writes the measurements as JSON.")
+    parser.add_argument("--corpus-file", help="file with one equation per line (default: a synthetic corpus)")
+    parser.add_argument("--equations", type=int, default=1000, help="number of synthetic equations")
+    parser.add_argument("--molecules", type=int, default=4)
+    parser.add_argument("--elements", type=int, default=3)
+    parser.add_argument("--nesting-depth", type=int, default=0)
+    parser.add_argument("--max-subscript", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=1, help="how many times every input is processed")
+    parser.add_argument("--output", help="JSON output file (default: stdout)")
+    parser.add_argument("--compare", help="baseline JSON file to check for regressions against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative p50 slowdown")
+    parser.add_argument("--sparse", action="store_true",
+                        help="also compare the dense and the sparse paths on big equations (slow)")
+    arguments = parser.parse_args()
+    if arguments.corpus_file:
+        with open(arguments.corpus_file, 'r') as corpus_file:
+            equations = [line.split(';')[0].strip() for line in corpus_file if line.split(';')[0].strip()]
+        corpus = {"file": arguments.corpus_file, "equations": len(equations)}
+    else:
+        corpus = {"equations": arguments.equations, "molecules": arguments.molecules, "elements": arguments.elements,
+                  "nesting_depth": arguments.nesting_depth, "max_subscript": arguments.max_subscript,
+                  "seed": arguments.seed}
+        equations = CorpusGenerator(seed=arguments.seed).generate_corpus(
+            arguments.equations, arguments.molecules, arguments.elements, arguments.nesting_depth,
+            arguments.max_subscript)
+    results = {"solver_version": SOLVER_VERSION, "python": platform.python_version(), "corpus": corpus,
+               "stages": run_benchmarks(equations, arguments.repeats)}
+    if arguments.sparse:
+        results["sparse"] = run_sparse_benchmarks(seed=arguments.seed)
+    output = json.dumps(results, indent=2)
+    if arguments.output:
+        with open(arguments.output, 'w') as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+    if arguments.compare:
+        with open(arguments.compare, 'r') as baseline_file:
+            regressions = compare(results, json.load(baseline_file), arguments.threshold)
+        for regression in regressions:
+            print("[REGRESSION] " + regression, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# makes the project modules importable by the tests, wherever pytest is run from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
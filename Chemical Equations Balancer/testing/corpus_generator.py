@@ -0,0 +1,135 @@
+import argparse
+import random
+from collections import Counter
+
+ELEMENTS = ['H', 'C', 'N', 'O', 'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'K', 'Ca', 'Ti', 'Cr', 'Mn', 'Fe', 'Co', 'Ni',
+            'Cu', 'Zn', 'Br', 'Ag', 'Sn', 'I', 'Ba', 'Pt', 'Au', 'Hg', 'Pb', 'Li', 'Be', 'B', 'F', 'Sc', 'V', 'Ga',
+            'Ge', 'As', 'Se', 'Rb', 'Sr', 'Y', 'Zr', 'Nb', 'Mo', 'Ru', 'Rh', 'Pd', 'Cd', 'In', 'Sb', 'Te', 'Cs']
+
+
+class CorpusGenerator:
+    """
+    A class for generating synthetic equations of controlled size for benchmarking.
+    Every generated equation has a positive integer solution - the left side molecules are generated
+    first, and the right side ones are made by randomly splitting their atoms. Equations with more
+    molecules than elements + 1 are usually underdetermined, though.
+    """
+
+    def __init__(self, seed=None):
+        """
+        :param seed: the seed of the random generator, for reproducible corpora
+        """
+        self.random = random.Random(seed)
+
+    def generate_corpus(self, count, molecules=4, elements=3, nesting_depth=0, max_subscript=4):
+        """
+        Generates many equations with the same parameters.
+
+        :return: list of the equations
+        """
+        return [self.generate_equation(molecules, elements, nesting_depth, max_subscript) for _ in range(count)]
+
+    def generate_equation(self, molecules=4, elements=3, nesting_depth=0, max_subscript=4):
+        """
+        Generates a single equation.
+
+        :param molecules: the number of molecules in the whole equation, at least 2
+        :param elements: the number of distinct elements in the equation
+        :param nesting_depth: the bracket nesting depth of the left side molecules
+        :param max_subscript: the largest subscript used in the formulas
+        :return: the equation
+        """
+        if molecules < 2 or elements < 1:
+            raise ValueError("An equation needs at least 2 molecules and 1 element")
+        symbols = self.element_symbols(elements)
+        left_side_count = max(1, molecules // 2)
+        right_side_count = molecules - left_side_count
+        left_side_symbols = [[] for _ in range(left_side_count)]
+        shuffled_symbols = self.random.sample(symbols, len(symbols))
+        for i, symbol in enumerate(shuffled_symbols):
+            left_side_symbols[i % left_side_count].append(symbol)
+        left_side_formulas = []
+        total_atoms = Counter()
+        for molecule_symbols in left_side_symbols:
+            formula, atoms = self.__generate_molecule(molecule_symbols or [self.random.choice(symbols)],
+                                                      nesting_depth, max_subscript)
+            coefficient = self.random.randint(1, 3)
+            for atom, count in atoms.items():
+                total_atoms[atom] += coefficient * count
+            left_side_formulas.append(formula)
+        return " + ".join(left_side_formulas) + " -> " + " + ".join(
+            self.__split_atoms(total_atoms, right_side_count))
+
+    def element_symbols(self, count):
+        """
+        :param count: the number of symbols
+        :return: real element symbols, followed by made-up ones (Xa, Xb, ...) if more are needed
+        """
+        symbols = ELEMENTS[:count]
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        i = 0
+        while len(symbols) < count:
+            symbols.append('X' + letters[i // 26 % 26] * (i // 676 + 1) + letters[i % 26])
+            i += 1
+        return symbols
+
+    def __generate_molecule(self, symbols, nesting_depth, max_subscript):
+        """
+        Generates a molecule containing all the given symbols. With nesting_depth > 0, the last symbols
+        are put into brackets nested that deep, each bracket getting its own multiplier.
+
+        :return: the formula and its atoms counts
+        """
+        atoms = Counter()
+        parts = []
+        multiplier = 1
+        outer_symbols = symbols[:max(0, len(symbols) - nesting_depth)]
+        nested_symbols = symbols[len(outer_symbols):]
+        nested_symbols += [self.random.choice(symbols) for _ in range(nesting_depth - len(nested_symbols))]
+        for symbol in outer_symbols:
+            subscript = self.random.randint(1, max_subscript)
+            atoms[symbol] += subscript
+            parts.append(symbol + (str(subscript) if subscript > 1 else ""))
+        nested = []
+        for symbol in nested_symbols:
+            group_multiplier = self.random.randint(2, max(2, max_subscript))
+            subscript = self.random.randint(1, max_subscript)
+            multiplier *= group_multiplier
+            atoms[symbol] += multiplier * subscript
+            nested.append((symbol + (str(subscript) if subscript > 1 else ""), group_multiplier))
+        formula = ""
+        for content, group_multiplier in reversed(nested):
+            formula = "(" + content + formula + ")" + str(group_multiplier)
+        return "".join(parts) + formula, atoms
+
+    def __split_atoms(self, total_atoms, molecules):
+        """
+        Randomly splits the atoms among the given number of flat molecules, none of them empty.
+
+        :return: the formulas of the molecules
+        """
+        shares = [Counter() for _ in range(molecules)]
+        atoms = [atom for atom, count in total_atoms.items() for _ in range(count)]
+        self.random.shuffle(atoms)
+        for i, atom in enumerate(atoms):
+            shares[i if i < molecules else self.random.randrange(molecules)][atom] += 1
+        return ["".join(atom + (str(count) if count > 1 else "") for atom, count in share.items()) for share in shares]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic corpus of balanceable equations.")
+    parser.add_argument("count", type=int, help="number of equations")
+    parser.add_argument("--molecules", type=int, default=4)
+    parser.add_argument("--elements", type=int, default=3)
+    parser.add_argument("--nesting-depth", type=int, default=0)
+    parser.add_argument("--max-subscript", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    arguments = parser.parse_args()
+    corpus_generator = CorpusGenerator(seed=arguments.seed)
+    for _ in range(arguments.count):
+        print(corpus_generator.generate_equation(arguments.molecules, arguments.elements,
+                                                 arguments.nesting_depth, arguments.max_subscript))
+
+
+if __name__ == '__main__':
+    main()
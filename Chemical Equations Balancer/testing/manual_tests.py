@@ -12,7 +12,7 @@ def run_tests():
             can_be_balanced = True
         else:
             can_be_balanced = False
-        result = balancer.balance_equation(equation)
+        result = bool(balancer.balance_equation(equation))
         equations_read += 1
         equations_balanced_correctly += int(result == can_be_balanced)
         if result != can_be_balanced and print_failed:
@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+
+from balancing.async_balancer import AsyncBalancer
+
+
+class AsyncBalancerTest(unittest.IsolatedAsyncioTestCase):
+    """ A class for testing request coalescing and micro-batching """
+
+    async def test_coalescing_and_batching(self):
+        async with AsyncBalancer(batch_window=0.05) as async_balancer:
+            equations = ["H2 + O2 -> H2O"] * 10 + ["H2+O2->H2O", "N2 + H2 -> NH3", "H2 + O2 H2O"]
+            results = await asyncio.gather(*(async_balancer.balance(equation) for equation in equations))
+            self.assertTrue(all(result.coefficients == [-2, -1, 2] for result in results[:11]))
+            self.assertEqual(results[11].coefficients, [-1, -3, 2])
+            self.assertEqual(results[12].status, "invalid")
+            self.assertEqual(async_balancer.statistics(),
+                             {"requests": 13, "coalesced": 10, "batches": 1, "pending": 0})
+
+    async def test_batch_size_limit(self):
+        async with AsyncBalancer(batch_window=10, max_batch_size=2) as async_balancer:
+            results = await asyncio.gather(*(async_balancer.balance(equation) for equation in
+                                             ["H2 + O2 -> H2O", "N2 + H2 -> NH3", "CaCO3 -> CaO + CO2", "A -> B"]))
+            self.assertEqual([bool(result) for result in results], [True, True, True, False])
+            self.assertEqual(async_balancer.batches, 2)
+
+    async def test_cancelled_first_caller(self):
+        async with AsyncBalancer(max_in_flight=1, batch_window=0.05) as async_balancer:
+            blocking = asyncio.ensure_future(async_balancer.balance("CaCO3 -> CaO + CO2"))
+            await asyncio.sleep(0)
+            first = asyncio.ensure_future(async_balancer.balance("N2 + H2 -> NH3"))
+            await asyncio.sleep(0)
+            coalesced = asyncio.ensure_future(async_balancer.balance("N2+H2->NH3"))
+            await asyncio.sleep(0)
+            first.cancel()
+            result = await asyncio.wait_for(coalesced, timeout=5)
+            self.assertEqual(result.coefficients, [-1, -3, 2])
+            self.assertTrue((await blocking).is_balanced)
+            self.assertTrue(first.cancelled())
+            self.assertEqual(async_balancer.statistics()["pending"], 0)
+
+    async def test_cancelled_batch(self):
+        async with AsyncBalancer(batch_window=10) as async_balancer:
+            request = asyncio.ensure_future(async_balancer.balance("N2 + H2 -> NH3"))
+            await asyncio.sleep(0)
+            for task in asyncio.all_tasks():
+                if "__submit" in task.get_coro().__qualname__:
+                    task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await request
+            self.assertEqual(async_balancer.statistics()["pending"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
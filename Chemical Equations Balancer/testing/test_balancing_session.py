@@ -0,0 +1,63 @@
+import unittest
+
+from balancing.balancer import Balancer
+from balancing.balancing_result import BALANCED, UNBALANCEABLE, INVALID
+from balancing.balancing_session import BalancingSession
+
+
+class BalancingSessionTest(unittest.TestCase):
+    """ A class for testing incremental balancing correctness """
+
+    def assertMatchesBalancer(self, session):
+        expected = Balancer(logging=False, screening=False).balance_equation(session.equation)
+        result = session.balance()
+        self.assertEqual((result.status, result.coefficients, result.error),
+                         (expected.status, expected.coefficients, expected.error))
+
+    def test_adding_molecules(self):
+        session = BalancingSession()
+        self.assertEqual(session.balance().status, INVALID)
+        session.add_reactant("C3H8")
+        session.add_reactant("O2")
+        session.add_product("CO2")
+        self.assertEqual(session.balance().status, UNBALANCEABLE)
+        session.add_product("H2O")
+        self.assertEqual(session.equation, "C3H8 + O2 -> CO2 + H2O")
+        self.assertEqual(session.balance().coefficients, [-1, -5, 3, 4])
+        self.assertMatchesBalancer(session)
+
+    def test_removing_molecules(self):
+        session = BalancingSession("H2 + O2 -> H2O + H2O2")
+        self.assertEqual(session.nullity, 2)
+        self.assertMatchesBalancer(session)
+        session.remove_product("H2O2")
+        self.assertEqual(session.balance().coefficients, [-2, -1, 2])
+        session.remove_product("H2O")
+        session.add_product("H2O2")
+        self.assertEqual(session.balance().balanced_equation, "1 H2 + 1 O2 -> 1 H2O2")
+        session.remove_reactant("H2")
+        self.assertMatchesBalancer(session)
+        self.assertRaises(ValueError, session.remove_reactant, "H2")
+
+    def test_edits_match_balancer(self):
+        session = Balancer(logging=False).create_session("KMnO4 + HCl -> KCl + MnCl2 + H2O")
+        self.assertMatchesBalancer(session)
+        session.add_product("Cl2")
+        self.assertEqual(session.balance().status, BALANCED)
+        self.assertMatchesBalancer(session)
+        session.remove_reactant("KMnO4")
+        self.assertMatchesBalancer(session)
+        session.add_reactant("KMnO4")
+        self.assertMatchesBalancer(session)
+        session.add_product("O2")
+        self.assertMatchesBalancer(session)
+
+    def test_invalid_molecule(self):
+        session = BalancingSession("H2 + O2 -> H2O")
+        self.assertRaises(SyntaxError, session.add_product, "H2(O")
+        self.assertEqual(session.equation, "H2 + O2 -> H2O")
+        self.assertEqual(session.balance().coefficients, [-2, -1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
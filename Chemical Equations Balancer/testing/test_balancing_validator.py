@@ -0,0 +1,30 @@
+import numpy as np
+import unittest
+
+from computing.sparse_matrix import SparseMatrix
+from computing.balancing_validator import BalancingValidator
+
+
+class BalancingValidatorTest(unittest.TestCase):
+    """ A class for testing balancing validation """
+
+    balancing_validator = BalancingValidator(logging=False)
+
+    def test_matrix_balancing(self):
+        matrix = np.array([[2, 0, 2], [0, 2, 1]])
+        self.assertTrue(self.balancing_validator.validate_matrix_balancing(matrix, [-2, -1, 2]))
+        self.assertFalse(self.balancing_validator.validate_matrix_balancing(matrix, [-1, -1, 2]))
+        self.assertTrue(self.balancing_validator.validate_matrix_balancing(matrix, [-2 ** 70, -2 ** 69, 2 ** 70]))
+        sparse_matrix = SparseMatrix.from_coordinates([0, 0, 1, 1], [0, 2, 1, 2], [2, 2, 2, 1], (2, 3))
+        self.assertTrue(self.balancing_validator.validate_matrix_balancing(sparse_matrix, [-2, -1, 2]))
+        self.assertFalse(self.balancing_validator.validate_matrix_balancing(sparse_matrix, [-2, -2, 2]))
+
+    def test_many_matrix_balancing(self):
+        matrices = [np.array([[2, 0, 2], [0, 2, 1]]), np.array([[0, 2, 3], [2, 0, 1]]), np.array([[1, 1]]),
+                    np.array([[2, 0, 2], [0, 2, 1]])]
+        self.assertEqual(self.balancing_validator.validate_many_matrix_balancing(
+            matrices, [[-2, -1, 2], [-1, -3, 2], [-1, 2], [-2, -1, 3]]), [True, True, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from balancing.balancer import Balancer
+from computing.matrix_creator import MatrixCreator
+from computing.batch_matrix_computer import BatchMatrixComputer
+
+
+class BatchMatrixComputerTest(unittest.TestCase):
+    """
+    A class for testing batched coefficients computation.
+    """
+
+    batch_matrix_computer = BatchMatrixComputer()
+    matrix_creator = MatrixCreator()
+
+    def test_many_coefficients(self):
+        equations = ["H2 + O2 -> H2O", "C7H16 + O2 -> CO2 + H2O", "FeS2 + HNO3 -> Fe2(SO4)3 + NO + H2SO4",
+                     "N2 + H2 -> NH3", "CO2 + H2O -> C6H12O6 + O2", "H2 + O2 -> H2O + H2O2",
+                     "K4Fe(CN)6 + KMnO4 + H2SO4 -> KHSO4 + Fe2(SO4)3 + MnSO4 + HNO3 + CO2 + H2O"]
+        results = self.batch_matrix_computer.compute_many_coefficients(
+            [self.matrix_creator.create_equation_matrix(e) for e in equations])
+        self.assertEqual(results[0], [-2, -1, 2])
+        self.assertEqual(results[1], [-1, -11, 7, 8])
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(results[3], [-1, -3, 2])
+        self.assertEqual(results[4], [-6, -6, 1, 6])
+        self.assertIsInstance(results[5], ValueError)
+        self.assertEqual(results[6], [-10, -122, -299, 162, 5, 122, 60, 60, 188])
+
+    def test_balance_many_repeated_equations(self):
+        equations = ["H2 + O2 -> H2O", "N2 + H2 -> NH3", "O2 + H2 -> H2O", "H2 + O2 -> H2O", "H2 + O2 -> H2O + H2O2",
+                     "N2 + H2 -> NH3", "H2 + O2 -> H2O + H2O2", "H2 + O2 => H2O", "H2 + O2 => H2O", "H2 + o2 -> H2O",
+                     "o2 + H2 -> H2O", "H2 + o2 -> H2O"]
+        for equation_cache_size in (0, 16):
+            balancer = Balancer(logging=False, equation_cache_size=equation_cache_size)
+            results = balancer.balance_many(equations)
+            self.assertEqual([(r.equation, r.status, r.left_side_molecules, r.right_side_molecules, r.coefficients,
+                               r.error) for r in results],
+                             [(r.equation, r.status, r.left_side_molecules, r.right_side_molecules, r.coefficients,
+                               r.error) for r in map(Balancer(logging=False, equation_cache_size=0).balance_equation,
+                                                     equations)])
+            results[0].coefficients.append(0)
+            self.assertEqual(results[3].coefficients, [-2, -1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from parsing.canonical_equation import CanonicalEquation
+
+
+class CanonicalEquationTest(unittest.TestCase):
+    """ A class for testing canonical equation forms """
+
+    def test_same_reaction_same_key(self):
+        first = CanonicalEquation.from_equation("O2 + H2 -> H2O")
+        second = CanonicalEquation.from_equation("H2+O2   ->   H2O")
+        self.assertEqual(first.key, "H2+O2->H2O")
+        self.assertEqual(first.key, second.key)
+        self.assertNotEqual(first.key, CanonicalEquation.from_equation("H2O -> H2 + O2").key)
+
+    def test_coefficients_mapping(self):
+        canonical_equation = CanonicalEquation.from_equation("O2 + H2 -> H2O")
+        self.assertEqual(canonical_equation.to_canonical_order([-1, -2, 2]), [-2, -1, 2])
+        self.assertEqual(canonical_equation.from_canonical_order([-2, -1, 2]), [-1, -2, 2])
+        canonical_equation = CanonicalEquation.from_equation("N2 + H2 -> NH3 + H2O + H2")
+        coefficients = [1, 2, 3, 4, 5]
+        self.assertEqual(canonical_equation.from_canonical_order(
+            canonical_equation.to_canonical_order(coefficients)), coefficients)
+
+
+if __name__ == '__main__':
+    unittest.main()
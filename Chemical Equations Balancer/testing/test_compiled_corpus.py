@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from balancing.balancer import Balancer
+from parsing.compiled_corpus import CompiledCorpus
+
+EQUATIONS = ["H2 + O2 -> H2O", "KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2", "H2 + O2 -> H2O + NaCl", "H2 + -> O",
+             "Cu + Ag^+ -> Cu^2+ + Ag", "X(", "H2O -> H2O", "C + O2 -> CO + CO2"]
+
+
+class CompiledCorpusTest(unittest.TestCase):
+    """ A class for testing compiled corpus correctness """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "corpus.bin")
+        self.assertEqual(CompiledCorpus.compile(EQUATIONS, self.path), len(EQUATIONS))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_compiled_equations(self):
+        self.assertTrue(CompiledCorpus.is_compiled(self.path))
+        with CompiledCorpus(self.path) as corpus:
+            self.assertEqual(len(corpus), len(EQUATIONS))
+            self.assertEqual([corpus.equation(i) for i in range(len(corpus))], EQUATIONS)
+            self.assertEqual(corpus.species_count, 16)
+            parsed_equation = corpus.parsed_equation(1)
+            self.assertEqual(parsed_equation.left_side_molecules, ['KMnO4', 'HCl'])
+            self.assertEqual(parsed_equation.right_side_atoms[1], {'Mn': 1, 'Cl': 2})
+            self.assertEqual(corpus.equation_rows(0), [[2, 0, 2], [0, 2, 1]])
+            self.assertIsNone(corpus.parsed_equation(3))
+            self.assertEqual(corpus.equation_species(5), ([], -1))
+            species = corpus.species(corpus.section("equation_species")[0])
+            self.assertEqual((species.formula, list(species.element_ids), list(species.counts)), ('H2', [0], [2]))
+
+    def test_balancing_compiled_corpus(self):
+        balancer = Balancer(logging=False)
+        with CompiledCorpus(self.path) as corpus:
+            results = balancer.balance_compiled(corpus)
+            self.assertEqual([r.equation for r in balancer.balance_compiled(corpus, 2, 5)], EQUATIONS[2:5])
+        self.assertEqual([(r.equation, r.status, r.coefficients, r.error) for r in results],
+                         [(r.equation, r.status, r.coefficients, r.error) for r in balancer.balance_many(EQUATIONS)])
+
+    def test_not_compiled_file(self):
+        text_path = os.path.join(self.directory.name, "corpus.txt")
+        with open(text_path, 'w') as text_file:
+            text_file.write("\n".join(EQUATIONS))
+        self.assertFalse(CompiledCorpus.is_compiled(text_path))
+        self.assertRaises(ValueError, CompiledCorpus, text_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from balancing.balancer import Balancer
+from corpus_generator import CorpusGenerator
+
+
+class CorpusGeneratorTest(unittest.TestCase):
+    """ A class for testing that generated corpora are parseable and balanceable """
+
+    def test_generated_equations_are_balanceable(self):
+        corpus_generator = CorpusGenerator(seed=1)
+        equations = corpus_generator.generate_corpus(20, molecules=4, elements=3, nesting_depth=2)
+        for result in Balancer(logging=False).balance_many(equations):
+            self.assertTrue(result.is_balanced or result.error.startswith("Underdetermined"), result)
+        self.assertEqual(corpus_generator.generate_equation(molecules=2, elements=1, nesting_depth=3).count("("), 3)
+
+    def test_parameters(self):
+        equation = CorpusGenerator(seed=2).generate_equation(molecules=60, elements=80, max_subscript=9)
+        self.assertEqual(equation.count("+") + 2, 60)
+        self.assertEqual(len(set(CorpusGenerator().element_symbols(100))), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from balancing.balancing_result import BalancingResult, BALANCED, UNBALANCEABLE
+from parsing.canonical_equation import CanonicalEquation
+from balancing.equation_cache import EquationCache
+
+
+class EquationCacheTest(unittest.TestCase):
+    """ A class for testing equation cache correctness """
+
+    def test_reordered_equation_hit(self):
+        equation_cache = EquationCache()
+        equation_cache.put(CanonicalEquation.from_equation("H2 + O2 -> H2O"),
+                           BalancingResult("H2 + O2 -> H2O", BALANCED, ['H2', 'O2'], ['H2O'], [-2, -1, 2]))
+        result = equation_cache.get("O2 + H2 -> H2O", CanonicalEquation.from_equation("O2 + H2 -> H2O"))
+        self.assertEqual(result.coefficients, [-1, -2, 2])
+        self.assertEqual(result.balanced_equation, "1 O2 + 2 H2 -> 2 H2O")
+        self.assertIsNone(equation_cache.get("H2O -> H2 + O2", CanonicalEquation.from_equation("H2O -> H2 + O2")))
+        self.assertEqual((equation_cache.hits, equation_cache.misses), (1, 1))
+
+    def test_least_recently_used_eviction(self):
+        equation_cache = EquationCache(max_size=2)
+        equations = ["A -> B", "C -> D", "E -> F"]
+        for equation in equations[:2]:
+            equation_cache.put(CanonicalEquation.from_equation(equation),
+                               BalancingResult(equation, UNBALANCEABLE, error="x"))
+        self.assertIsNotNone(equation_cache.get(equations[0], CanonicalEquation.from_equation(equations[0])))
+        equation_cache.put(CanonicalEquation.from_equation(equations[2]),
+                           BalancingResult(equations[2], UNBALANCEABLE, error="x"))
+        self.assertIsNone(equation_cache.get(equations[1], CanonicalEquation.from_equation(equations[1])))
+        self.assertEqual(equation_cache.get(equations[0], CanonicalEquation.from_equation(equations[0])).error, "x")
+        self.assertEqual(equation_cache.statistics()["evictions"], 1)
+        self.assertRaises(ValueError, EquationCache, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from parsing.equation_parser import EquationParser
+
+
+class EquationParserTest(unittest.TestCase):
+    """ A class for testing equation parser correctness """
+
+    equation_parser = EquationParser()
+
+    def test_splitting_into_sides(self):
+        self.assertRaises(SyntaxError, lambda: self.equation_parser.parse_equation_into_two_sides("H2 + O2 H2O"))
+        self.assertEqual(self.equation_parser.parse_equation_into_two_sides("H2 + O2 -> H2O"), ["H2 + O2 ", " H2O"])
+
+    def test_parsing_sides(self):
+        self.assertEqual(self.equation_parser.parse_side_to_molecules("H2O + O2 "), ['H2O', 'O2'])
+        self.assertRaises(SyntaxError, lambda: self.equation_parser.parse_side_to_molecules("(H2_O + O2"))
+        self.assertEqual(self.equation_parser.parse_side_to_molecules("Fe^3+ + OH^-"), ['Fe^3+', 'OH^-'])
+        self.assertEqual(self.equation_parser.parse_side_to_molecules(
+            self.equation_parser.parse_equation_into_two_sides("CaO + N2O5 -> Ca(NO3)2")[1]), ['Ca(NO3)2'])
+
+    def test_parsing_whole_equation(self):
+        parsed_equation = self.equation_parser.parse_equation("CaO + N2O5 -> Ca(NO3)2")
+        self.assertEqual(parsed_equation.left_side_molecules, ['CaO', 'N2O5'])
+        self.assertEqual(parsed_equation.right_side_molecules, ['Ca(NO3)2'])
+        self.assertEqual(parsed_equation.atoms, [{'Ca': 1, 'O': 1}, {'N': 2, 'O': 5}, {'Ca': 1, 'N': 2, 'O': 6}])
+        self.assertRaises(SyntaxError, lambda: self.equation_parser.parse_equation("CaO + N2O5 -> Ca(NO3)2)"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from balancing.balancer import Balancer
+from computing.equation_screener import EquationScreener
+from parsing.equation_parser import EquationParser
+from parsing.parsed_equation import ParsedEquation
+
+
+class EquationScreenerTest(unittest.TestCase):
+    """ A class for testing equation screening correctness """
+
+    def assertRejected(self, equation, error):
+        with self.assertRaises(ValueError) as context:
+            EquationScreener.screen(EquationParser().parse_equation(equation))
+        self.assertEqual(str(context.exception), error)
+
+    def test_rejected_equations(self):
+        self.assertRaises(ValueError, EquationScreener.screen, ParsedEquation([], ['H2O'], [], [{'H': 2, 'O': 1}]))
+        self.assertRejected("H2 + O2 -> H2O + NaCl", "Skeletal equation - element Cl is found on the right side only!")
+        self.assertRejected("H2 + H2O -> O2", "Skeletal equation - element H is found on the left side only!")
+        self.assertRejected("H2 + O2 + N2 -> H2O + NH3 + NO2",
+                            "Underdetermined equation - it can be balanced in at least 3 independent ways!")
+        self.assertRejected("NaCl + KBr -> NaBr + KCl + NaCl",
+                            "Molecule NaCl is repeated - the equation cannot be balanced uniquely!")
+
+    def test_passed_equations(self):
+        for equation in ["H2 + O2 -> H2O", "H2O -> H^+ + OH^-", "Cu + Ag^+ -> Cu^2+ + Ag", "H2O -> H2O", "O2 -> O3",
+                         "KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2"]:
+            EquationScreener.screen(EquationParser().parse_equation(equation))
+
+    def test_screening_keeps_results(self):
+        equations = ["H2 + O2 -> H2O + NaCl", "H2 + O2 -> H2O", "NaCl + KBr -> NaBr + KCl + NaCl",
+                     "H2 + O2 -> H2O + H2O2", "C + O2 -> CO + CO2", "H2 + O2 -> H2O + NaCl", "Fe + O2 -> Fe2O3",
+                     "C + O2 -> O2 + CO2"]
+        screened_balancer = Balancer(logging=False)
+        balancer = Balancer(logging=False, screening=False, equation_cache_size=0)
+        results = [balancer.balance_equation(equation) for equation in equations]
+        for screened_results in [[screened_balancer.balance_equation(e) for e in equations],
+                                 Balancer(logging=False).balance_many(equations)]:
+            self.assertEqual([(r.status, r.coefficients) for r in screened_results],
+                             [(r.status, r.coefficients) for r in results])
+        self.assertEqual(screened_balancer.balance_equation(equations[0]).error,
+                         "Skeletal equation - element Cl is found on the right side only!")
+
+
+if __name__ == '__main__':
+    unittest.main()
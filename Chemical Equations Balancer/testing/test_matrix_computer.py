@@ -0,0 +1,79 @@
+import numpy as np
+import unittest
+
+from computing.matrix_creator import MatrixCreator
+from computing.matrix_computer import MatrixComputer
+
+
+class MatrixComputerTest(unittest.TestCase):
+    """
+    A class for testing chemical equation coefficients computation.
+    """
+
+    matrix_computer = MatrixComputer()
+    matrix_creator = MatrixCreator()
+
+    def test_standard_cases(self):
+        """
+        Tests computations in standard cases - when the equation matrix
+        is not square to begin with.
+        """
+        matrix = self.matrix_creator.create_equation_matrix("H2 + O2 -> H2O")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-2, -1, 2]))
+        matrix = self.matrix_creator.create_equation_matrix("C7H16 + O2 -> CO2 + H2O")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-1, -11, 7, 8]))
+        matrix = self.matrix_creator.create_equation_matrix("KMnO4 + HCl -> MnCl2 + Cl2 + KCl + H2O")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-2, -16, 2, 5, 2, 8]))
+        matrix = self.matrix_creator.create_equation_matrix("KI + KClO3 + HCl -> I2 + H2O + KCl")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-6, -1, -6, 3, 3, 7]))
+        matrix = self.matrix_creator.create_equation_matrix("CO2 + H2O -> C6H12O6 + O2")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-6, -6, 1, 6]))
+
+    def test_square_matrix_cases(self):
+        """
+        Test computations in cases when the equation matrix
+        is square to begin with.
+        """
+        matrix = self.matrix_creator.create_equation_matrix("CaO + N2O5 -> Ca(NO3)2")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-1, -1, 1]))
+        matrix = self.matrix_creator.create_equation_matrix("PCl5 + H2O -> H3PO4 + HCl")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-1, -4, 1, 5]))
+        matrix = self.matrix_creator.create_equation_matrix("AgI + Na2S -> Ag2S + NaI")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-2, -1, 1, 2]))
+        matrix = self.matrix_creator.create_equation_matrix("Ba3N2 + H2O -> Ba(OH)2 + NH3")
+        self.assertTrue(np.array_equal(self.matrix_computer.compute_coefficients(matrix), [-1, -6, 3, 2]))
+
+    def test_float_mode(self):
+        """
+        Tests computations with the floating point matrix inversion.
+        """
+        float_matrix_computer = MatrixComputer(exact=False)
+        matrix = self.matrix_creator.create_equation_matrix("C7H16 + O2 -> CO2 + H2O")
+        self.assertTrue(np.array_equal(float_matrix_computer.compute_coefficients(matrix), [-1, -11, 7, 8]))
+        matrix = self.matrix_creator.create_equation_matrix("PCl5 + H2O -> H3PO4 + HCl")
+        self.assertTrue(np.array_equal(float_matrix_computer.compute_coefficients(matrix), [-1, -4, 1, 5]))
+
+    def test_nullity(self):
+        """
+        Tests nullspace dimension computations.
+        """
+        self.assertEqual(self.matrix_computer.compute_nullity(
+            self.matrix_creator.create_equation_matrix("H2 + O2 -> H2O")), 1)
+        self.assertEqual(self.matrix_computer.compute_nullity(
+            self.matrix_creator.create_equation_matrix("H2 + O2 -> H2O + H2O2")), 2)
+        matrix = self.matrix_creator.create_equation_matrix("H2 + O2 -> H2O + H2O2")
+        self.assertRaises(ValueError, lambda: self.matrix_computer.compute_coefficients(matrix))
+
+    def test_skeletal_equation(self):
+        """
+        Tests computations in cases when the equation
+        is skeletal - cannot be balanced.
+        """
+        matrix = self.matrix_creator.create_equation_matrix("FeS2 + HNO3 -> Fe2(SO4)3 + NO + H2SO4")
+        self.assertRaises(ValueError, lambda: self.matrix_computer.compute_coefficients(matrix))
+        matrix = self.matrix_creator.create_equation_matrix("CO + CO2 + H2 -> CH4 + H2O ")
+        self.assertRaises(ValueError, lambda: self.matrix_computer.compute_coefficients(matrix))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import numpy as np
+import unittest
+
+from computing.matrix_creator import MatrixCreator
+
+
+class MatrixCreatorTest(unittest.TestCase):
+    """
+    A class for testing atoms dictionary and matrix creation for equations of
+    different difficulty level.
+    """
+
+    matrix_creator = MatrixCreator()
+
+    def test_atoms_dictionary_creation(self):
+        self.assertEqual(self.matrix_creator.create_atoms_dictionary(['H2', 'O2'], ['H2O']),
+                         {'H': [2, 0, 2], 'O': [0, 2, 1]})
+        self.assertEqual(self.matrix_creator.create_atoms_dictionary(['CaO', 'N2O5'], ['Ca(NO3)2']),
+                         {'O': [1, 5, 6], 'Ca': [1, 0, 1], 'N': [0, 2, 2]})
+
+    def test_simple_matrix_creation(self):
+        simple_equation_matrix = self.matrix_creator.create_equation_matrix("H2 + O2 -> H2O")
+        self.assertTrue((simple_equation_matrix[0] == [2, 0, 2]).all())
+        self.assertTrue((simple_equation_matrix[1] == [0, 2, 1]).all())
+
+    def test_complicated_matrix_creation(self):
+        complicated_equation_matrix = self.matrix_creator.create_equation_matrix("KMnO4 + HCl -> Mn(Cl)2 + Cl2 + KCl + H2O")
+        self.assertTrue(np.array_equal(complicated_equation_matrix[:, 0], [1, 1, 4, 0, 0]))
+        self.assertTrue(np.array_equiv(complicated_equation_matrix[:, len(complicated_equation_matrix[0]) - 1],
+                                       [0, 0, 1, 2, 0]))
+
+    def test_sparse_matrix_creation(self):
+        parsed_equation = self.matrix_creator.equation_parser.parse_equation("KMnO4 + HCl -> Mn(Cl)2 + Cl2 + KCl + H2O")
+        sparse_equation_matrix = self.matrix_creator.create_sparse_equation_matrix(parsed_equation)
+        self.assertEqual(sparse_equation_matrix.non_zeros, 12)
+        self.assertTrue(np.array_equal(sparse_equation_matrix.toarray(),
+                                       self.matrix_creator.create_parsed_equation_matrix(parsed_equation)))
+        parsed_equation = self.matrix_creator.equation_parser.parse_equation("H2 -> H2O")
+        self.assertEqual(self.matrix_creator.create_sparse_equation_matrix(parsed_equation).shape, (2, 2))
+
+    def test_indexed_matrix_creation(self):
+        parsed_equation = self.matrix_creator.equation_parser.parse_equation("KMnO4 + HCl -> Mn(Cl)2 + Cl2 + KCl + H2O")
+        self.assertTrue(np.array_equal(self.matrix_creator.create_indexed_equation_matrix(parsed_equation),
+                                       self.matrix_creator.create_sparse_equation_matrix(parsed_equation).toarray()))
+        parsed_equation = self.matrix_creator.equation_parser.parse_equation("H2 -> H2O")
+        self.assertEqual(self.matrix_creator.create_indexed_equation_matrix(parsed_equation).tolist(),
+                         [[2, 2], [0, 1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
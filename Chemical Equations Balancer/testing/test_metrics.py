@@ -0,0 +1,42 @@
+import unittest
+
+from chembal_logging.metrics import MetricsRegistry, NULL_CONTEXT
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    """ A class for testing metrics registry correctness """
+
+    def test_stages_counters_and_summaries(self):
+        metrics = MetricsRegistry()
+        for _ in range(3):
+            with metrics.stage("parse"):
+                pass
+        metrics.increment("balanced", 2)
+        metrics.observe("matrix_rows", 2)
+        metrics.observe("matrix_rows", 5)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["stages"]["parse"]["calls"], 3)
+        self.assertEqual(snapshot["counters"]["balanced"], 2)
+        self.assertEqual(snapshot["summaries"]["matrix_rows"], {"count": 2, "sum": 7, "max": 5})
+
+    def test_sources_and_prometheus_format(self):
+        metrics = MetricsRegistry()
+        metrics.register_source("molecule_cache", lambda: {"hits": 3, "misses": 1})
+        with metrics.stage("solve"):
+            pass
+        self.assertEqual(metrics.snapshot()["sources"]["molecule_cache"]["hit_rate"], 0.75)
+        exposition = metrics.to_prometheus()
+        self.assertIn('chembal_stage_seconds_count{stage="solve"} 1', exposition)
+        self.assertIn('chembal_molecule_cache_hit_rate 0.75', exposition)
+
+    def test_sampled_profiling(self):
+        metrics = MetricsRegistry(profile_every=2)
+        for _ in range(4):
+            with metrics.profile():
+                sorted(range(1000), reverse=True)
+        self.assertEqual(len(metrics.snapshot()["profiles"]), 2)
+        self.assertIs(MetricsRegistry().profile(), NULL_CONTEXT)
+
+
+if __name__ == '__main__':
+    unittest.main()
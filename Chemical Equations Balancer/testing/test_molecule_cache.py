@@ -0,0 +1,37 @@
+import unittest
+
+from parsing.molecule_cache import MoleculeCache
+
+
+class MoleculeCacheTest(unittest.TestCase):
+    """ A class for testing molecule cache correctness """
+
+    def test_hits_and_misses(self):
+        molecule_cache = MoleculeCache(max_size=4)
+        self.assertEqual(molecule_cache.parse_molecule_into_atoms('H2O'), {'H': 2, 'O': 1})
+        self.assertEqual(molecule_cache.parse_molecule_into_atoms('H2O'), {'H': 2, 'O': 1})
+        statistics = molecule_cache.statistics()
+        self.assertEqual((statistics['hits'], statistics['misses'], statistics['evictions']), (1, 1, 0))
+        self.assertRaises(SyntaxError, lambda: molecule_cache.parse_molecule_into_atoms('(H2O'))
+        self.assertEqual(len(molecule_cache), 1)
+
+    def test_least_recently_used_eviction(self):
+        molecule_cache = MoleculeCache(max_size=2)
+        molecule_cache.parse_molecule_into_atoms('H2O')
+        molecule_cache.parse_molecule_into_atoms('O2')
+        molecule_cache.parse_molecule_into_atoms('H2O')
+        molecule_cache.parse_molecule_into_atoms('CO2')
+        self.assertEqual(molecule_cache.statistics()['evictions'], 1)
+        molecule_cache.parse_molecule_into_atoms('H2O')
+        self.assertEqual(molecule_cache.hits, 2)
+        molecule_cache.parse_molecule_into_atoms('O2')
+        self.assertEqual(molecule_cache.misses, 4)
+
+    def test_cached_atoms_cannot_be_corrupted(self):
+        molecule_cache = MoleculeCache()
+        molecule_cache.parse_molecule_into_atoms('CO2')['O'] = 100
+        self.assertEqual(molecule_cache.parse_molecule_into_atoms('CO2')['O'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
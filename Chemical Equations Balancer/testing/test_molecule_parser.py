@@ -0,0 +1,62 @@
+import unittest
+
+from parsing.molecule_parser import MoleculeParser
+
+
+class MoleculeParserTest(unittest.TestCase):
+    """ A class for testing parser correctness on molecules of different difficulty level """
+
+    molecule_parser = MoleculeParser()
+
+    def test_simple_molecules_parsing(self):
+        water_parsing = self.molecule_parser.parse_molecule_into_atoms('H2O')
+        self.assertEqual(water_parsing['H'], 2)
+        self.assertEqual(water_parsing['O'], 1)
+        self.assertRaises(SyntaxError, lambda: self.molecule_parser.parse_molecule_into_atoms('(H2O'))
+        self.assertRaises(SyntaxError, lambda: self.molecule_parser.parse_molecule_into_atoms('H2O)'))
+
+    def test_more_complicated_molecules_parsing(self):
+        lactic_acid_parsing = self.molecule_parser.parse_molecule_into_atoms('CH3CH(OH)COOH')
+        self.assertEqual(lactic_acid_parsing['C'], 3)
+        self.assertEqual(lactic_acid_parsing['H'], 6)
+        picric_acid_parsing = self.molecule_parser.parse_molecule_into_atoms('C6H2(NO2)3OH')
+        self.assertEqual(picric_acid_parsing['C'], 6)
+        self.assertEqual(picric_acid_parsing['H'], 3)
+        self.assertEqual(picric_acid_parsing['N'], 3)
+        self.assertEqual(picric_acid_parsing['O'], 7)
+
+    def test_hardcore_molecules_parsing(self):
+        hardcore_molecule_parsing = self.molecule_parser.parse_molecule_into_atoms('K4(ON(SO3)2)2')
+        self.assertEqual(hardcore_molecule_parsing['K'], 4)
+        self.assertEqual(hardcore_molecule_parsing['O'], 14)
+        self.assertEqual(hardcore_molecule_parsing['N'], 2)
+        self.assertEqual(hardcore_molecule_parsing['S'], 4)
+
+    def test_large_and_bracketed_molecules_parsing(self):
+        self.assertEqual(self.molecule_parser.parse_molecule_into_atoms('C60H122'), {'C': 60, 'H': 122})
+        self.assertEqual(self.molecule_parser.parse_molecule_into_atoms('[Co(NH3)6]Cl3'),
+                         {'Co': 1, 'N': 6, 'H': 18, 'Cl': 3})
+        self.assertEqual(list(self.molecule_parser.parse_molecule_into_atoms('(NH4)2Cr2O7')), ['Cr', 'O', 'N', 'H'])
+        self.assertRaises(SyntaxError, lambda: self.molecule_parser.parse_molecule_into_atoms('[Co(NH3]6)'))
+
+    def test_hydrates_and_charges_parsing(self):
+        self.assertEqual(self.molecule_parser.parse_molecule_into_atoms('CuSO4\u00b75H2O'),
+                         {'Cu': 1, 'S': 1, 'O': 9, 'H': 10})
+        self.assertEqual(self.molecule_parser.parse_molecule_into_atoms('CaSO4*2H2O'),
+                         {'Ca': 1, 'S': 1, 'O': 6, 'H': 4})
+        self.assertEqual(self.molecule_parser.parse_molecule_into_atoms('SO4^2-'), {'S': 1, 'O': 4, 'charge': -2})
+        self.assertEqual(self.molecule_parser.parse_molecule_into_atoms('Fe^+3'), {'Fe': 1, 'charge': 3})
+        self.assertRaises(SyntaxError, lambda: self.molecule_parser.parse_molecule_into_atoms('Fe^3'))
+        self.assertRaises(SyntaxError, lambda: self.molecule_parser.parse_molecule_into_atoms('CuSO4\u00b7'))
+
+    def test_error_positions(self):
+        with self.assertRaisesRegex(SyntaxError, 'position 2'):
+            self.molecule_parser.parse_molecule_into_atoms('H2_O')
+        with self.assertRaisesRegex(SyntaxError, 'position 0'):
+            self.molecule_parser.parse_molecule_into_atoms('2H2O')
+        with self.assertRaisesRegex(SyntaxError, 'position 3'):
+            self.molecule_parser.parse_molecule_into_atoms('H2O)')
+
+
+if __name__ == '__main__':
+    unittest.main()
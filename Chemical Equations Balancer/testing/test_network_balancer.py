@@ -0,0 +1,27 @@
+import unittest
+
+from balancing.network_balancer import NetworkBalancer
+
+
+class NetworkBalancerTest(unittest.TestCase):
+    """ A class for testing reaction network balancing """
+
+    network_balancer = NetworkBalancer()
+
+    def test_network(self):
+        network_result = self.network_balancer.balance_network([
+            "CH4 + O2 -> CO2 + H2O", "H2 + O2 -> H2O", "CO + O2 -> CO2", "CO + CO2 + H2 -> CH4 + H2O",
+            "H2 -> H2O", "CH4 + O2 CO2", "O2 + H2 -> H2O"])
+        self.assertEqual(network_result.results[0].coefficients, [-1, -2, 1, 2])
+        self.assertEqual(network_result.results[2].coefficients, [-2, -1, 2])
+        self.assertEqual(network_result.results[6].coefficients, [-1, -2, 2])
+        self.assertEqual(network_result.balanced, [0, 1, 2, 6])
+        self.assertEqual(network_result.underdetermined, [3])
+        self.assertEqual(network_result.skeletal, [4])
+        self.assertEqual(network_result.invalid, [5])
+        self.assertEqual(network_result.species, ['CH4', 'O2', 'CO2', 'H2O', 'H2', 'CO'])
+        self.assertEqual(network_result.elements, ['C', 'H', 'O'])
+
+
+if __name__ == '__main__':
+    unittest.main()
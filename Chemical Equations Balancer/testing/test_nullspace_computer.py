@@ -0,0 +1,47 @@
+import unittest
+
+from computing.sparse_matrix import SparseMatrix
+from computing.nullspace_computer import NullspaceComputer
+
+
+class NullspaceComputerTest(unittest.TestCase):
+    """
+    A class for testing exact nullspace computations.
+    """
+
+    nullspace_computer = NullspaceComputer()
+
+    def test_nullspace(self):
+        self.assertEqual(self.nullspace_computer.compute_nullspace([[2, 0, -2], [0, 2, -1]]), [[2, 1, 2]])
+        self.assertEqual(self.nullspace_computer.compute_nullity([[1, 1, 0], [0, 0, 1]]), 1)
+        self.assertEqual(self.nullspace_computer.compute_nullity([[1, 0, 0], [0, 1, 0], [0, 0, 1]]), 0)
+        self.assertEqual(self.nullspace_computer.compute_nullity([[2, 0, 2, 2], [0, 2, 1, 2]]), 2)
+
+    def test_coefficients(self):
+        self.assertEqual(self.nullspace_computer.compute_coefficients([[2, 0, 2], [0, 2, 1]]), [-2, -1, 2])
+        self.assertEqual(self.nullspace_computer.compute_coefficients([[1, 0, 1, 0], [0, 1, 0, 1],
+                                                                       [1, 1, 0, 0]]), [1, -1, -1, 1])
+        self.assertRaises(ValueError, lambda: self.nullspace_computer.compute_coefficients(
+            [[2, 0, 2, 2], [0, 2, 1, 2]]))
+        self.assertRaises(ValueError, lambda: self.nullspace_computer.compute_coefficients(
+            [[1, 0, 1], [0, 1, 0]]))
+
+    def test_sparse_matrices(self):
+        dense_matrices = [[[2, 0, 2], [0, 2, 1]], [[2, 0, 2, 2], [0, 2, 1, 2]], [[1, 0, 1], [0, 1, 0]],
+                          [[1, 0, 1, 0], [0, 1, 0, 1], [1, 1, 0, 0]], [[0, 0, 0], [3, 0, 3]]]
+        for dense_matrix in dense_matrices:
+            rows, columns = [], []
+            for i, row in enumerate(dense_matrix):
+                for j, value in enumerate(row):
+                    rows.append(i)
+                    columns.append(j)
+            sparse_matrix = SparseMatrix.from_coordinates(rows, columns, [v for row in dense_matrix for v in row],
+                                                          (len(dense_matrix), len(dense_matrix[0])))
+            self.assertEqual(self.nullspace_computer.compute_nullity(sparse_matrix),
+                             self.nullspace_computer.compute_nullity(dense_matrix))
+            self.assertEqual(self.nullspace_computer.compute_nullspace(sparse_matrix),
+                             self.nullspace_computer.compute_nullspace(dense_matrix))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from balancing.balancing_result import BalancingResult, BALANCED, UNBALANCEABLE
+from computing.matrix_computer import SOLVER_VERSION
+from parsing.canonical_equation import CanonicalEquation
+from balancing.result_cache import ResultCache
+
+
+class ResultCacheTest(unittest.TestCase):
+    """ A class for testing persistent result cache correctness """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_results_survive_reopening(self):
+        result_cache = ResultCache(self.path)
+        result_cache.put(CanonicalEquation.from_equation("H2 + O2 -> H2O"),
+                         BalancingResult("H2 + O2 -> H2O", BALANCED, ['H2', 'O2'], ['H2O'], [-2, -1, 2]))
+        result_cache.put(CanonicalEquation.from_equation("H2 -> H2O"),
+                         BalancingResult("H2 -> H2O", UNBALANCEABLE, ['H2'], ['H2O'], error="Wooops"))
+        result_cache.close()
+        result_cache = ResultCache(self.path)
+        result = result_cache.get("O2+H2->H2O", CanonicalEquation.from_equation("O2+H2->H2O"))
+        self.assertEqual(result.coefficients, [-1, -2, 2])
+        self.assertEqual(result.balanced_equation, "1 O2 + 2 H2 -> 2 H2O")
+        self.assertEqual(result_cache.get("H2 -> H2O", CanonicalEquation.from_equation("H2 -> H2O")).error, "Wooops")
+        self.assertIsNone(result_cache.get("N2 -> N2", CanonicalEquation.from_equation("N2 -> N2")))
+        self.assertEqual((result_cache.hits, result_cache.misses), (2, 1))
+        result_cache.close()
+        result_cache = ResultCache(self.path, version=SOLVER_VERSION + 1)
+        self.assertEqual(len(result_cache), 0)
+        result_cache.close()
+
+    def test_least_recently_used_eviction(self):
+        result_cache = ResultCache(self.path, max_entries=10)
+        equations = ["A" + str(i) + " -> B" + str(i) for i in range(1, 11)]
+        for equation in equations:
+            result_cache.put(CanonicalEquation.from_equation(equation),
+                             BalancingResult(equation, UNBALANCEABLE, error="x"))
+        self.assertIsNotNone(result_cache.get(equations[0], CanonicalEquation.from_equation(equations[0])))
+        result_cache.put(CanonicalEquation.from_equation("C -> D"), BalancingResult("C -> D", UNBALANCEABLE))
+        self.assertEqual(len(result_cache), 9)
+        self.assertIsNotNone(result_cache.get(equations[0], CanonicalEquation.from_equation(equations[0])))
+        self.assertIsNone(result_cache.get(equations[1], CanonicalEquation.from_equation(equations[1])))
+        result_cache.close()
+
+    def test_size_tracking(self):
+        result_cache = ResultCache(self.path)
+        entries = [(CanonicalEquation.from_equation(equation), BalancingResult(equation, UNBALANCEABLE, error="x"))
+                   for equation in ["A -> B", "C -> D", "B + A -> E"]]
+        result_cache.put_many(entries[:2])
+        result_cache.put_many(entries + [(CanonicalEquation.from_equation("A->B"), entries[0][1])])
+        self.assertEqual(len(result_cache), 3)
+        self.assertIsNotNone(result_cache.get("D <- C", CanonicalEquation.from_equation("C -> D")))
+        result_cache.close()
+        result_cache = ResultCache(self.path, max_entries=3)
+        self.assertEqual(len(result_cache), 3)
+        result_cache.put(CanonicalEquation.from_equation("F -> G"), BalancingResult("F -> G", UNBALANCEABLE))
+        self.assertIsNotNone(result_cache.get("C -> D", CanonicalEquation.from_equation("C -> D")))
+        self.assertIsNone(result_cache.get("B + A -> E", CanonicalEquation.from_equation("B + A -> E")))
+        result_cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from balancing.balancer import Balancer
+from balancing.balancing_result import BalancingResult, BALANCED, UNBALANCEABLE
+from balancing.result_store import ResultStore, MAX_BISECTED_POSTING
+
+
+class ResultStoreTest(unittest.TestCase):
+    """ A class for testing result store correctness """
+
+    def test_queries(self):
+        result_store = ResultStore()
+        results = Balancer(logging=False).balance_many(["H2 + O2 -> H2O", "KMnO4 + HCl -> KCl + MnCl2 + H2O + Cl2",
+                                                        "CH4 + O2 -> CO2 + H2O", "H2O2 -> H2O + O2", "Fe + O2 -> Fe2O3",
+                                                        "H2 + O2 -> H2O + NaCl"])
+        self.assertEqual(result_store.add_many(results), [0, 1, 2, 3, 4, None])
+        self.assertEqual(len(result_store), 5)
+        self.assertEqual(list(result_store.find(products=['H2O'])), [0, 1, 2, 3])
+        self.assertEqual(list(result_store.find(elements=['Mn'])), [1])
+        self.assertEqual(list(result_store.find(reactants=['O2'], products=['H2O'])), [0, 2])
+        self.assertEqual(list(result_store.find(species=['O2'], elements=['C'])), [2])
+        self.assertEqual(list(result_store.find(reactants=['H2O'])), [])
+        self.assertEqual(list(result_store.find(elements=['Xe'])), [])
+        self.assertEqual(list(result_store.find()), [0, 1, 2, 3, 4])
+        self.assertEqual(result_store.get(1).balanced_equation,
+                         "2 KMnO4 + 16 HCl -> 2 KCl + 2 MnCl2 + 8 H2O + 5 Cl2")
+        self.assertEqual(result_store.statistics(), {"reactions": 5, "species": 13, "elements": 7})
+
+    def test_same_reaction_stored_once(self):
+        result_store = ResultStore()
+        self.assertEqual(result_store.add(BalancingResult("H2 + O2 -> H2O", BALANCED, ['H2', 'O2'], ['H2O'],
+                                                          [-2, -1, 2])), 0)
+        self.assertEqual(result_store.add(BalancingResult("O2 + H2 -> H2O", BALANCED, ['O2', 'H2'], ['H2O'],
+                                                          [-1, -2, 2])), 0)
+        self.assertEqual(result_store.add(BalancingResult("H2O -> H2 + O2", BALANCED, ['H2O'], ['H2', 'O2'],
+                                                          [-2, 2, 1])), 1)
+        self.assertIsNone(result_store.add(BalancingResult("H2 -> H2O", UNBALANCEABLE, ['H2'], ['H2O'], error="x")))
+        self.assertEqual(len(result_store), 2)
+        self.assertEqual(result_store.get(1).coefficients, [-2, 2, 1])
+
+    def test_long_postings(self):
+        result_store = ResultStore()
+        for n in range(1, 4 * MAX_BISECTED_POSTING):
+            molecules = ['C' + str(n) + 'H' + str(2 * n + 2), 'O2'] if n % 3 else ['C' + str(n) + 'H' + str(2 * n + 2)]
+            result_store.add(BalancingResult("", BALANCED, molecules, ['CO2', 'H2O'], [-1] * len(molecules) + [1, 1]))
+        expected = [i for i in range(len(result_store)) if (i + 1) % 3]
+        self.assertEqual(list(result_store.find(reactants=['O2'], products=['CO2', 'H2O'])), expected)
+        self.assertEqual(list(result_store.find(species=['O2'], elements=['C'])), expected)
+
+    def test_balancer_feeds_the_store(self):
+        result_store = ResultStore()
+        balancer = Balancer(logging=False, result_store=result_store)
+        balancer.balance_equation("H2 + O2 -> H2O")
+        balancer.balance_many(["O2 + H2 -> H2O", "C + O2 -> CO2", "H2 + O2 -> H2O + H2O2"])
+        self.assertEqual(len(result_store), 2)
+        self.assertEqual(list(result_store.find(elements=['C'])), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
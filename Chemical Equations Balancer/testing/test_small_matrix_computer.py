@@ -0,0 +1,46 @@
+import unittest
+
+from computing.matrix_creator import MatrixCreator
+from computing.nullspace_computer import NullspaceComputer
+from computing.small_matrix_computer import SmallMatrixComputer
+from corpus_generator import CorpusGenerator
+
+
+class SmallMatrixComputerTest(unittest.TestCase):
+    """ A class for testing that the small matrix kernel agrees with the general exact solver """
+
+    matrix_creator = MatrixCreator()
+    nullspace_computer = NullspaceComputer()
+
+    @staticmethod
+    def compute(solve, matrix):
+        try:
+            return solve(matrix)
+        except ValueError as ex:
+            return str(ex)
+
+    def test_coefficients(self):
+        self.assertEqual(SmallMatrixComputer.compute_coefficients([[2, 0, 2], [0, 2, 1]]), [-2, -1, 2])
+        self.assertEqual(SmallMatrixComputer.compute_coefficients([[1.0, 0.0, 1.0, 0.0], [0.0, 1.0, 0.0, 1.0],
+                                                                   [1.0, 1.0, 0.0, 0.0]]), [1, -1, -1, 1])
+        self.assertRaisesRegex(ValueError, "Underdetermined", SmallMatrixComputer.compute_coefficients,
+                               [[2, 0, 2, 2], [0, 2, 1, 2]])
+        self.assertRaisesRegex(ValueError, "molecule 2", SmallMatrixComputer.compute_coefficients,
+                               [[1, 0, 1], [0, 1, 0]])
+        self.assertFalse(SmallMatrixComputer.is_small([[1] * 30]))
+
+    def test_same_as_nullspace_computer(self):
+        equations = CorpusGenerator(seed=3).generate_corpus(50, molecules=5, elements=3, nesting_depth=1) + \
+            CorpusGenerator(seed=4).generate_corpus(50, molecules=8, elements=6)
+        for equation in equations:
+            matrix = self.matrix_creator.create_indexed_equation_rows(
+                self.matrix_creator.equation_parser.parse_equation(equation))
+            perturbed_matrix = [row[:] for row in matrix]
+            perturbed_matrix[0][0] += 1
+            for m in (matrix, perturbed_matrix):
+                self.assertEqual(self.compute(SmallMatrixComputer.compute_coefficients, m),
+                                 self.compute(self.nullspace_computer.compute_coefficients, m), equation)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,19 @@
+import numpy as np
+import unittest
+
+from computing.sparse_matrix import SparseMatrix
+
+
+class SparseMatrixTest(unittest.TestCase):
+    """ A class for testing sparse matrix creation """
+
+    def test_coordinates_conversion(self):
+        sparse_matrix = SparseMatrix.from_coordinates([1, 0, 0, 1, 1], [2, 0, 2, 1, 2], [1, 2, 2, 2, 0], (2, 3))
+        self.assertEqual(sparse_matrix.non_zeros, 4)
+        self.assertEqual(sparse_matrix.rows(), [{0: 2, 2: 2}, {1: 2, 2: 1}])
+        self.assertTrue(np.array_equal(sparse_matrix.toarray(), [[2, 0, 2], [0, 2, 1]]))
+        self.assertEqual(SparseMatrix.from_coordinates([0, 0], [1, 1], [3, 4], (1, 2)).row(0), {1: 7})
+
+
+if __name__ == '__main__':
+    unittest.main()
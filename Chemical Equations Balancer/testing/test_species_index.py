@@ -0,0 +1,41 @@
+import unittest
+
+from parsing.species_index import ElementTable, SpeciesTable, MAX_ELEMENTS
+
+
+class SpeciesTableTest(unittest.TestCase):
+    """ A class for testing element and species interning """
+
+    def test_interning(self):
+        species_table = SpeciesTable(element_table=ElementTable())
+        water = species_table.get('H2O')
+        self.assertIs(species_table.get('H2O'), water)
+        self.assertEqual(list(water.element_ids), [0, 1])
+        self.assertEqual(list(water.counts), [2, 1])
+        self.assertEqual(list(species_table.get('O2').element_ids), [1])
+        self.assertEqual(species_table.get('Ca(OH)2').atoms(species_table.element_table), {'Ca': 1, 'O': 2, 'H': 2})
+        self.assertEqual(len(species_table.element_table), 3)
+        self.assertRaises(SyntaxError, lambda: species_table.get('(H2O'))
+
+    def test_bounded_size(self):
+        species_table = SpeciesTable(element_table=ElementTable(), max_size=2)
+        water = species_table.get('H2O')
+        species_table.get('O2')
+        self.assertIs(species_table.get('H2O'), water)
+        species_table.get('H2')
+        self.assertEqual(len(species_table), 2)
+        self.assertIs(species_table.get('H2O'), water)
+        self.assertIsNot(species_table.get('O2').element_ids, None)
+        self.assertEqual(list(water.counts), [2, 1])
+        self.assertRaises(ValueError, SpeciesTable, max_size=0)
+
+    def test_element_limit(self):
+        element_table = ElementTable()
+        for i in range(MAX_ELEMENTS):
+            element_table.intern("X" + str(i))
+        self.assertEqual(element_table.intern("X0"), 0)
+        self.assertRaises(SyntaxError, element_table.intern, "Xy")
+
+
+if __name__ == '__main__':
+    unittest.main()
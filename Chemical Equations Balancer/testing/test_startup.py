@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+import unittest
+
+# importing the balancer and balancing one equation must take less than this many seconds
+STARTUP_BUDGET = 0.1
+STARTUP_SCRIPT = """
+import sys
+import time
+start = time.perf_counter()
+from balancing.balancer import Balancer
+Balancer(logging=False).balance_equation("H2 + O2 -> H2O")
+print(time.perf_counter() - start)
+print(",".join(sorted(module for module in ("numpy", "unittest", "sqlite3", "pstats") if module in sys.modules)))
+"""
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StartupTest(unittest.TestCase):
+    """ A class for testing that short-lived processes start balancing quickly """
+
+    @staticmethod
+    def run_startup_script():
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], cwd=PROJECT_DIRECTORY, check=True,
+                                capture_output=True, text=True).stdout.split("\n")
+        return float(output[0]), output[1]
+
+    def test_no_heavy_imports(self):
+        self.assertEqual(self.run_startup_script()[1], "")
+
+    def test_startup_budget(self):
+        self.assertLess(min(self.run_startup_script()[0] for _ in range(3)), STARTUP_BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()